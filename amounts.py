@@ -0,0 +1,39 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Cr/Dr markers (also "(Cr)"/"(Dr)", which must not read as a negative) plus, by
+# default, every other character that cannot be part of a number
+_JUNK = r"(?i)\((?:cr|dr)\)|[^\d.()-]"
+# strict: only markers, thousands separators and whitespace may be dropped
+_JUNK_STRICT = r"(?i)\((?:cr|dr)\)|cr|dr|,|\s"
+_NUMBER = r"^-?(?:\d+\.?\d*|\.\d+)$"
+_NULL = pa.scalar(None, pa.string())
+
+
+def parse_amounts(values, strict=False):
+    """
+    Parse a whole column of amount cells ("1,234.56", "45.00(Cr)", "(1,000)",
+    "12.50 DR", "-", None, ...) into a float64 Series in one vectorized pass.
+
+    Cr/Dr and (Cr)/(Dr) markers and thousands separators are dropped, a value in
+    parentheses becomes negative, and NA markers ("-", "NA", "N/A", dashes), blanks
+    and anything unparseable become NaN. By default any other non-numeric characters
+    are stripped as well; with strict=True a cell must be a plain number once the
+    markers are gone, for parsers that probe tokens which may not be amounts at all.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values, dtype="object")
+    try:
+        cells = pa.array(series, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # numbers mixed in with the strings
+        cells = pa.array(series.astype(str).where(series.notna()), type=pa.string(), from_pandas=True)
+
+    cells = pc.replace_substring_regex(cells, _JUNK_STRICT if strict else _JUNK, "")
+    negative = pc.and_(pc.match_substring(cells, "("), pc.match_substring(cells, ")"))
+    cells = pc.replace_substring(pc.replace_substring(cells, "(", ""), ")", "")
+    cells = pc.if_else(pc.match_substring_regex(cells, _NUMBER), cells, _NULL)
+
+    amounts = pc.cast(cells, pa.float64())
+    amounts = pc.if_else(negative, pc.negate(amounts), amounts)
+    return pd.Series(amounts.to_numpy(zero_copy_only=False), index=series.index, dtype="float64")
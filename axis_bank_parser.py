@@ -1,47 +1,41 @@
-import streamlit as st
-import pdfplumber
 import pandas as pd
-import re
 from collections import Counter
+from pdf_session import open_session
+from parse_cache import cached_parse
+from patterns import AXIS_ADDRESS, AXIS_HOLDER, AXIS_METADATA, search_fields
+from timings import stage
 
-def axis_parser():
-
-    def extract_axis_account_details(text: str) -> dict:
-        """Pulls basic account info from Axis PDF header text."""
-        details = {}
-
-        # Name & address
-        name_match = re.search(r"^([A-Z\s]+)\n", text, re.MULTILINE)
-        details["Account Holder"] = name_match.group(1).strip() if name_match else "N/A"
+# Bump when the parsed output changes; cached parses of older versions are then ignored
+PARSER_VERSION = "2"
 
-        # Address lines (simple search for Bengaluru/Karnataka block)
-        addr_match = re.findall(r"(?i)([0-9]+.*BANGALORE|BENGALURU|KARNATAKA|560\d+)", text)
-        details["Address"] = " ".join(addr_match) if addr_match else "N/A"
+def extract_axis_account_details(text: str) -> dict:
+    """Pulls basic account info from Axis PDF header text."""
+    details = {}
 
-        cust_no = re.search(r"Customer\s*No\s*:\s*(\d+)", text)
-        details["Customer No"] = cust_no.group(1) if cust_no else "N/A"
+    # Name & address
+    name_match = AXIS_HOLDER.search(text)
+    details["Account Holder"] = name_match.group(1).strip() if name_match else "N/A"
 
-        scheme = re.search(r"Scheme\s*:\s*([\w\-]+)", text)
-        details["Scheme"] = scheme.group(1) if scheme else "N/A"
+    # Address lines (simple search for Bengaluru/Karnataka block)
+    addr_match = AXIS_ADDRESS.findall(text)
+    details["Address"] = " ".join(addr_match) if addr_match else "N/A"
 
-        currency = re.search(r"Currency\s*:\s*([A-Z]+)", text)
-        details["Currency"] = currency.group(1) if currency else "N/A"
+    details.update(search_fields(AXIS_METADATA, text, default="N/A"))
 
-        acc_no = re.search(r"Statement of Account No\s*:\s*(\d+)", text)
-        details["Account No"] = acc_no.group(1) if acc_no else "N/A"
+    return details
 
-        return details
 
+# ------------------------------------------------------
+# Transaction Extractor
+# ------------------------------------------------------
+def extract_axis_transactions(session) -> pd.DataFrame:
+    rows = []
 
-    # ------------------------------------------------------
-    # Transaction Extractor
-    # ------------------------------------------------------
-    def extract_axis_transactions(pdf) -> pd.DataFrame:
-        rows = []
-
-        for page in pdf.pages:
+    session.prefetch("table")
+    with stage("scan"):
+        for i in range(len(session.pages)):
             try:
-                table = page.extract_table()
+                table = session.page_table(i)
                 if not table:
                     continue
 
@@ -60,8 +54,8 @@ def axis_parser():
                             "Tran Date": "",
                             "Chq No": "",
                             "Particulars": "OPENING BALANCE",
-                            "Debit": 0,
-                            "Credit": 0,
+                            "Debit": "0",
+                            "Credit": "0",
                             "Balance": (record.get("Balance") or "0").replace(",", ""),
                             "Init. Br": record.get("Init. Br") or "N/A"
                         })
@@ -79,19 +73,34 @@ def axis_parser():
             except Exception as e:
                 print("Error extracting table:", e)
 
+    with stage("frame"):
         return pd.DataFrame(rows)
 
 
-    # ------------------------------------------------------
-    # Frequency Table
-    # ------------------------------------------------------
-    def build_frequency_table(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
-        if df.empty:
-            return pd.DataFrame()
-        freq = Counter(df["Particulars"])
-        return pd.DataFrame(freq.most_common(top_n), columns=["Particulars", "Count"])
+# ------------------------------------------------------
+# Frequency Table
+# ------------------------------------------------------
+def build_frequency_table(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
+    if df.empty:
+        return pd.DataFrame()
+    freq = Counter(df["Particulars"])
+    return pd.DataFrame(freq.most_common(top_n), columns=["Particulars", "Count"])
 
 
+# ------------------------------------------------------
+# Account Details + Transactions from one open document
+# ------------------------------------------------------
+def parse_axis_statement(source, workers=None):
+    with open_session(source, workers=workers) as session:
+        session.prefetch("text", "table")
+        with stage("metadata"):
+            details = extract_axis_account_details(session.full_text())
+        return details, extract_axis_transactions(session)
+
+
+def axis_parser():
+    import streamlit as st
+
 
     # ------------------------------------------------------
     # Wrapper function for Streamlit UI
@@ -103,13 +112,10 @@ def axis_parser():
         uploaded = st.file_uploader("Upload Axis Bank Statement (PDF)", type=["pdf"])
 
         if uploaded:
-            with pdfplumber.open(uploaded) as pdf:
-                all_text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-                txns = extract_axis_transactions(pdf)
+            acct, txns = cached_parse("Axis", PARSER_VERSION, uploaded, parse_axis_statement)
 
             # 1. Account details
             st.subheader("📋 Account Details")
-            acct = extract_axis_account_details(all_text)
             st.table(pd.DataFrame(acct.items(), columns=["Field", "Value"]))
 
             # 2. Transactions
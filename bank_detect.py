@@ -0,0 +1,128 @@
+import importlib
+import re
+
+from char_columns import DEFAULT_PARSE_MODE
+from pdf_session import PdfSession
+from text_backends import DEFAULT_TEXT_BACKEND, pdfium_document
+
+# bank key -> (module, statement parser, cache label); modules are imported only when used
+PDF_PARSERS = {
+    "sbi": ("sbi_pdf_parser", "parse_sbi_statement", "SBI"),
+    "cbi": ("pdf_parser", "parse_central_bank_statement", "CBI"),
+    "kotak": ("kotak_pdf_parser", "parse_kotak_statement", "Kotak"),
+    "iob": ("iob_bank_parser", "parse_iob_statement", "IOB"),
+    "axis": ("axis_bank_parser", "parse_axis_statement", "Axis"),
+    "rbl": ("rbl_bank_parser", "parse_rbl_statement", "RBL"),
+}
+
+# Banks whose parsers only read text lines and so can take another text backend
+TEXT_LINE_BANKS = {"cbi", "kotak", "iob", "rbl"}
+# Banks whose parsers can also read transactions by character columns (char_columns.py)
+CHAR_COLUMN_BANKS = {"cbi", "kotak", "iob"}
+
+# Full bank names, matched case-insensitively on the first page with all whitespace
+# removed. When more than one is printed the earliest wins: the letterhead comes
+# before any narration naming a counterparty's bank ("NEFT-STATE BANK OF INDIA").
+BANK_NAME_SIGNATURES = [
+    ("cbi", "CENTRALBANKOFINDIA"),
+    ("iob", "INDIANOVERSEASBANK"),
+    ("sbi", "STATEBANKOFINDIA"),
+]
+# (bank, signature, case sensitive) for the looser markers the parsers key on, checked
+# in order only when no bank name is printed.
+MARKER_SIGNATURES = [
+    ("rbl", "AccountholderName", True),
+    ("axis", "StatementofAccountNo", True),
+    ("kotak", "KOTAK", False),
+    ("sbi", "STATEMENTOFACCOUNT", True),
+]
+
+_WHITESPACE = re.compile(r"\s+")
+# First line opening with a date (01/04/2024, 01-Apr-24, 1 April 2024): where the transactions start
+_TRANSACTION_LINE = re.compile(r"^[ \t]*\d{1,2}[-/. ](?:\d{1,2}|[A-Za-z]{3,9})[-/. ,]+\d{2,4}\b", re.MULTILINE)
+
+
+def first_page_text(source):
+    """
+    Characters of page 1 only. pdfium reads them in a few milliseconds without
+    laying out the page; an already open PdfSession uses its own first page so the
+    parser can reuse that layout.
+    """
+    if isinstance(source, PdfSession):
+        return "".join(c["text"] for c in source.pages[0].chars) if source.pages else ""
+
+    doc = pdfium_document(source)
+    try:
+        if len(doc) == 0:
+            return ""
+        page = doc[0]
+        textpage = page.get_textpage()
+        text = textpage.get_text_range()
+        textpage.close()
+        page.close()
+        return text
+    finally:
+        doc.close()
+
+
+def header_text(text):
+    """The part of a page's text above its first transaction row (all of it when no row opens with a date)."""
+    match = _TRANSACTION_LINE.search(text)
+    return text[:match.start()] if match else text
+
+
+def _match_signatures(text):
+    text = _WHITESPACE.sub("", text)
+    upper = text.upper()
+    found = [(upper.find(name), bank) for bank, name in BANK_NAME_SIGNATURES if name in upper]
+    if found:
+        return min(found)[1]
+    for bank, signature, case_sensitive in MARKER_SIGNATURES:
+        if signature in (text if case_sensitive else upper):
+            return bank
+    return None
+
+
+def detect_bank(source):
+    """
+    Bank key from PDF_PARSERS for a statement, or None if no signature matches.
+    Signatures are looked for above the first transaction row, so narrations naming
+    another bank do not count; the whole page is searched only when nothing matches there.
+    """
+    text = first_page_text(source)
+    header = header_text(text)
+    bank = _match_signatures(header)
+    if bank is None and len(header) < len(text):
+        bank = _match_signatures(text)
+    return bank
+
+
+def parse_statement(source, bank=None, workers=None, text_backend=None, mode=None, cache=True):
+    """
+    Detect the bank (unless given) and run its parse_<bank>_statement through the
+    parse cache (in memory and on disk), or straight through with cache=False.
+    Returns (bank, metadata, parse_result).
+    `text_backend` applies to TEXT_LINE_BANKS only and `mode` to CHAR_COLUMN_BANKS
+    only; the other parsers ignore them.
+    """
+    from parse_cache import cached_parse
+
+    bank = bank or detect_bank(source)
+    if bank is None:
+        raise ValueError("could not detect the bank from the first page")
+
+    module_name, func_name, label = PDF_PARSERS[bank]
+    module = importlib.import_module(module_name)
+    parse_fn = getattr(module, func_name)
+    kwargs = {"workers": workers}
+    if bank in TEXT_LINE_BANKS and text_backend not in (None, DEFAULT_TEXT_BACKEND):
+        kwargs["text_backend"] = text_backend
+        label = f"{label}/{text_backend}"  # cached apart from the default backend's output
+    if bank in CHAR_COLUMN_BANKS and mode not in (None, DEFAULT_PARSE_MODE):
+        kwargs["mode"] = mode
+        label = f"{label}/{mode}"
+    metadata, parse_result = cached_parse(
+        label, module.PARSER_VERSION, source, lambda src: parse_fn(src, **kwargs),
+        cache=None if cache else False, store=None if cache else False,
+    )
+    return bank, metadata, parse_result
@@ -0,0 +1,168 @@
+"""
+Headless batch parsing of bank statements (no Streamlit).
+
+    python batch_parse.py archive/ --out parsed/ --workers 4
+    python batch_parse.py "archive/**/*.pdf" --bank kotak --format csv
+
+PDFs go to the bank detected from their first page (or the one named by --bank),
+.xlsx/.xls files to excel_parser and .csv files to csv_parser. Each input
+produces <out>/<name>.parquet (or .csv) with the transactions and <name>.json with
+the metadata, and a per-file timing report is printed at the end. Every file is
+read once, so parses skip the app's in-memory cache and .statement_cache store.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from bank_detect import PDF_PARSERS, parse_statement
+from char_columns import DEFAULT_PARSE_MODE, PARSE_MODES
+from text_backends import DEFAULT_TEXT_BACKEND, TEXT_BACKENDS
+
+PDF_EXTENSIONS = (".pdf",)
+EXCEL_EXTENSIONS = (".xlsx", ".xls")
+CSV_EXTENSIONS = (".csv",)
+
+
+def collect_inputs(patterns):
+    """Expand directories and globs into a sorted, de-duplicated list of statement files."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "**", "*"), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        files.extend(
+            m for m in matches
+            if os.path.isfile(m) and m.lower().endswith(PDF_EXTENSIONS + EXCEL_EXTENSIONS + CSV_EXTENSIONS)
+        )
+    return sorted(set(files))
+
+
+def _output_names(files):
+    """
+    File stem per input, suffixed -2, -3, ... until it differs from every name
+    given out before (ignoring case, for case-insensitive file systems), so
+    a/x.pdf, b/x.pdf and c/x-2.pdf never share an output.
+    """
+    used = set()
+    names = []
+    for path in files:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name, n = stem, 1
+        while name.lower() in used:
+            n += 1
+            name = f"{stem}-{n}"
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+def _frame_of(parse_result):
+    if isinstance(parse_result, pd.DataFrame):
+        return parse_result
+    return next(v for v in parse_result if isinstance(v, pd.DataFrame))
+
+
+def _write_frame(df, path, fmt):
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+        return
+    try:
+        df.to_parquet(path, compression="zstd", index=False)
+    except (ValueError, TypeError):
+        # Mixed-type object columns (common in Excel exports) cannot be typed by Arrow
+        obj_cols = df.select_dtypes(include=["object"]).columns
+        df[obj_cols] = df[obj_cols].astype("string")
+        df.to_parquet(path, compression="zstd", index=False)
+
+
+def parse_one(path, bank, out_base, fmt, text_backend=None, mode=None):
+    """Worker: parse one statement and write its outputs. Never raises."""
+    started = time.perf_counter()
+    report = {"file": path, "bank": bank, "rows": 0, "seconds": 0.0, "status": "ok"}
+    try:
+        if path.lower().endswith(EXCEL_EXTENSIONS + CSV_EXTENSIONS):
+            if path.lower().endswith(CSV_EXTENSIONS):
+                from csv_parser import parse_csv_statement as parse_table_statement
+
+                report["bank"] = "csv"
+            else:
+                from excel_parser import parse_excel_statement as parse_table_statement
+
+                report["bank"] = "excel"
+            metadata_df, df = parse_table_statement(path)
+            metadata = {"raw_rows": metadata_df.astype(object).where(metadata_df.notna(), None).values.tolist()}
+        else:
+            report["bank"], metadata, parse_result = parse_statement(
+                path, None if bank == "auto" else bank, text_backend=text_backend, mode=mode, cache=False
+            )
+            df = _frame_of(parse_result)
+
+        _write_frame(df, f"{out_base}.{fmt}", fmt)
+        with open(f"{out_base}.json", "w", encoding="utf-8") as fh:
+            json.dump({"source": path, "bank": report["bank"], "metadata": metadata}, fh, indent=2, default=str)
+
+        report["rows"] = len(df)
+    except Exception as e:
+        report["status"] = f"error: {e}"
+    report["seconds"] = time.perf_counter() - started
+    return report
+
+
+def print_report(reports, wall_seconds, stream=sys.stdout):
+    width = max([len(r["file"]) for r in reports] + [4])
+    print(f"{'file':<{width}}  {'bank':<6} {'rows':>7} {'seconds':>8}  status", file=stream)
+    for r in reports:
+        print(f"{r['file']:<{width}}  {r['bank']:<6} {r['rows']:>7} {r['seconds']:>8.2f}  {r['status']}", file=stream)
+    ok = sum(1 for r in reports if r["status"] == "ok")
+    rows = sum(r["rows"] for r in reports)
+    rate = len(reports) / wall_seconds if wall_seconds else 0.0
+    print(f"\n{ok}/{len(reports)} files, {rows} rows in {wall_seconds:.2f}s ({rate:.2f} files/s)", file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse a directory or glob of bank statements.")
+    parser.add_argument("inputs", nargs="+", help="directories, files or glob patterns")
+    parser.add_argument("--bank", choices=["auto"] + sorted(PDF_PARSERS), default="auto",
+                        help="parser for PDF inputs (default: detect from the first page)")
+    parser.add_argument("--out", default="parsed", help="output directory (default: parsed)")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--text-backend", choices=sorted(TEXT_BACKENDS), default=DEFAULT_TEXT_BACKEND,
+                        help="page text extractor for the line-based parsers (CBI, Kotak, IOB, RBL)")
+    parser.add_argument("--mode", choices=PARSE_MODES, default=DEFAULT_PARSE_MODE,
+                        help="read CBI, Kotak and IOB transactions from text lines or character columns")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="files parsed in parallel (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    files = collect_inputs(args.inputs)
+    if not files:
+        parser.error("no PDF, Excel or CSV statements found")
+
+    os.makedirs(args.out, exist_ok=True)
+    out_bases = [os.path.join(args.out, name) for name in _output_names(files)]
+
+    started = time.perf_counter()
+    reports = [None] * len(files)
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {
+            pool.submit(parse_one, path, args.bank, base, args.format, args.text_backend, args.mode): i
+            for i, (path, base) in enumerate(zip(files, out_bases))
+        }
+        for future in as_completed(futures):
+            reports[futures[future]] = future.result()
+
+    print_report(reports, time.perf_counter() - started)
+    return 0 if all(r["status"] == "ok" for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Text-line vs character-column transaction parsing (char_columns.py).
+
+    python benchmarks/bench_char_columns.py statements/ [more.pdf ...] [--bank kotak]
+
+Parses every CBI, Kotak or IOB statement (detected from the first page unless
+--bank is given) in each parse mode with each text backend, reports rows and
+pages/s per combination, and fails if the "chars" mode gives different
+transactions on the two backends.
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bank_detect import CHAR_COLUMN_BANKS, PDF_PARSERS, detect_bank  # noqa: E402
+from batch_parse import _frame_of, collect_inputs  # noqa: E402
+from bench_text_backends import same_result  # noqa: E402
+from char_columns import PARSE_MODES  # noqa: E402
+from pdf_session import PdfSession  # noqa: E402
+from text_backends import TEXT_BACKENDS  # noqa: E402
+
+COMBINATIONS = [(mode, backend) for mode in PARSE_MODES for backend in TEXT_BACKENDS]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or globs")
+    parser.add_argument("--bank", choices=sorted(CHAR_COLUMN_BANKS))
+    args = parser.parse_args(argv)
+
+    files = [f for f in collect_inputs(args.inputs) if f.lower().endswith(".pdf")]
+    pages = dict.fromkeys(COMBINATIONS, 0)
+    seconds = dict.fromkeys(COMBINATIONS, 0.0)
+    mismatches = 0
+
+    for path in files:
+        bank = args.bank or detect_bank(path)
+        if bank not in CHAR_COLUMN_BANKS:
+            print(f"skip {path}: {bank or 'unknown bank'} has no character-column parser")
+            continue
+        module_name, func_name, _ = PDF_PARSERS[bank]
+        parse_fn = getattr(importlib.import_module(module_name), func_name)
+        with PdfSession(path) as session:
+            n = len(session.pages)
+
+        frames = {}
+        for mode, backend in COMBINATIONS:
+            started = time.perf_counter()
+            _, parse_result = parse_fn(path, text_backend=backend, mode=mode)
+            seconds[mode, backend] += time.perf_counter() - started
+            pages[mode, backend] += n
+            frames[mode, backend] = _frame_of(parse_result)
+
+        rows = "  ".join(f"{mode}/{backend}={len(df)}" for (mode, backend), df in frames.items())
+        chars = [df for (mode, _), df in frames.items() if mode == "chars"]
+        if all(same_result(chars[0], df) for df in chars[1:]):
+            print(f"ok {path} ({bank}, {n} pages)  rows: {rows}")
+        else:
+            print(f"MISMATCH {path} ({bank}): chars mode differs between text backends")
+            mismatches += 1
+
+    print()
+    for mode, backend in COMBINATIONS:
+        rate = pages[mode, backend] / seconds[mode, backend] if seconds[mode, backend] else 0.0
+        print(f"{mode:<6} {backend:<12} {pages[mode, backend]:>6} pages {seconds[mode, backend]:>8.2f}s {rate:>9.1f} pages/s")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Excel statement ingestion (excel_parser.parse_excel_statement) per read mode and engine.
+
+    python benchmarks/bench_excel.py [--rows 200000] [--sheets 1] [--workers 1] [--repeat 3] [--file export.xlsx]
+                                     [--engine calamine] [--mode stream]
+
+Parses a synthetic account-export workbook (synthetic_statements.excel_statement,
+or --file) in a fresh process per run with each reader engine in
+excel_parser.EXCEL_ENGINES and each of the read modes in EXCEL_READ_MODES,
+plus these:
+- "parquet", the chunked conversion of excel_to_parquet;
+- "workbook", parse_excel_statement over every sheet with --workers processes;
+- "twice", the openpyxl header-less read followed by a second pd.read_excel with
+  the header row, which is what process_file used to do;
+- "csv", csv_parser.parse_csv_statement over the first sheet saved as CSV,
+  which is what the same statement costs when the bank's CSV download is used.
+The other modes read the first sheet only. Reports the best seconds, rows/s and
+peak resident memory of --repeat runs.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_parsers import _mb, _peak_rss_mb  # noqa: E402
+from excel_parser import EXCEL_ENGINES, EXCEL_READ_MODES  # noqa: E402
+from synthetic_statements import excel_statement  # noqa: E402
+
+MODES = ("twice",) + tuple(m for m in EXCEL_READ_MODES if m != "auto") + ("parquet", "workbook", "csv")
+
+
+def _read_twice(path):
+    import pandas as pd
+
+    from excel_parser import find_header_row
+
+    raw_df = pd.read_excel(path, header=None, engine="openpyxl")
+    header_row = find_header_row(raw_df)
+    return pd.read_excel(path, header=header_row, engine="openpyxl") if header_row is not None else raw_df
+
+
+def _write_csv(path, csv_path):
+    """The workbook's first sheet, cells as they are, saved as a CSV at `csv_path`."""
+    from excel_parser import read_raw_frame
+
+    read_raw_frame(path).to_csv(csv_path, header=False, index=False)
+    return csv_path
+
+
+def _parse_once(path, mode, engine, workers):
+    """Runs in a fresh process: (seconds, rows, peak MB before the parse, peak MB after)."""
+    import excel_parser
+
+    before = _peak_rss_mb()
+    started = time.perf_counter()
+    if mode == "twice":
+        rows = len(_read_twice(path))
+    elif mode == "csv":
+        from csv_parser import parse_csv_statement
+
+        rows = len(parse_csv_statement(path)[1])
+    elif mode == "workbook":
+        rows = len(excel_parser.parse_excel_statement(path, workers=workers, engine=engine)[1])
+    elif mode == "parquet":
+        with tempfile.TemporaryDirectory() as tmp:
+            _, rows = excel_parser.excel_to_parquet(path, os.path.join(tmp, "statement.parquet"), engine=engine)
+    else:
+        rows = len(excel_parser.process_file(path, mode, engine=engine)[1])
+    seconds = time.perf_counter() - started
+    return seconds, rows, before, _peak_rss_mb()
+
+
+def bench_mode(path, mode, engine, repeat, workers=1):
+    runs = []
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            runs.append(pool.submit(_parse_once, path, mode, engine, workers).result())
+    seconds = min(r[0] for r in runs)
+    added = max((r[3] - r[2] for r in runs if r[3] is not None), default=None)
+    return {"rows": runs[0][1], "seconds": seconds, "rows_per_s": runs[0][1] / seconds,
+            "peak_mb": max((r[3] for r in runs if r[3] is not None), default=None), "parse_mb": added}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000, help="transactions in the synthetic workbook")
+    parser.add_argument("--sheets", type=int, default=1, help="yearly sheets to split the synthetic workbook into")
+    parser.add_argument("--workers", type=int, default=1, help="sheet workers for the workbook mode")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--file", help="benchmark this workbook instead of a synthetic one")
+    parser.add_argument("--mode", action="append", choices=MODES, help="read mode to run (repeatable; default: all)")
+    parser.add_argument("--engine", action="append", choices=sorted(EXCEL_ENGINES),
+                        help="reader engine to run (repeatable; default: all)")
+    args = parser.parse_args(argv)
+
+    # "twice" is the old openpyxl-only path and "csv" never opens the workbook; every other mode
+    # runs once per engine
+    modes = args.mode or MODES
+    runs = [(mode, engine) for mode in modes if mode != "csv" for engine in args.engine or EXCEL_ENGINES
+            if mode != "twice" or engine == "openpyxl"]
+    if "csv" in modes:
+        runs.append(("csv", "pyarrow"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = os.path.join(tmp, "statement.xlsx")
+            excel_statement(path, args.rows, random.Random("1/excel"), args.sheets)
+        print(f"{path}: {os.path.getsize(path) / 2**20:.1f} MB")
+        if "csv" in modes:
+            csv_path = _write_csv(path, os.path.join(tmp, "statement.csv"))
+            print(f"{csv_path}: {os.path.getsize(csv_path) / 2**20:.1f} MB")
+        results = {(mode, engine): bench_mode(csv_path if mode == "csv" else path, mode, engine, args.repeat, args.workers)
+                   for mode, engine in runs}
+
+    print(f"{'mode':<8} {'engine':<9} {'rows':>7} {'seconds':>8} {'rows/s':>9} {'peak MB':>8} {'+parse':>8}")
+    for (mode, engine), r in results.items():
+        print(f"{mode:<8} {engine:<9} {r['rows']:>7} {r['seconds']:>8.2f} {r['rows_per_s']:>9.0f} "
+              f"{_mb(r['peak_mb'])} {_mb(r['parse_mb'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
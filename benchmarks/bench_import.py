@@ -0,0 +1,70 @@
+"""
+Cold-start import cost of the app and the parsing code paths.
+
+    python benchmarks/bench_import.py [--repeat 7]
+
+Times, in a fresh interpreter per run, what main.py imports before the password
+screen (lazy, as now), what it imported when all six bank pages were loaded up
+front (eager), and the batch path (bank_detect plus one parser). Reports the
+median seconds of --repeat runs, and fails if importing the parser modules pulls
+in streamlit.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+PARSER_MODULES = ["sbi_pdf_parser", "pdf_parser", "kotak_pdf_parser", "axis_bank_parser",
+                  "rbl_bank_parser", "iob_bank_parser"]
+# Parsers that are not bank pages in main.py but must import headless all the same
+HEADLESS_MODULES = ["rbi", "excel_parser", "csv_parser", "bank_detect", "batch_parse"]
+
+CASES = {
+    "main (lazy)": ["streamlit", "timings"],
+    "main (eager)": ["streamlit", "timings", *PARSER_MODULES],
+    "batch": ["bank_detect", "sbi_pdf_parser"],
+    "parsers": PARSER_MODULES + HEADLESS_MODULES,
+}
+
+_TIMER = """
+import sys, time
+started = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+print(time.perf_counter() - started, "streamlit" in sys.modules)
+"""
+
+
+def time_imports(modules):
+    """(seconds, whether streamlit got imported) for importing `modules` in a fresh interpreter."""
+    out = subprocess.run([sys.executable, "-c", _TIMER.format(modules=modules)], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout.split()
+    return float(out[0]), out[1] == "True"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    medians = {}
+    leaks = []
+    for name, modules in CASES.items():
+        runs = [time_imports(modules) for _ in range(args.repeat)]
+        medians[name] = statistics.median(r[0] for r in runs)
+        if name == "parsers" and any(r[1] for r in runs):
+            leaks.append(name)
+        print(f"{name:<14} {medians[name]:>8.3f}s")
+
+    print(f"\nstartup saved: {medians['main (eager)'] - medians['main (lazy)']:.3f}s "
+          f"({medians['main (eager)'] / medians['main (lazy)']:.1f}x faster)")
+    if leaks:
+        print("FAIL: importing the parser modules imports streamlit")
+    return 1 if leaks else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
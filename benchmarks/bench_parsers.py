@@ -0,0 +1,144 @@
+"""
+Throughput and memory of every statement parser on synthetic statements.
+
+    python benchmarks/bench_parsers.py [--pages 20] [--repeat 3] [--json run.json] [--baseline old.json]
+
+Generates each layout of synthetic_statements.py (into a temporary directory, or
+into --dir, where existing files are reused), parses it with its bank's
+parse_<bank>_statement in a fresh process per run and reports pages/s, rows/s
+and peak resident memory: the process peak and how much of it the parse added on
+top of the imports. Times are the best of --repeat runs. With --baseline (a
+previous --json) it exits non-zero when a layout's pages/s fell by more than
+--tolerance.
+"""
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bank_detect import PDF_PARSERS, TEXT_LINE_BANKS  # noqa: E402
+from batch_parse import _frame_of  # noqa: E402
+from synthetic_statements import LAYOUTS, generate  # noqa: E402
+from text_backends import DEFAULT_TEXT_BACKEND, TEXT_BACKENDS, pdfium_document  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10  # bytes on macOS, KiB elsewhere
+
+
+def _parse_once(bank, path, kwargs):
+    """Runs in a fresh process: (seconds, rows, peak MB before the parse, peak MB after)."""
+    module_name, func_name, _ = PDF_PARSERS[bank]
+    parse_fn = getattr(importlib.import_module(module_name), func_name)
+    before = _peak_rss_mb()
+    started = time.perf_counter()
+    _, parse_result = parse_fn(path, **kwargs)
+    seconds = time.perf_counter() - started
+    return seconds, len(_frame_of(parse_result)), before, _peak_rss_mb()
+
+
+def bench_layout(name, path, repeat, text_backend):
+    bank, _, mode = LAYOUTS[name]
+    kwargs = {}
+    if mode:
+        kwargs["mode"] = mode
+    if bank in TEXT_LINE_BANKS and text_backend != DEFAULT_TEXT_BACKEND:
+        kwargs["text_backend"] = text_backend
+
+    doc = pdfium_document(path)
+    pages = len(doc)
+    doc.close()
+
+    runs = []
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            runs.append(pool.submit(_parse_once, bank, path, kwargs).result())
+
+    seconds = min(r[0] for r in runs)
+    peak = max((r[3] for r in runs if r[3] is not None), default=None)
+    added = max((r[3] - r[2] for r in runs if r[3] is not None), default=None)
+    return {
+        "bank": bank, "mode": mode or "", "pages": pages, "rows": runs[0][1], "seconds": seconds,
+        "pages_per_s": pages / seconds, "rows_per_s": runs[0][1] / seconds, "peak_mb": peak, "parse_mb": added,
+    }
+
+
+def _mb(value):
+    return f"{value:>8.1f}" if value is not None else f"{'n/a':>8}"
+
+
+def print_results(results, stream=sys.stdout):
+    print(f"{'layout':<14} {'bank':<6} {'pages':>5} {'rows':>7} {'seconds':>8} {'pages/s':>8} {'rows/s':>9} "
+          f"{'peak MB':>8} {'+parse':>8}", file=stream)
+    for name, r in results.items():
+        print(f"{name:<14} {r['bank']:<6} {r['pages']:>5} {r['rows']:>7} {r['seconds']:>8.2f} {r['pages_per_s']:>8.1f} "
+              f"{r['rows_per_s']:>9.0f} {_mb(r['peak_mb'])} {_mb(r['parse_mb'])}", file=stream)
+
+
+def regressions(results, baseline, tolerance):
+    """Layouts whose pages/s dropped more than `tolerance` (a fraction) below the baseline run."""
+    slower = []
+    for name, r in results.items():
+        old = baseline.get("results", {}).get(name)
+        if old and r["pages_per_s"] < old["pages_per_s"] * (1 - tolerance):
+            slower.append((name, old["pages_per_s"], r["pages_per_s"]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20, help="pages per synthetic statement")
+    parser.add_argument("--layout", action="append", choices=sorted(LAYOUTS),
+                        help="layout to run (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--text-backend", choices=sorted(TEXT_BACKENDS), default=DEFAULT_TEXT_BACKEND,
+                        help="page text extractor for the line-based parsers (CBI, Kotak, IOB, RBL)")
+    parser.add_argument("--dir", help="keep the generated statements here (reused if present)")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results of an earlier --json run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed pages/s drop against --baseline (default: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    layouts = args.layout or list(LAYOUTS)
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = args.dir or tmp
+        missing = [n for n in layouts if not os.path.exists(os.path.join(out_dir, f"{n}.pdf"))]
+        if missing:
+            generate(out_dir, args.pages, missing)
+        results = {
+            name: bench_layout(name, os.path.join(out_dir, f"{name}.pdf"), args.repeat, args.text_backend)
+            for name in layouts
+        }
+
+    print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"pages": args.pages, "text_backend": args.text_backend, "results": results}, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            slower = regressions(results, json.load(fh), args.tolerance)
+        for name, old, new in slower:
+            print(f"REGRESSION {name}: {old:.1f} -> {new:.1f} pages/s")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
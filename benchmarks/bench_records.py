@@ -0,0 +1,82 @@
+"""
+Memory benchmark for the intermediate transaction records (records.py).
+
+    python benchmarks/bench_records.py [--rows 100000]
+
+Builds a synthetic SBI-shaped statement as a list of row dicts (the old parsers)
+and as a ColumnBuilder, then turns each into a DataFrame, reporting the bytes held
+by the records, the peak traced allocation up to the DataFrame and the build time.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pandas as pd  # noqa: E402
+
+from records import ColumnBuilder  # noqa: E402
+from sbi_pdf_parser import SBI_COLUMNS  # noqa: E402
+
+
+def synthetic_cells(n):
+    """Table cells as pdfplumber returns them: strings, None for blanks."""
+    for i in range(n):
+        debit = f"{i % 9000 + 10:,}.00" if i % 3 else None
+        credit = None if i % 3 else f"{i % 50000 + 100:,}.50"
+        yield (
+            f"{i % 28 + 1:02d}-04-2024", f"{i % 28 + 1:02d}-04-2024",
+            f"UPI/DR/{410000000 + i}/MERCHANT {i % 997}/PAYMENT", f"REF{i:08d}",
+            debit, credit, f"{100000 + i * 7 % 900000:,}.25",
+        )
+
+
+def build_dicts(cells):
+    rows = []
+    for row in cells:
+        rows.append(dict(zip(SBI_COLUMNS, row)))
+    return rows, lambda: pd.DataFrame(rows)
+
+
+def build_columns(cells):
+    rows = ColumnBuilder(SBI_COLUMNS)
+    for row in cells:
+        rows.append(*row)
+    return rows, rows.to_frame
+
+
+def measure(build, n):
+    cells = list(synthetic_cells(n))  # the cell strings are shared, only the records are traced
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    records, to_frame = build(cells)
+    records_bytes = tracemalloc.get_traced_memory()[0]
+    df = to_frame()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return records_bytes, peak, elapsed, df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for label, build in (("list of dicts", build_dicts), ("ColumnBuilder", build_columns)):
+        results[label] = measure(build, args.rows)
+    pd.testing.assert_frame_equal(results["list of dicts"][3], results["ColumnBuilder"][3])
+
+    print(f"{args.rows} rows x {len(SBI_COLUMNS)} columns")
+    print(f"  {'':<14} {'records':>10} {'peak':>10} {'seconds':>8}")
+    for label, (records_bytes, peak, elapsed, _) in results.items():
+        print(f"  {label:<14} {records_bytes / 2**20:>8.1f}MB {peak / 2**20:>8.1f}MB {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Micro-benchmark for the shared regex registry (patterns.py).
+
+    python benchmarks/bench_regex.py [--lines 200000]
+
+Compares the old per-call re.match/re.search/re.findall line loop of the RBL parser
+with the precompiled patterns, and the metadata extraction as N separate searches,
+as one pass over the compiled field table, and as a single alternation with named
+groups.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from patterns import AMOUNT_2DP, RBL_DATE, RBL_TXN_LINE, SBI_METADATA, search_fields  # noqa: E402
+
+DATE_RE = r"\d{2}-[A-Za-z]{3}-\d{4}"
+
+SBI_HEADER = """STATE BANK OF INDIA
+MG ROAD BRANCH
+12 MG ROAD BANGALORE
+Branch Code : 12345
+Branch Email : sbi.12345@sbi.co.in
+Branch Phone : 08012345678
+CIF No : 88776655443
+Account No : 30112233445
+Product : SAVINGS BANK REGULAR
+IFSC Code : SBIN0012345
+MICR Code : 560002001
+Currency : INR
+Account Status : ACTIVE
+Nominee Name : JANE DOE
+CKYC No : 50012345678901
+Email : john.doe@example.com
+Statement From : 01-04-2024 To 31-03-2025
+"""
+
+
+def rbl_lines(n):
+    lines = []
+    for i in range(n):
+        if i % 10 == 9:
+            lines.append("Page 3 of 12    Transaction Details continued")
+        else:
+            lines.append(
+                f"{i % 28 + 1:02d}-Apr-2024 UPI/DR/4100{i:06d}/SHOP {i % 97} "
+                f"{i % 28 + 1:02d}-Apr-2024 {i % 500 + 1},{i % 1000:03d}.50 {i * 3 % 90000 + 1000:,}.25"
+            )
+    return lines
+
+
+def scan_uncompiled(lines):
+    rows = 0
+    for line in lines:
+        m = re.match(rf"^({DATE_RE})\s+(.*)$", line)
+        if not m:
+            continue
+        rest = m.group(2)
+        v = re.search(DATE_RE, rest)
+        tail = rest[v.end():] if v else ""
+        re.findall(r"[\d,]+\.\d{2}", tail)
+        rows += 1
+    return rows
+
+
+def scan_compiled(lines):
+    rows = 0
+    for line in lines:
+        m = RBL_TXN_LINE.match(line)
+        if not m:
+            continue
+        rest = m.group(2)
+        v = RBL_DATE.search(rest)
+        tail = rest[v.end():] if v else ""
+        AMOUNT_2DP.findall(tail)
+        rows += 1
+    return rows
+
+
+def metadata_separate(text):
+    return {f: (m.group(1).strip() if (m := re.search(p.pattern, text)) else "") for f, p in SBI_METADATA.items()}
+
+
+# Lookaheads keep overlapping labels ("Email" inside "Branch Email") matchable
+_COMBINED = re.compile("|".join(
+    f"(?=(?P<f{i}>{p.pattern}))" for i, p in enumerate(SBI_METADATA.values())
+))
+_FIELDS = {f"f{i}": field for i, field in enumerate(SBI_METADATA)}
+
+
+def metadata_combined(text):
+    out = dict.fromkeys(SBI_METADATA, "")
+    seen = set()
+    for m in _COMBINED.finditer(text):
+        for name, value in m.groupdict().items():
+            if value is None or name in seen:
+                continue
+            seen.add(name)
+            # the field's own capture is the group right after its named wrapper
+            out[_FIELDS[name]] = m.group(_COMBINED.groupindex[name] + 1).strip()
+    return out
+
+
+def bench(fn, arg, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(arg)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    lines = rbl_lines(args.lines)
+    t_old, rows_old = bench(scan_uncompiled, lines, args.repeat)
+    t_new, rows_new = bench(scan_compiled, lines, args.repeat)
+    assert rows_old == rows_new
+    print(f"RBL line scan ({args.lines} lines)")
+    print(f"  re.match/search/findall  {args.lines / t_old:>12,.0f} lines/s")
+    print(f"  precompiled registry     {args.lines / t_new:>12,.0f} lines/s  ({t_old / t_new:.2f}x)")
+
+    loops = 2000
+    results = {}
+    timings = {}
+    for label, fn in (
+        ("separate re.search", metadata_separate),
+        ("search_fields", lambda t: search_fields(SBI_METADATA, t)),
+        ("combined named groups", metadata_combined),
+    ):
+        t, _ = bench(lambda text: [fn(text) for _ in range(loops)], SBI_HEADER, args.repeat)
+        timings[label] = t / loops
+        results[label] = fn(SBI_HEADER)
+    assert results["separate re.search"] == results["search_fields"] == results["combined named groups"]
+    print(f"\nSBI metadata ({len(SBI_METADATA)} fields, {len(SBI_HEADER)} chars)")
+    for label, t in timings.items():
+        print(f"  {label:<24} {t * 1e6:>9.1f} us/statement")
+
+
+if __name__ == "__main__":
+    main()
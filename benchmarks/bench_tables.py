@@ -0,0 +1,49 @@
+"""
+Per-page table extraction with and without the learned grid (table_geometry.py).
+
+    python benchmarks/bench_tables.py statement.pdf [more.pdf ...]
+
+Lays every page out first so only table extraction is timed, checks that both
+paths return the same tables and reports seconds per page.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pdfplumber  # noqa: E402
+
+from table_geometry import TableReader  # noqa: E402
+
+
+def time_tables(pages, extract):
+    started = time.perf_counter()
+    tables = [extract(page) for page in pages]
+    return time.perf_counter() - started, tables
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdfs", nargs="+")
+    args = parser.parse_args(argv)
+
+    print(f"{'file':<32} {'pages':>5} {'full s/page':>12} {'learned s/page':>15} {'speedup':>8}")
+    for path in args.pdfs:
+        with pdfplumber.open(path) as pdf:
+            pages = pdf.pages
+            for page in pages:
+                page.chars, page.edges  # layout once, outside the timings
+
+            full, expected = time_tables(pages, lambda page: page.extract_table())
+            learned, tables = time_tables(pages, TableReader(learn=True).extract)
+
+        status = "" if tables == expected else "  MISMATCH"
+        n = len(pages) or 1
+        print(f"{os.path.basename(path):<32} {len(pages):>5} {full / n:>12.4f} {learned / n:>15.4f} "
+              f"{full / learned if learned else 0:>7.1f}x{status}")
+
+
+if __name__ == "__main__":
+    main()
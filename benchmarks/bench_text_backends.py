@@ -0,0 +1,81 @@
+"""
+Parity and throughput of the page-text backends (text_backends.py).
+
+    python benchmarks/bench_text_backends.py statements/ [more.pdf ...] [--bank cbi]
+
+Parses every statement of a line-oriented bank (CBI, Kotak, IOB, RBL; detected
+from the first page unless --bank is given) once per backend, fails if metadata
+or transactions differ from the pdfplumber parse, and reports pages/s per backend.
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pandas as pd  # noqa: E402
+
+from bank_detect import PDF_PARSERS, TEXT_LINE_BANKS, detect_bank  # noqa: E402
+from batch_parse import collect_inputs  # noqa: E402
+from pdf_session import PdfSession  # noqa: E402
+from text_backends import TEXT_BACKENDS  # noqa: E402
+
+
+def same_result(a, b):
+    if isinstance(a, pd.DataFrame):
+        try:
+            pd.testing.assert_frame_equal(a, b)
+            return True
+        except AssertionError:
+            return False
+    if isinstance(a, tuple):
+        return len(a) == len(b) and all(same_result(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or globs")
+    parser.add_argument("--bank", choices=sorted(TEXT_LINE_BANKS))
+    args = parser.parse_args(argv)
+
+    files = [f for f in collect_inputs(args.inputs) if f.lower().endswith(".pdf")]
+    pages = dict.fromkeys(TEXT_BACKENDS, 0)
+    seconds = dict.fromkeys(TEXT_BACKENDS, 0.0)
+    mismatches = 0
+
+    for path in files:
+        bank = args.bank or detect_bank(path)
+        if bank not in TEXT_LINE_BANKS:
+            print(f"skip {path}: {bank or 'unknown bank'} is not a line-oriented parser")
+            continue
+        module_name, func_name, _ = PDF_PARSERS[bank]
+        parse_fn = getattr(importlib.import_module(module_name), func_name)
+        with PdfSession(path) as session:
+            n = len(session.pages)
+
+        results = {}
+        for backend in TEXT_BACKENDS:
+            started = time.perf_counter()
+            results[backend] = parse_fn(path, text_backend=backend)
+            seconds[backend] += time.perf_counter() - started
+            pages[backend] += n
+
+        differing = [b for b, r in results.items() if not same_result(results["pdfplumber"], r)]
+        for backend in differing:
+            print(f"MISMATCH {path} ({bank}): {backend} differs from pdfplumber")
+        if not differing:
+            print(f"ok {path} ({bank}, {n} pages)")
+        mismatches += len(differing)
+
+    print()
+    for backend in TEXT_BACKENDS:
+        rate = pages[backend] / seconds[backend] if seconds[backend] else 0.0
+        print(f"{backend:<12} {pages[backend]:>6} pages {seconds[backend]:>8.2f}s {rate:>9.1f} pages/s")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""
+Synthetic bank statements in every layout the parsers read (no customer data).
+
+    python benchmarks/synthetic_statements.py fixtures/ [--pages 20] [--layout kotak ...] [--seed 1]
+
+Writes <layout>.pdf into the output directory for each layout in LAYOUTS: the SBI
+and Axis ruled tables, CBI dotted lines, Kotak B/F-C/F lines, IOB opening-balance
+lines and RBL date-first lines, plus CBI/Kotak/IOB statements laid out in
+positioned columns under a header row for the "chars" parse mode. Needs reportlab,
+which only the benchmarks use (pip install reportlab). With --excel-rows it also
+writes statement.xlsx, an account-export workbook for excel_parser.
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+
+WORDS = ["UPI", "NEFT", "IMPS", "SALARY", "AMAZON", "SWIGGY", "RENT", "ATM", "TRANSFER", "POS", "CHARGES", "INTEREST"]
+OPENING_BALANCE = 10000.0
+# Text-line pages fit this many transactions (plus the first page's header block)
+TEXT_ROWS_PER_PAGE = 40
+# Ruled-table pages fit this many rows at the fixed row height
+TABLE_ROWS_PER_PAGE = 30
+
+
+def money(x):
+    return f"{x:,.2f}"
+
+
+class Ledger:
+    """Running balance and random transactions for one statement."""
+
+    def __init__(self, rng, balance=OPENING_BALANCE):
+        self.rng = rng
+        self.balance = balance
+
+    def description(self, words=3):
+        return " ".join(self.rng.choice(WORDS) for _ in range(words))
+
+    def reference(self, digits=6):
+        return str(self.rng.randint(10 ** (digits - 1), 10 ** digits - 1))
+
+    def next(self):
+        """(amount, is_debit) of the next transaction, applied to the balance (which stays in credit)."""
+        amount = self.rng.randint(100, 500000) / 100
+        debit = self.rng.random() < 0.5 and amount < self.balance
+        self.balance += -amount if debit else amount
+        return amount, debit
+
+
+def _canvas(path):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    return canvas.Canvas(path, pagesize=A4), A4[1]
+
+
+def _text_pdf(path, pages, font_size=8, leading=11):
+    """One left-aligned text line per string, one PDF page per list of lines."""
+    c, height = _canvas(path)
+    for lines in pages:
+        c.setFont("Helvetica", font_size)
+        y = height - 40
+        for line in lines:
+            c.drawString(30, y, line)
+            y -= leading
+        c.showPage()
+    c.save()
+
+
+def _table_pdf(path, header, col_widths, pages, head_lines):
+    """A ruled grid per page with fixed column widths, so every page has the same columns."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Table, TableStyle
+
+    doc = SimpleDocTemplate(path, pagesize=A4, leftMargin=20, rightMargin=20, topMargin=20, bottomMargin=20)
+    style = TableStyle([("GRID", (0, 0), (-1, -1), 0.5, colors.black), ("FONTSIZE", (0, 0), (-1, -1), 7)])
+    normal = getSampleStyleSheet()["Normal"]
+    story = [Paragraph(line, normal) for line in head_lines]
+    for rows in pages:
+        story.append(Table([header] + rows, colWidths=col_widths, rowHeights=18, style=style))
+        story.append(PageBreak())
+    doc.build(story)
+
+
+def _columns_pdf(path, columns, pages, head_lines):
+    """
+    Cells drawn at fixed x positions under a header row, wrapped narration lines
+    under their transaction. `columns` is [(label, x, "l" or "r")]; each page is a
+    list of (cells, extra narration lines, narration column index).
+    """
+    c, height = _canvas(path)
+    for index, rows in enumerate(pages):
+        y = height - 40
+        if index == 0:
+            c.setFont("Helvetica", 9)
+            for line in head_lines:
+                c.drawString(30, y, line)
+                y -= 12
+            y -= 6
+        c.setFont("Helvetica-Bold", 7)
+        for label, x, align in columns:
+            (c.drawRightString if align == "r" else c.drawString)(x, y, label)
+        y -= 12
+        c.setFont("Helvetica", 7)
+        for cells, wrapped, narration_col in rows:
+            for (_, x, align), value in zip(columns, cells):
+                if value:
+                    (c.drawRightString if align == "r" else c.drawString)(x, y, value)
+            for line in wrapped:
+                y -= 9
+                c.drawString(columns[narration_col][1], y, line)
+            y -= 11
+        c.setFont("Helvetica", 6)
+        c.drawString(30, 20, f"Page {index + 1} of {len(pages)}  This is a computer generated statement")
+        c.showPage()
+    c.save()
+
+
+def _wrap(text, width=38):
+    return [text[i:i + width] for i in range(0, len(text), width)] or [""]
+
+
+# === Text-line layouts ===
+def cbi(path, pages, rng):
+    ledger = Ledger(rng)
+    out = []
+    for p in range(pages):
+        lines = []
+        if p == 0:
+            lines += ["CENTRAL BANK OF INDIA", "MG ROAD EXTN", "JOHN DOE", "12 MG ROAD BANGALORE",
+                      "Account No. : 1234567890", "Branch Code : 1234", "Currency : INR", "Product : SAVINGS",
+                      "Statement From 01/01/2024 to 31/03/2024", f"BROUGHT FORWARD {money(ledger.balance)}Cr"]
+        for i in range(TEXT_ROWS_PER_PAGE):
+            amount, _ = ledger.next()
+            day = f"{i % 28 + 1:02d}/{p % 12 + 1:02d}/24"
+            chq = rng.choice(["-", ledger.reference()])
+            lines.append(f"{day} {day} {ledger.description()} . {chq} {money(amount)} {money(ledger.balance)}Cr")
+            if rng.random() < 0.2:
+                lines.append(". . more info " + rng.choice(WORDS))
+        out.append(lines)
+    _text_pdf(path, out)
+
+
+def kotak(path, pages, rng):
+    ledger = Ledger(rng)
+    out = []
+    for p in range(pages):
+        lines = []
+        if p == 0:
+            lines += ["Kotak Mahindra Bank", "JOHN DOE Period : 01 Jan 2024 - 31 Mar 2024", "Cust.Reln.No : 12345",
+                      "Account No : 99887766", "Currency : INR", "12 MG ROAD Branch : MG ROAD",
+                      "BANGALORE Nominee Registered : Y", "560001 Branch Address : 1 MG ROAD", "KARNATAKA,INDIA",
+                      "IFSC Code : KKBK0000001"]
+        lines.append(f"B/F {money(ledger.balance)}(Cr)")
+        for i in range(TEXT_ROWS_PER_PAGE):
+            amount, debit = ledger.next()
+            withdrawal, deposit = (money(amount), "0.00") if debit else ("0.00", money(amount))
+            lines.append(f"{i % 28 + 1:02d}-{p % 12 + 1:02d}-2024 {ledger.description()} {withdrawal} {deposit} "
+                         f"{money(ledger.balance)}(Cr)")
+            if rng.random() < 0.3:
+                lines.append(f"REF{ledger.reference(4)} {rng.choice(WORDS)}")
+        lines.append(f"C/F {money(ledger.balance)}(Cr)")
+        out.append(lines)
+    _text_pdf(path, out)
+
+
+def iob(path, pages, rng):
+    ledger = Ledger(rng)
+    out = []
+    for p in range(pages):
+        lines = []
+        if p == 0:
+            lines += ["INDIAN OVERSEAS BANK, MAHALAKSHMIPURAM, BANGALORE Page 1",
+                      "Account Number :2314569874512563/INR JOHN DOE", "Report To : JOHN",
+                      "Report for the Period : 01-01-2024 TO 31-03-2024",
+                      "Post Date Tran Ref Num Particulars Amount Balance Amt", "-" * 32,
+                      f"ACCOUNT OPENING BALANCE : {money(ledger.balance)}CR"]
+        else:
+            lines.append(f"BROUGHT FORWARD {money(ledger.balance)}CR")
+        for i in range(TEXT_ROWS_PER_PAGE):
+            amount, _ = ledger.next()
+            lines.append(f"{i % 28 + 1:02d}-{p % 12 + 1:02d}-2024S{ledger.reference(8)} {ledger.reference(4)} "
+                         f"{ledger.description()} {money(amount)} {money(ledger.balance)}CR")
+        out.append(lines)
+    _text_pdf(path, out)
+
+
+def rbl(path, pages, rng):
+    ledger = Ledger(rng)
+    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    out = []
+    for p in range(pages):
+        lines = []
+        if p == 0:
+            lines += ["Accountholder Name : JOHN DOE", "CIF ID : 123456", "A/c Currency : INR",
+                      "Period : 01-Jan-2024 to 31-Dec-2024"]
+        for i in range(TEXT_ROWS_PER_PAGE):
+            amount, _ = ledger.next()
+            day = f"{i % 28 + 1:02d}-{months[p % 12]}-2024"
+            lines.append(f"{day} {ledger.description()} {day} {money(amount)} {money(ledger.balance)}")
+        out.append(lines)
+    _text_pdf(path, out)
+
+
+# === Ruled-table layouts ===
+def sbi(path, pages, rng):
+    ledger = Ledger(rng)
+    out = []
+    for p in range(pages):
+        rows = [["", "", "BROUGHT FORWARD", "", "", "", money(ledger.balance)]] if p == 0 else []
+        for i in range(TABLE_ROWS_PER_PAGE - len(rows)):
+            amount, debit = ledger.next()
+            day = f"{i % 28 + 1:02d}-{p % 12 + 1:02d}-2024"
+            dr, cr = (money(amount), "") if debit else ("", money(amount))
+            rows.append([day, day, ledger.description(), ledger.reference(), dr, cr, money(ledger.balance)])
+        out.append(rows)
+    _table_pdf(path, ["Post Date", "Value Date", "Description", "Cheque No/Reference", "Debit", "Credit", "Balance"],
+               [60, 60, 150, 90, 70, 70, 55], out,
+               ["STATEMENT OF ACCOUNT", "STATE BANK OF INDIA", "Account No : 12345678"])
+
+
+def axis(path, pages, rng):
+    ledger = Ledger(rng)
+    out = []
+    for p in range(pages):
+        rows = [["", "", "OPENING BALANCE", "", "", money(ledger.balance), ""]] if p == 0 else []
+        for i in range(TABLE_ROWS_PER_PAGE - len(rows)):
+            amount, debit = ledger.next()
+            dr, cr = (money(amount), "") if debit else ("", money(amount))
+            rows.append([f"{i % 28 + 1:02d}-{p % 12 + 1:02d}-2024", "", ledger.description(), dr, cr,
+                         money(ledger.balance), "123"])
+        out.append(rows)
+    _table_pdf(path, ["Tran Date", "Chq No", "Particulars", "Debit", "Credit", "Balance", "Init. Br"],
+               [60, 50, 180, 70, 70, 75, 45], out,
+               ["JOHN DOE", "Statement of Account No : 9988776655", "Customer No : 1234"])
+
+
+# === Positioned-column layouts (the "chars" parse mode) ===
+def _narration(ledger):
+    return "/".join(ledger.rng.choice(WORDS) + ledger.reference(ledger.rng.randint(2, 5))
+                    for _ in range(ledger.rng.randint(1, 6)))
+
+
+def kotak_columns(path, pages, rng):
+    ledger = Ledger(rng)
+    columns = [("Date", 30, "l"), ("Narration", 80, "l"), ("Chq/Ref No", 260, "l"),
+               ("Withdrawal (Dr)", 400, "r"), ("Deposit (Cr)", 470, "r"), ("Balance", 560, "r")]
+    out = []
+    for p in range(pages):
+        rows = [(["", "B/F", "", "", "", f"{money(ledger.balance)}(Cr)"], [], 1)] if p == 0 else []
+        for i in range(TEXT_ROWS_PER_PAGE):
+            amount, debit = ledger.next()
+            first, *wrapped = _wrap(_narration(ledger))
+            ref = ledger.reference() if rng.random() < 0.5 else ""
+            rows.append(([f"{i % 28 + 1:02d}-{p % 12 + 1:02d}-2024", first, ref, money(amount) if debit else "",
+                          "" if debit else money(amount), f"{money(ledger.balance)}(Cr)"], wrapped, 1))
+        out.append(rows)
+    _columns_pdf(path, columns, out, ["Kotak Mahindra Bank", "JOHN DOE", "Account No : 99887766"])
+
+
+def iob_columns(path, pages, rng):
+    ledger = Ledger(rng)
+    columns = [("Post Date", 25, "l"), ("Tran Id", 70, "l"), ("Ref Num", 120, "l"), ("Particulars", 170, "l"),
+               ("Debit", 420, "r"), ("Credit", 480, "r"), ("Balance Amt", 565, "r")]
+    out = []
+    for p in range(pages):
+        rows = []
+        if p == 0:
+            rows.append((["", "", "", f"ACCOUNT OPENING BALANCE : {money(ledger.balance)}CR", "", "", ""], [], 3))
+        for i in range(TEXT_ROWS_PER_PAGE):
+            amount, debit = ledger.next()
+            first, *wrapped = _wrap(_narration(ledger))
+            ref = ledger.reference() if rng.random() < 0.5 else ""
+            rows.append(([f"{i % 28 + 1:02d}-{p % 12 + 1:02d}-2024", "S" + ledger.reference(7), ref, first,
+                          money(amount) if debit else "", "" if debit else money(amount),
+                          f"{money(ledger.balance)}CR"], wrapped, 3))
+        out.append(rows)
+    _columns_pdf(path, columns, out, ["INDIAN OVERSEAS BANK, MAHALAKSHMIPURAM, BANGALORE",
+                                      "Account Number :2314569874512563/INR JOHN DOE"])
+
+
+def cbi_columns(path, pages, rng):
+    ledger = Ledger(rng)
+    columns = [("Value Date", 25, "l"), ("Post Date", 70, "l"), ("Details", 115, "l"), ("Chq.No.", 300, "l"),
+               ("Debit", 420, "r"), ("Credit", 485, "r"), ("Balance", 565, "r")]
+    out = []
+    for p in range(pages):
+        rows = []
+        for i in range(TEXT_ROWS_PER_PAGE):
+            amount, debit = ledger.next()
+            first, *wrapped = _wrap(_narration(ledger))
+            day = f"{i % 28 + 1:02d}/{p % 12 + 1:02d}/24"
+            ref = ledger.reference() if rng.random() < 0.5 else ""
+            rows.append(([day, day, first, ref, money(amount) if debit else "", "" if debit else money(amount),
+                          f"{money(ledger.balance)}Cr"], wrapped, 2))
+        out.append(rows)
+    _columns_pdf(path, columns, out, ["CENTRAL BANK OF INDIA", "JOHN DOE", "Account No. : 1234567890"])
+
+
+# layout -> (bank key in bank_detect.PDF_PARSERS, generator, parse mode)
+LAYOUTS = {
+    "sbi": ("sbi", sbi, None),
+    "cbi": ("cbi", cbi, None),
+    "kotak": ("kotak", kotak, None),
+    "iob": ("iob", iob, None),
+    "axis": ("axis", axis, None),
+    "rbl": ("rbl", rbl, None),
+    "cbi-columns": ("cbi", cbi_columns, "chars"),
+    "kotak-columns": ("kotak", kotak_columns, "chars"),
+    "iob-columns": ("iob", iob_columns, "chars"),
+}
+
+
+EXCEL_HEADER = ["Tran Date", "Value Date", "Particulars", "Chq No", "Debit", "Credit", "Balance"]
+
+
+def excel_statement(path, rows, rng, sheets=1):
+    """
+    Account export workbook: a few metadata rows and a blank line above the header,
+    then `rows` transactions (text transaction dates, date-cell value dates, blank
+    debit or credit cells) and a totals line, split over `sheets` yearly sheets.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ledger = Ledger(rng)
+    day = datetime.datetime(2020, 4, 1)
+    per_sheet, extra = divmod(rows, sheets)
+    for n in range(sheets):
+        ws = wb.create_sheet("Statement" if sheets == 1 else f"FY{2020 + n}")
+        for line in (["Account Statement"], ["Account Name", "JOHN DOE"], ["Account No", "9921201000295"],
+                     ["Period", "01/04/2020 to 31/03/2025"], []):
+            ws.append(line)
+        ws.append(EXCEL_HEADER)
+        debits = credits = 0.0
+        for _ in range(per_sheet + (1 if n < extra else 0)):
+            day += datetime.timedelta(minutes=rng.randint(0, 2000))
+            amount, debit = ledger.next()
+            debits += amount if debit else 0.0
+            credits += 0.0 if debit else amount
+            ref = ledger.reference() if rng.random() < 0.3 else None
+            ws.append([day.strftime("%d/%m/%Y"), day.replace(hour=0, minute=0), ledger.description(), ref,
+                       amount if debit else None, None if debit else amount, round(ledger.balance, 2)])
+        ws.append([])
+        ws.append(["Total", None, None, None, round(debits, 2), round(credits, 2), None])
+    wb.save(path)
+
+
+def generate(out_dir, pages, layouts=None, seed=1):
+    """Write <layout>.pdf for each layout (all by default); returns {layout: path}."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for name in layouts or LAYOUTS:
+        path = os.path.join(out_dir, f"{name}.pdf")
+        LAYOUTS[name][1](path, pages, random.Random(f"{seed}/{name}"))
+        paths[name] = path
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("out", help="output directory")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--layout", action="append", choices=sorted(LAYOUTS),
+                        help="layout to write (repeatable; default: all)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--excel-rows", type=int, default=0, help="also write statement.xlsx with this many rows")
+    parser.add_argument("--excel-sheets", type=int, default=1, help="yearly sheets to split statement.xlsx into")
+    args = parser.parse_args(argv)
+
+    for name, path in generate(args.out, args.pages, args.layout, args.seed).items():
+        print(f"{name:<14} {path}")
+    if args.excel_rows:
+        path = os.path.join(args.out, "statement.xlsx")
+        excel_statement(path, args.excel_rows, random.Random(f"{args.seed}/excel"), args.excel_sheets)
+        print(f"{'excel':<14} {path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
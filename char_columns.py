@@ -0,0 +1,133 @@
+import os
+from bisect import bisect_right
+
+# === CONFIG ===
+# How the line-oriented parsers (CBI, Kotak, IOB) read transactions: "text" splits
+# the reflowed page text into tokens, "chars" buckets page.chars into the columns
+# under the statement's header row (falling back to "text" when no header is found)
+PARSE_MODES = ("text", "chars")
+DEFAULT_PARSE_MODE = os.environ.get("PDF_PARSE_MODE", "text")
+# Chars whose tops are this close (pt) sit on the same line
+LINE_TOLERANCE = 3
+# A horizontal gap wider than this (pt) between two chars starts a new word
+WORD_GAP = 3
+# How far (pt) left of its header label a column's text may start
+HEADER_SLACK = 3
+# Pages searched for the header row before giving up
+HEADER_SEARCH_PAGES = 3
+
+
+def use_chars(mode=None):
+    """Whether parse mode `mode` (DEFAULT_PARSE_MODE when None) reads character columns."""
+    mode = DEFAULT_PARSE_MODE if mode is None else mode
+    if mode not in PARSE_MODES:
+        raise ValueError(f"unknown parse mode {mode!r}")
+    return mode == "chars"
+
+
+def _lines(chars):
+    """Chars clustered into lines by their top coordinate: [(top, bottom, chars sorted by x0)]."""
+    lines = []
+    current, top, bottom = [], None, None
+    for char in sorted(chars, key=lambda c: c["top"]):
+        if current and char["top"] - top > LINE_TOLERANCE:
+            lines.append((top, bottom, sorted(current, key=lambda c: c["x0"])))
+            current = []
+        if not current:
+            top, bottom = char["top"], char["bottom"]
+        current.append(char)
+        bottom = max(bottom, char["bottom"])
+    if current:
+        lines.append((top, bottom, sorted(current, key=lambda c: c["x0"])))
+    return lines
+
+
+def _words(chars):
+    """(text, x0, x1) per word of one line; spaces and gaps wider than WORD_GAP split words."""
+    words = []
+    text, x0, x1 = "", None, None
+    for char in chars:
+        if char["text"].isspace():
+            if text:
+                words.append((text, x0, x1))
+            text = ""
+            continue
+        if text and char["x0"] - x1 > WORD_GAP:
+            words.append((text, x0, x1))
+            text = ""
+        if not text:
+            x0 = char["x0"]
+        text += char["text"]
+        x1 = char["x1"]
+    if text:
+        words.append((text, x0, x1))
+    return words
+
+
+def _find_labels(words, labels):
+    """x0 of each label's first word, if all labels appear on this line in order."""
+    texts = [w[0] for w in words]
+    starts, pos = [], 0
+    for label in labels:
+        tokens = label.split()
+        for i in range(pos, len(texts) - len(tokens) + 1):
+            if texts[i:i + len(tokens)] == tokens:
+                starts.append(words[i][1])
+                pos = i + len(tokens)
+                break
+        else:
+            return None
+    return starts
+
+
+def continues(previous, row):
+    """True when `row` sits directly under `previous` (less than a line height between them)."""
+    top, bottom, _ = row
+    return previous is not None and top - previous[1] < bottom - top
+
+
+class ColumnLayout:
+    """
+    Column bands of a statement's transaction table, taken from the x positions
+    of its header labels. A band runs from its header's left edge to the next
+    header's; each word on a line lands in the band holding its right edge, so
+    left-aligned text and right-aligned amounts both stay under their header.
+
+    rows() then reads a page straight from its positioned chars (PdfSession.page_chars):
+    chars are clustered into lines by their top, split into words, and the words
+    bucketed into columns, without pdfplumber's text reflow.
+    """
+
+    __slots__ = ("labels", "bounds")
+
+    def __init__(self, labels, starts):
+        self.labels = labels
+        self.bounds = [x - HEADER_SLACK for x in starts[1:]]
+
+    @classmethod
+    def find(cls, session, labels):
+        """Layout from the first header row on the session's first pages, or None."""
+        for index in range(min(HEADER_SEARCH_PAGES, len(session.pages))):
+            for _, _, chars in _lines(session.page_chars(index)):
+                starts = _find_labels(_words(chars), labels)
+                if starts is not None:
+                    return cls(labels, starts)
+        return None
+
+    def rows(self, chars):
+        """
+        (top, bottom, cells) for every line of a page's chars below its header row
+        (the whole page when the header is not repeated on it); cells holds one
+        string per label, "" where the line has nothing in that column.
+        """
+        rows = []
+        for top, bottom, chars in _lines(chars):
+            cells = [[] for _ in self.labels]
+            for text, x0, x1 in _words(chars):
+                cells[bisect_right(self.bounds, x1)].append(text)
+            cells = [" ".join(words) for words in cells]
+            if cells == self.labels:
+                rows = []  # header row: what came before it is page furniture
+                continue
+            rows.append((top, bottom, cells))
+        return rows
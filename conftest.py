@@ -0,0 +1,2 @@
+# The modules live flat in the repo root; pytest puts this directory on sys.path for
+# conftest.py, so tests/ can import them under a bare `pytest` as well as `python -m pytest`.
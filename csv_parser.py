@@ -0,0 +1,147 @@
+import csv
+import io
+import os
+from itertools import islice
+
+import pandas as pd
+
+from excel_parser import (
+    HEADER_SCAN_ROWS, NA_STRINGS, _header_names, _sample, _source_name_and_size, _with_sheet, clean_dataframe,
+    extract_raw_metadata, find_header_row, normalize_datetime_columns,
+)
+
+# === CONFIG ===
+# Text encoding of statement CSVs (a UTF-8 byte-order mark is skipped either way)
+CSV_ENCODING = os.environ.get("CSV_ENCODING", "utf-8")
+# Bytes per block pyarrow hands to each reader thread
+CSV_BLOCK_SIZE = int(os.environ.get("CSV_BLOCK_SIZE", 1 << 22))
+# Delimiters the dialect is sniffed from, in order of preference
+CSV_DELIMITERS = ",;\t|"
+# Bytes looked at to sniff the delimiter, and to tell a header with no rows below it
+_SNIFF_BYTES = 1 << 16
+
+
+def _open_binary(source):
+    """(binary file object, whether we opened it) for a path, raw bytes, Streamlit UploadedFile or file object."""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source), True
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, "rb"), True
+    source.seek(0)
+    return source, False
+
+
+def sheet_name(source):
+    """What a CSV's rows get in SHEET_COLUMN: the file name without its extension ("" for raw bytes)."""
+    if isinstance(source, (bytes, bytearray)):
+        return ""
+    return os.path.splitext(os.path.basename(_source_name_and_size(source)[0]))[0]
+
+
+def _delimiter(fh):
+    """The delimiter sniffed from the first lines of `fh`, which is left where it was."""
+    start = fh.tell()
+    text = fh.read(_SNIFF_BYTES).decode(CSV_ENCODING, errors="replace").lstrip("\ufeff")
+    fh.seek(start)
+    try:
+        return csv.Sniffer().sniff("\n".join(text.splitlines()[:HEADER_SCAN_ROWS]), delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        return ","
+
+
+def read_head(fh):
+    """
+    The first HEADER_SCAN_ROWS rows of a CSV as lists of cells (NA_STRINGS as
+    None), with the delimiter and the byte offset after each row. The csv module
+    reads the rows from binary lines, so a quoted cell spanning lines stays one
+    row and the offsets stay exact; the rest of the file is left to pyarrow.
+    """
+    delimiter = _delimiter(fh)
+
+    def lines():
+        first = True
+        for line in iter(fh.readline, b""):
+            text = line.decode(CSV_ENCODING, errors="replace")
+            yield text.lstrip("\ufeff") if first else text
+            first = False
+
+    rows, offsets = [], []
+    for row in islice(csv.reader(lines(), delimiter=delimiter), HEADER_SCAN_ROWS):
+        rows.append([None if cell.strip() in NA_STRINGS else cell for cell in row])
+        offsets.append(fh.tell())  # the reader has pulled exactly this row's lines
+    return rows, delimiter, offsets
+
+
+def read_transactions(fh, offset, names, delimiter):
+    """
+    Rows from byte `offset` on as a frame named `names`, read by pyarrow's
+    multi-threaded CSV reader. Rows with a different number of fields (a closing
+    "End of statement" line, page footers) are skipped; a header with nothing
+    below it gives an empty frame with its columns.
+    """
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    fh.seek(offset)
+    body = fh.read(_SNIFF_BYTES)
+    if not body.strip() and len(body) < _SNIFF_BYTES:
+        return pd.DataFrame(columns=names)
+    fh.seek(offset)
+    table = pa_csv.read_csv(
+        pa.PythonFile(fh, mode="r"),
+        read_options=pa_csv.ReadOptions(
+            column_names=names, encoding=CSV_ENCODING, block_size=CSV_BLOCK_SIZE, use_threads=True,
+        ),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter, invalid_row_handler=lambda row: "skip"),
+        convert_options=pa_csv.ConvertOptions(null_values=sorted(NA_STRINGS), strings_can_be_null=True),
+    )
+    return table.to_pandas()
+
+
+def normalize_amount_columns(df):
+    """
+    Convert text columns holding amounts ("1,234.56", "250.00 Cr") to floats: a
+    CSV has no number cells, so what an Excel export stores as numbers arrives as
+    text whenever it carries thousands separators. Judged on a sample per column.
+    """
+    from amounts import parse_amounts
+
+    for col in df.columns:
+        if not (pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])):
+            continue
+        sample = _sample(df[col])
+        if sample and all(isinstance(v, str) for v in sample) and parse_amounts(sample, strict=True).notna().all():
+            df[col] = parse_amounts(df[col], strict=True)
+    return df
+
+
+def parse_csv_statement(source):
+    """
+    (metadata rows above the header, cleaned transaction table) for one CSV
+    statement, like excel_parser.parse_excel_statement gives for a workbook: the
+    header row is found in the first rows, everything below it goes through
+    pyarrow's threaded reader, then the Excel path's cleaning and date handling.
+    Both frames carry SHEET_COLUMN as a one-sheet workbook's would, set to sheet_name().
+    """
+    fh, opened = _open_binary(source)
+    try:
+        head, delimiter, offsets = read_head(fh)
+        head_df = pd.DataFrame(head)
+        header_row = find_header_row(head_df)
+        metadata_df = clean_dataframe(extract_raw_metadata(head_df, header_row))
+        if header_row is None:
+            names, offset = [str(i) for i in range(head_df.shape[1])], 0
+        else:
+            names, offset = [str(n) for n in _header_names(head[header_row])], offsets[header_row]
+        transaction_df = read_transactions(fh, offset, names, delimiter)
+    finally:
+        if opened:
+            fh.close()
+
+    transaction_df = clean_dataframe(transaction_df)
+    transaction_df = normalize_amount_columns(transaction_df)
+    transaction_df = normalize_datetime_columns(transaction_df)
+    sheet = sheet_name(source)
+    if not metadata_df.empty:
+        metadata_df = _with_sheet(metadata_df, sheet)
+    return metadata_df, _with_sheet(transaction_df, sheet)
@@ -1,51 +1,565 @@
-import streamlit as st
+import json
 import pandas as pd
 import os
-import plotly.express as px
-from datetime import datetime
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
+from io import BytesIO
+from itertools import chain, islice
+from xml.etree import ElementTree
 
-def run_excel_parser():
-    DEFAULT_FILE = "9921201000295_2020-till.xlsx"
+try:
+    from python_calamine import CalamineError
+except ImportError:  # python-calamine not installed: every workbook is read with openpyxl
+    CalamineError = None
+
+# === CONFIG ===
+# How workbooks are read: "pandas" (pd.read_excel), "stream" (the engine's rows
+# straight into a frame, without pandas' per-cell conversion) or "auto", which
+# streams files of at least STREAM_MIN_BYTES
+EXCEL_READ_MODES = ("auto", "pandas", "stream")
+DEFAULT_EXCEL_READ_MODE = os.environ.get("EXCEL_READ_MODE", "auto")
+STREAM_MIN_BYTES = int(os.environ.get("EXCEL_STREAM_MIN_BYTES", 1 << 20))
+# Reader under either mode, see EXCEL_ENGINES: "calamine" (falls back to openpyxl
+# when python-calamine is not installed or cannot read a workbook) or "openpyxl"
+DEFAULT_EXCEL_ENGINE = os.environ.get("EXCEL_ENGINE", "calamine")
+# The only workbooks openpyxl reads
+OPENPYXL_EXTENSIONS = (".xlsx", ".xlsm")
+# Cell strings pd.read_excel reads as missing; the streaming reader does the same
+NA_STRINGS = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+])
+# The header row is looked for in this many rows at the top of the sheet
+HEADER_SCAN_ROWS = int(os.environ.get("EXCEL_HEADER_SCAN_ROWS", 50))
+# A cell naming one of these (case-insensitive substring) counts toward its row being the header
+HEADER_KEYWORDS = ['date', 'description', 'particulars', 'narration', 'credit', 'debit', 'deposit',
+                   'withdrawal', 'amount', 'balance']
+HEADER_PATTERN = re.compile("|".join(map(re.escape, HEADER_KEYWORDS)), re.IGNORECASE)
+# Text date formats tried on a column's sample, day-first before month-first as on Indian statements
+DATE_FORMATS = [
+    "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%y", "%d-%m-%y", "%d.%m.%y",
+    "%d-%b-%Y", "%d %b %Y", "%d-%b-%y", "%d %b %y", "%d %B %Y",
+    "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d-%m-%Y %H:%M:%S", "%d-%m-%Y %H:%M",
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d", "%m/%d/%Y", "%m-%d-%Y",
+]
+# Values per column checked against a format before the whole column is converted with it
+DATE_SAMPLE_SIZE = 20
+# Rows per chunk when a workbook is converted to Parquet (excel_to_parquet)
+EXCEL_CHUNK_ROWS = int(os.environ.get("EXCEL_CHUNK_ROWS", 5000))
+# Where run_excel_parser keeps the Parquet conversions of large uploads, by content hash
+EXCEL_PARQUET_DIR = os.environ.get("EXCEL_PARQUET_DIR", os.path.join(".statement_cache", "excel"))
+# Least-recently-used conversions are dropped once EXCEL_PARQUET_DIR holds more than this
+EXCEL_PARQUET_MAX_BYTES = int(os.environ.get("EXCEL_PARQUET_MAX_BYTES", 1024 * 1024 * 1024))
+# Rows of a converted workbook shown in the transactions table
+PARQUET_PREVIEW_ROWS = 1000
+# Worker processes parsing the sheets of one workbook; 1 keeps everything in-process
+DEFAULT_SHEET_WORKERS = int(os.environ.get("EXCEL_SHEET_WORKERS", 1))
+# Column holding the name of the sheet each row came from
+SHEET_COLUMN = "Sheet"
 
-    def clean_dataframe(df):
-        df = df.dropna(how='all', axis=0)
+def clean_dataframe(df):
+    df = df.dropna(how='all', axis=0)
+    if len(df):  # a header with no rows below it keeps its columns
         df = df.dropna(how='all', axis=1)
-        return df
-
-    def find_header_row(df):
-        keywords = ['date', 'description', 'credit', 'debit', 'amount', 'balance']
-        for i, row in df.iterrows():
-            values = [str(cell).lower() for cell in row if pd.notnull(cell)]
-            if any(any(keyword in val for keyword in keywords) for val in values):
-                return i
+    return df
+
+def find_header_row(df, max_rows=None):
+    """
+    Index of the row among the first `max_rows` (HEADER_SCAN_ROWS) with the most
+    cells naming a HEADER_KEYWORDS entry, the first such row on a tie; None when
+    no cell there names one.
+    """
+    head = df.iloc[:HEADER_SCAN_ROWS if max_rows is None else max_rows]
+    if head.empty:
         return None
+    hits = head.apply(lambda col: col.astype("string").str.contains(HEADER_PATTERN, na=False))
+    scores = hits.sum(axis=1)
+    return scores.idxmax() if scores.max() > 0 else None
+
+def extract_raw_metadata(df, header_row):
+    return df.iloc[:header_row].reset_index(drop=True) if header_row else pd.DataFrame()
+
+def _source_name_and_size(source):
+    """(file name, size in bytes) of a path or an uploaded file object; size None when unknown."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source), os.path.getsize(source)
+    size = getattr(source, "size", None)
+    if size is None and hasattr(source, "getbuffer"):
+        size = source.getbuffer().nbytes
+    return getattr(source, "name", ""), size
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+# === Reader engines ===
+class OpenpyxlBook:
+    """openpyxl's read-only reader: a sheet's XML is parsed as its rows are read, so memory stays flat."""
+
+    def __init__(self, source):
+        from openpyxl import load_workbook
+
+        _rewind(source)
+        self.wb = load_workbook(source, read_only=True, data_only=True, keep_links=False)
+
+    def sheet_rows(self, sheet=None):
+        """Cell values of sheet `sheet` (the first when None) row by row, NA_STRINGS as None."""
+        ws = self.wb.worksheets[0] if sheet is None else self.wb[sheet]
+        for row in ws.iter_rows(values_only=True):
+            yield [None if isinstance(value, str) and value in NA_STRINGS else value for value in row]
+
+    def close(self):
+        self.wb.close()
+
+
+def _calamine_value(value):
+    # calamine gives "" for empty cells, floats for whole numbers and dates for date-only cells
+    if isinstance(value, str):
+        return None if value in NA_STRINGS else value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if type(value) is date:
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+class CalamineBook:
+    """
+    calamine (Rust, via python-calamine): a sheet is decoded natively in one pass,
+    about ten times faster than openpyxl, and .xls/.xlsb/.ods files read too. Cells
+    come back as openpyxl gives them.
+    """
+
+    def __init__(self, source):
+        from python_calamine import CalamineWorkbook
+
+        if isinstance(source, (str, os.PathLike)):
+            self.wb = CalamineWorkbook.from_path(os.fspath(source))
+        else:
+            _rewind(source)
+            self.wb = CalamineWorkbook.from_filelike(source)
+
+    def sheet_rows(self, sheet=None):
+        """Cell values of sheet `sheet` (the first when None) row by row, NA_STRINGS as None."""
+        ws = self.wb.get_sheet_by_index(0) if sheet is None else self.wb.get_sheet_by_name(sheet)
+        for row in ws.iter_rows():
+            yield [_calamine_value(value) for value in row]
+
+    def close(self):
+        self.wb.close()
+
+
+EXCEL_ENGINES = {
+    "calamine": CalamineBook,
+    "openpyxl": OpenpyxlBook,
+}
+
+
+def resolve_engine(engine=None):
+    """Engine name to read with: `engine` (DEFAULT_EXCEL_ENGINE when None), openpyxl if calamine is missing."""
+    engine = DEFAULT_EXCEL_ENGINE if engine is None else engine
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"unknown Excel engine {engine!r}")
+    return "openpyxl" if engine == "calamine" and CalamineError is None else engine
+
+def _falls_back(engine, error):
+    """
+    Whether a read that raised `error` is retried with openpyxl: calamine could not
+    read the workbook, or pandas (before 2.2) does not know the calamine engine.
+    """
+    if engine != "calamine":
+        return False
+    unreadable = CalamineError is not None and isinstance(error, CalamineError)
+    if not unreadable and not (isinstance(error, ValueError) and "Unknown engine" in str(error)):
+        return False
+    print(f"calamine could not read the workbook ({error}); retrying with openpyxl")
+    return True
+
+def _use_streaming(source, mode, engine):
+    mode = DEFAULT_EXCEL_READ_MODE if mode is None else mode
+    if mode not in EXCEL_READ_MODES:
+        raise ValueError(f"unknown Excel read mode {mode!r}")
+    name, size = _source_name_and_size(source)
+    if engine == "openpyxl" and not name.lower().endswith(OPENPYXL_EXTENSIONS):
+        return False  # leave .xls and friends to pandas
+    return mode == "stream" or (mode == "auto" and size is not None and size >= STREAM_MIN_BYTES)
+
+def sheet_names(source, engine=None):
+    """Names of a workbook's sheets in tab order; for .xlsx read from workbook.xml alone, no cells loaded."""
+    name, _ = _source_name_and_size(source)
+    if not name.lower().endswith(OPENPYXL_EXTENSIONS):
+        with pd.ExcelFile(source, engine=resolve_engine(engine)) as book:
+            names = book.sheet_names
+    else:
+        with zipfile.ZipFile(source) as archive:
+            root = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        names = [sheet.get("name") for sheet in root.iter() if sheet.tag.endswith("}sheet")]
+    _rewind(source)
+    return names
+
+def _sheet_rows(source, sheet, engine):
+    """Rows of sheet `sheet` (the first when None), opening the workbook with `engine` for just this read."""
+    book = EXCEL_ENGINES[engine](source)
+    try:
+        yield from book.sheet_rows(sheet)
+    finally:
+        book.close()
+
+def _rows_frame(rows):
+    """Streamed rows as pd.read_excel(..., header=None) would frame them."""
+    rows = list(rows)
+    while rows and all(value is None for value in rows[-1]):
+        rows.pop()  # sheets can report their stored dimensions, trailing blanks included
+    df = pd.DataFrame(rows)
+    used = df.notna().any().to_numpy().nonzero()[0]
+    return df.iloc[:, : used[-1] + 1 if len(used) else 0].infer_objects()
+
+def _raw_frames(source, sheets, streaming, engine):
+    """(sheet, raw frame) for each of `sheets` (None: the first sheet), opening the workbook once."""
+    if streaming:
+        book = EXCEL_ENGINES[engine](source)
+        try:
+            for sheet in sheets:
+                yield sheet, _rows_frame(book.sheet_rows(sheet))
+        finally:
+            book.close()
+    else:
+        _rewind(source)
+        with pd.ExcelFile(source, engine=engine) as book:
+            for sheet in sheets:
+                yield sheet, book.parse(0 if sheet is None else sheet, header=None)
+
+def read_raw_frame(source, mode=None, sheet=None, engine=None):
+    """A sheet (the first by default) with no header row, read once (streamed or by pandas, see EXCEL_READ_MODES)."""
+    engine = resolve_engine(engine)
+    streaming = _use_streaming(source, mode, engine)
+    try:
+        return list(_raw_frames(source, [sheet], streaming, engine))[0][1]
+    except Exception as e:
+        if not _falls_back(engine, e):
+            raise
+        return list(_raw_frames(source, [sheet], _use_streaming(source, mode, "openpyxl"), "openpyxl"))[0][1]
+
+def _header_names(values):
+    """Column names from a header row the way pd.read_excel(header=...) names them."""
+    names, seen = [], {}
+    for i, value in enumerate(values):
+        name = f"Unnamed: {i}" if pd.isna(value) else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def apply_header(raw_df, header_row):
+    """Rows below `header_row` of a raw sheet frame, named by that row and re-typed per column."""
+    data_df = raw_df.iloc[header_row + 1:].reset_index(drop=True)
+    data_df.columns = _header_names(raw_df.iloc[header_row].tolist())
+    return data_df.infer_objects()
 
-    def extract_raw_metadata(df, header_row):
-        return df.iloc[:header_row].reset_index(drop=True) if header_row else pd.DataFrame()
+def process_file(source, mode=None, sheet=None, engine=None):
+    raw_df = read_raw_frame(source, mode, sheet, engine)
+    header_row = find_header_row(raw_df)
+    metadata_df = extract_raw_metadata(raw_df, header_row)
+    if header_row is not None:
+        data_df = apply_header(raw_df, header_row)
+    else:
+        data_df = raw_df
+    return metadata_df, data_df
 
-    def process_file(source):
-        raw_df = pd.read_excel(source, header=None)
+def _shape(text):
+    """Digit runs as "0" and letter runs as "a": "01-Apr-2020" -> "0-a-0"."""
+    return re.sub(r"[A-Za-z]+", "a", re.sub(r"\d+", "0", text))
+
+@lru_cache(maxsize=None)
+def _formats_for_shape(shape):
+    """DATE_FORMATS whose output has this shape."""
+    sample = datetime(2000, 10, 10, 10, 10, 10)
+    return tuple(fmt for fmt in DATE_FORMATS if _shape(sample.strftime(fmt)) == shape)
+
+def _parses(fmt, values):
+    try:
+        for value in values:
+            datetime.strptime(value, fmt)
+    except ValueError:
+        return False
+    return True
+
+def infer_date_format(values, column=None, formats=None):
+    """
+    Explicit DATE_FORMATS entry every string in `values` parses with, or None.
+    `formats` maps (column name, value shape) to the format found before; pass
+    the same dict for every sheet of one workbook so an ambiguous sheet keeps
+    the day/month order the others settled on. It is never shared across
+    workbooks, whose exports may order them differently.
+    """
+    shapes = {_shape(v) for v in values}
+    if len(shapes) != 1:
+        return None
+    formats = {} if formats is None else formats
+    key = (column, shapes.pop())
+    cached = formats.get(key)
+    if cached is not None and _parses(cached, values):
+        return cached
+    for fmt in _formats_for_shape(key[1]):
+        if fmt != cached and _parses(fmt, values):
+            formats[key] = fmt
+            return fmt
+    return None
+
+def _sample(col):
+    values = col.dropna()
+    step = max(1, len(values) // DATE_SAMPLE_SIZE)
+    return values.iloc[::step].iloc[:DATE_SAMPLE_SIZE].tolist()
+
+def normalize_datetime_columns(df, formats=None):
+    """
+    Convert the date columns of `df` to datetimes. Numeric and datetime columns
+    are left alone; other columns are judged on a sample of their values, and
+    converted when the sample holds date cells, or text in one explicit date
+    format (see infer_date_format for `formats`). Cells that do not fit (a
+    "Total" footer) become NaT, as in _conform.
+    """
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_datetime64_any_dtype(df[col]):
+            continue
+        sample = _sample(df[col])
+        if not sample:
+            continue
+        if all(isinstance(v, date) for v in sample):
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+        elif all(isinstance(v, str) for v in sample):
+            fmt = infer_date_format(sample, col, formats)
+            if fmt is not None:
+                df[col] = pd.to_datetime(df[col], format=fmt, errors="coerce")
+    return df
+
+def _with_sheet(df, sheet):
+    """`df` with SHEET_COLUMN in front; labels as strings, as Arrow wants them next to it."""
+    df = df.rename(columns=str)
+    df.insert(0, SHEET_COLUMN, sheet)
+    return df
+
+def _parse_sheets(ref, sheets, streaming, engine):
+    """
+    Worker: (sheet, metadata, transactions, whether a header row was found) for
+    each of `sheets`. `ref` is a path, the raw workbook bytes or a file object.
+    """
+    src = BytesIO(ref) if isinstance(ref, bytes) else ref
+    try:
+        return _structure_sheets(_raw_frames(src, sheets, streaming, engine))
+    except Exception as e:
+        if not _falls_back(engine, e):
+            raise
+        return _structure_sheets(_raw_frames(src, sheets, streaming, "openpyxl"))
+
+def _structure_sheets(raw_frames):
+    results, formats = [], {}
+    for sheet, raw_df in raw_frames:
         header_row = find_header_row(raw_df)
-        metadata_df = extract_raw_metadata(raw_df, header_row)
-        if header_row is not None:
-            data_df = pd.read_excel(source, header=header_row)
+        metadata_df = clean_dataframe(extract_raw_metadata(raw_df, header_row))
+        transaction_df = raw_df if header_row is None else apply_header(raw_df, header_row)
+        transaction_df = normalize_datetime_columns(clean_dataframe(transaction_df), formats)
+        results.append((sheet, metadata_df, transaction_df, header_row is not None))
+    return results
+
+def parse_excel_statement(source, mode=None, workers=None, engine=None):
+    """
+    (metadata rows above the header, cleaned transaction table) for one workbook.
+    Every sheet with a header row is parsed (all of them when none has one),
+    spread over `workers` processes (DEFAULT_SHEET_WORKERS), and the sheets'
+    rows are stacked in tab order with their sheet name in SHEET_COLUMN.
+    """
+    from parse_cache import read_source_bytes
+
+    engine = resolve_engine(engine)
+    sheets = sheet_names(source, engine)
+    streaming = _use_streaming(source, mode, engine)
+    workers = max(1, min(DEFAULT_SHEET_WORKERS if workers is None else workers, len(sheets)))
+    if workers == 1:
+        results = _parse_sheets(source, sheets, streaming, engine)
+    else:
+        # Each worker opens the workbook itself and parses every workers-th sheet
+        ref = os.fspath(source) if isinstance(source, (str, os.PathLike)) else read_source_bytes(source)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_parse_sheets, ref, sheets[i::workers], streaming, engine) for i in range(workers)]
+            by_sheet = {result[0]: result for future in futures for result in future.result()}
+        results = [by_sheet[sheet] for sheet in sheets]
+
+    results = [r for r in results if r[3]] or results
+    metadata = [_with_sheet(m, sheet) for sheet, m, _, _ in results if not m.empty]
+    metadata_df = pd.concat(metadata, ignore_index=True) if metadata else pd.DataFrame()
+    transaction_df = pd.concat([_with_sheet(t, sheet) for sheet, _, t, _ in results], ignore_index=True)
+    return metadata_df, transaction_df
+
+
+# === Chunked conversion to Parquet ===
+def _column_types(chunk):
+    """Per column of the first chunk: "number", ("date", format or None for date cells) or "text"."""
+    types = {}
+    for col in chunk.columns:
+        if pd.api.types.is_numeric_dtype(chunk[col]):
+            types[col] = "number"
+        elif pd.api.types.is_datetime64_any_dtype(chunk[col]):
+            types[col] = ("date", None)
         else:
-            data_df = raw_df
-        return metadata_df, data_df
+            types[col] = "text"
+            sample = _sample(chunk[col])
+            if sample and all(isinstance(v, date) for v in sample):
+                types[col] = ("date", None)
+            elif sample and all(isinstance(v, str) for v in sample):
+                fmt = infer_date_format(sample, col)
+                if fmt is not None:
+                    types[col] = ("date", fmt)
+    return types
 
-    def normalize_datetime_columns(df):
-        for col in df.columns:
-            try:
-                df[col] = pd.to_datetime(df[col])
-            except (ValueError, TypeError):
-                pass
-        return df
+def _conform(chunk, types):
+    """A chunk with every column in its first-chunk type; values that do not fit become missing."""
+    for col, kind in types.items():
+        if kind == "number":
+            chunk[col] = pd.to_numeric(chunk[col], errors="coerce").astype("float64")
+        elif kind == "text":
+            chunk[col] = chunk[col].map(str, na_action="ignore").astype(object)
+        else:
+            chunk[col] = pd.to_datetime(chunk[col], format=kind[1], errors="coerce")
+    return chunk
+
+def _open_sheet(source, sheet, engine):
+    """(metadata frame, column names, row iterator below the header, header row index or None) of a streamed sheet."""
+    rows = _sheet_rows(source, sheet, engine)
+    try:
+        head = list(islice(rows, HEADER_SCAN_ROWS))
+    except Exception as e:
+        if not _falls_back(engine, e):
+            raise
+        rows = _sheet_rows(source, sheet, "openpyxl")
+        head = list(islice(rows, HEADER_SCAN_ROWS))
+    head_df = pd.DataFrame(head)
+    header_row = find_header_row(head_df)
+    metadata_df = clean_dataframe(extract_raw_metadata(head_df, header_row))
+    if header_row is None:
+        return metadata_df, [str(i) for i in range(head_df.shape[1])], chain(head, rows), None
+    names = [str(n) for n in _header_names(head[header_row])]
+    return metadata_df, names, chain(head[header_row + 1:], rows), header_row
+
+def _chunks(names, body, chunk_rows, types):
+    width = len(names)
+    while True:
+        batch = [row[:width] + [None] * (width - len(row)) for row in islice(body, chunk_rows)]
+        if not batch:
+            return
+        chunk = pd.DataFrame(batch, columns=names)
+        if not types:
+            keep = [n for n in names if not n.startswith("Unnamed: ") or chunk[n].notna().any()]
+            types.update(_column_types(chunk[keep].dropna(how='all').infer_objects()))
+        chunk = chunk.reindex(columns=list(types)).dropna(how='all')
+        if len(chunk):
+            yield _conform(chunk.reset_index(drop=True), types)
+
+def iter_excel_statement(source, chunk_rows=None, sheet=None, types=None, engine=None):
+    """
+    Streaming variant of parse_excel_statement for one sheet (the first by
+    default) of a workbook: (metadata frame, generator of transaction
+    chunks of up to `chunk_rows` rows). The header is found in the first
+    HEADER_SCAN_ROWS rows; every chunk is cleaned like clean_dataframe (empty rows
+    dropped, and columns with neither a header nor values in the first chunk) and
+    typed like the first one, so memory stays flat however long the sheet is
+    (beyond the sheet calamine holds decoded, in compact native form).
+    `types` (filled from the first chunk when empty) fits the chunks to another
+    sheet's columns instead.
+    """
+    metadata_df, names, body, _ = _open_sheet(source, sheet, resolve_engine(engine))
+    return metadata_df, _chunks(names, body, chunk_rows or EXCEL_CHUNK_ROWS, {} if types is None else types)
+
+def excel_to_parquet(source, path, chunk_rows=None, engine=None):
+    """
+    Convert the transaction tables of a workbook's sheets to one Parquet file
+    chunk by chunk, like parse_excel_statement: sheets without a header row are
+    skipped unless none has one, the sheet name goes to SHEET_COLUMN and later
+    sheets are fitted to the first one's columns. Returns (metadata frame, rows written).
+    """
+    from statement_stream import write_chunks
+
+    engine = resolve_engine(engine)
+    metadata, types = [], {}
+
+    def convert(sheets, headerless):
+        skipped = []
+        for sheet in sheets:
+            metadata_df, names, body, header_row = _open_sheet(source, sheet, engine)
+            if header_row is None and not headerless:
+                skipped.append(sheet)
+                continue
+            if not metadata_df.empty:
+                metadata.append(_with_sheet(metadata_df, sheet))
+            for chunk in _chunks(names, body, chunk_rows or EXCEL_CHUNK_ROWS, types):
+                yield _with_sheet(chunk, sheet)
+        if skipped and not types:
+            yield from convert(skipped, True)
+
+    rows = write_chunks(convert(sheet_names(source, engine), False), path)
+    return (pd.concat(metadata, ignore_index=True) if metadata else pd.DataFrame()), rows
+
+def cached_excel_parquet(source, out_dir=None, engine=None):
+    """
+    (metadata frame, Parquet path) of an upload converted once per content: later
+    sessions open the same file and read only the columns they need. The folder is
+    a StatementStore, so it is kept under EXCEL_PARQUET_MAX_BYTES by the same
+    least-recently-used eviction.
+    """
+    from parse_cache import content_hash
+    from statement_store import StatementStore, publish, temp_name
+
+    store = StatementStore(out_dir or EXCEL_PARQUET_DIR, EXCEL_PARQUET_MAX_BYTES)
+    base = os.path.join(store.root, content_hash(source))
+    try:
+        with open(base + ".json", encoding="utf-8") as fh:
+            raw_rows = json.load(fh)
+        os.utime(base + ".json")  # mark as recently used
+        hit = os.path.exists(base + ".parquet")
+    except (OSError, ValueError):
+        hit = False
+    if not hit:
+        _rewind(source)
+        parquet_tmp, json_tmp = temp_name(base, ".parquet"), temp_name(base + ".json")
+        metadata_df, _ = excel_to_parquet(source, parquet_tmp, engine=engine)
+        text = json.dumps(metadata_df.astype(object).where(metadata_df.notna(), None).values.tolist(), default=str)
+        with open(json_tmp, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        raw_rows = json.loads(text)  # as a later hit reads them back
+        if publish(parquet_tmp, base + ".parquet"):
+            publish(json_tmp, base + ".json")
+        store.evict(keep=base)
+    return pd.DataFrame(raw_rows), base + ".parquet"
+
+def parquet_preview(path, rows=None):
+    """(first `rows` rows, total rows) of a converted workbook, without reading the rest."""
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    batch = next(parquet_file.iter_batches(batch_size=rows or PARQUET_PREVIEW_ROWS), None)
+    head = batch.to_pandas() if batch is not None else parquet_file.schema_arrow.empty_table().to_pandas()
+    return head, parquet_file.metadata.num_rows
+
+
+def run_excel_parser():
+    import streamlit as st
+    import plotly.express as px
+
+    DEFAULT_FILE = "9921201000295_2020-till.xlsx"
 
     # ✅ This is what was missing
     def main():
         st.title("📄 Bank Statement Structurer")
 
-        uploaded_file = st.file_uploader("📁 Upload a heterogeneous Excel bank statement", type=["xlsx", "xls"])
+        uploaded_file = st.file_uploader("📁 Upload a heterogeneous Excel or CSV bank statement",
+                                         type=["xlsx", "xls", "csv"])
         if uploaded_file is not None:
             source = uploaded_file
             st.success("✅ Using uploaded file.")
@@ -56,21 +570,38 @@ def run_excel_parser():
             st.error("❌ No file uploaded and default file not found.")
             return
 
-        metadata_df, transaction_df = process_file(source)
-        transaction_df = clean_dataframe(transaction_df)
-        metadata_df = clean_dataframe(metadata_df)
-        transaction_df = normalize_datetime_columns(transaction_df)
+        if str(getattr(source, "name", source)).lower().endswith(".csv"):
+            from csv_parser import parse_csv_statement
+
+            # CSV is read by pyarrow's threaded reader; no engine choice or Parquet staging needed
+            large = False
+            metadata_df, transaction_df = parse_csv_statement(source)
+        else:
+            engines = list(EXCEL_ENGINES)
+            engine = st.selectbox("Reader engine", engines, index=engines.index(resolve_engine()))
+
+            # Large workbooks are converted to Parquet once and read a column at a time from there
+            large = _use_streaming(source, None, resolve_engine(engine))
+            if large:
+                metadata_df, parquet_path = cached_excel_parquet(source, engine=engine)
+                transaction_df, total_rows = parquet_preview(parquet_path)
+            else:
+                metadata_df, transaction_df = parse_excel_statement(source, engine=engine)
 
         if not metadata_df.empty:
             st.subheader("📌 Metadata Rows (Before Transaction Table Starts)")
             st.dataframe(metadata_df, use_container_width=True)
 
         st.subheader("📊 Structured Transactions")
+        if large:
+            st.caption(f"First {len(transaction_df):,} of {total_rows:,} rows.")
         st.dataframe(transaction_df, use_container_width=True)
 
         st.subheader("🔍 Analyze and Group Transactions")
         if not transaction_df.empty:
             group_by_column = st.selectbox("Select a column to group by", transaction_df.columns)
+            if large:
+                transaction_df = pd.read_parquet(parquet_path, columns=[group_by_column])
             if pd.api.types.is_datetime64_any_dtype(transaction_df[group_by_column]):
                 date_option = st.selectbox("Group datetime by", ["Full Timestamp", "Date", "Month", "Year"])
                 if date_option == "Date":
@@ -1,239 +1,291 @@
-import streamlit as st
-import pdfplumber
 import pandas as pd
-import re
 import os
 from io import BytesIO
 from collections import Counter
+from pdf_session import open_session
+from parse_cache import cached_parse
+from amounts import parse_amounts
+from records import ColumnBuilder
+from char_columns import ColumnLayout, continues, use_chars
+from timings import stage
+from patterns import (
+    IOB_ACCOUNT, IOB_DATE_TRAN, IOB_PAGE_SUFFIX, IOB_PERIOD, IOB_REPORT_TO, IOB_SEPARATOR,
+    IOB_SERVICE_OUTLET, WORD_SPLIT,
+)
+
+# Bump when the parsed output changes; cached parses of older versions are then ignored
+PARSER_VERSION = "1"
+
+def extract_metadata_from_pdf(file):
+    metadata = {}
+    lines = []
+
+    with open_session(file) as session:
+        text = session.first_page_text()  # only need first page
+        if text:
+            lines.extend([l.strip() for l in text.split("\n") if l.strip()])
+
+    full_text = "\n".join(lines)
+
+    # --- Bank ---
+    metadata["Bank"] = "INDIAN OVERSEAS BANK"
+
+    # --- Branch + Address ---
+    branch_line = next((ln for ln in lines if "INDIAN OVERSEAS BANK" in ln.upper()), "")
+    if branch_line:
+        # Example: "INDIAN OVERSEAS BANK, MAHALAKSHMIPURAM, BANGALORE"
+        branch_line = IOB_PAGE_SUFFIX.sub("", branch_line).strip()
+        parts = branch_line.split(",", 1)
+        if len(parts) == 2:
+            branch_info = parts[1].strip()
+            metadata["Branch"] = branch_info.split(",")[0].strip()
+            metadata["Branch Address"] = branch_info
+        else:
+            metadata["Branch"] = ""
+            metadata["Branch Address"] = branch_line.strip()
+
+    # --- Account Number + Holder Name ---
+    acct_line = next((ln for ln in lines if "Account Number" in ln), "")
+    if acct_line:
+        # Example: "Account Number :2314569874512563/INR Jhone Doe"
+        match = IOB_ACCOUNT.search(acct_line)
+        if match:
+            metadata["Account Number"] = match.group(1)
+            metadata["Product"] = match.group(2)
+            metadata["Account Holder Name"] = match.group(3).strip()
 
-def run_pdf_parser_iob():
-    # === CONFIG ===
-    DEFAULT_FILE = "iob stmt.pdf"
+    # --- Report To ---
+    rpt_match = IOB_REPORT_TO.search(full_text)
+    metadata["Report To"] = rpt_match.group(1) if rpt_match else ""
 
+    # --- Service Outlet ---
+    svc_match = IOB_SERVICE_OUTLET.search(full_text)
+    metadata["Service Outlet"] = svc_match.group(1).strip() if svc_match else ""
 
-    def extract_metadata_from_pdf(file):
-        metadata = {}
-        lines = []
-
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    lines.extend([l.strip() for l in text.split("\n") if l.strip()])
-                break  # only need first page
-
-        full_text = "\n".join(lines)
-
-        # --- Bank ---
-        metadata["Bank"] = "INDIAN OVERSEAS BANK"
-
-        # --- Branch + Address ---
-        branch_line = next((ln for ln in lines if "INDIAN OVERSEAS BANK" in ln.upper()), "")
-        if branch_line:
-            # Example: "INDIAN OVERSEAS BANK, MAHALAKSHMIPURAM, BANGALORE"
-            branch_line = re.sub(r"\s*Page\s*\d+\s*$", "", branch_line, flags=re.I).strip()
-            parts = branch_line.split(",", 1)
-            if len(parts) == 2:
-                branch_info = parts[1].strip()
-                metadata["Branch"] = branch_info.split(",")[0].strip()
-                metadata["Branch Address"] = branch_info
-            else:
-                metadata["Branch"] = ""
-                metadata["Branch Address"] = branch_line.strip()
+    # --- Statement Period ---
+    stmt_period = IOB_PERIOD.search(full_text)
+    metadata["Statement Period"] = (
+        f"{stmt_period.group(1)} to {stmt_period.group(2)}" if stmt_period else ""
+    )
 
-        # --- Account Number + Holder Name ---
-        acct_line = next((ln for ln in lines if "Account Number" in ln), "")
-        if acct_line:
-            # Example: "Account Number :2314569874512563/INR Jhone Doe"
-            match = re.search(r"Account Number\s*:\s*([\d]+)/(INR)\s+(.*)", acct_line, re.I)
-            if match:
-                metadata["Account Number"] = match.group(1)
-                metadata["Product"] = match.group(2)
-                metadata["Account Holder Name"] = match.group(3).strip()
 
-        # --- Report To ---
-        rpt_match = re.search(r"Report\s*To\s*:\s*(\w+)", full_text, re.I)
-        metadata["Report To"] = rpt_match.group(1) if rpt_match else ""
 
-        # --- Service Outlet ---
-        svc_match = re.search(r"Service\s*OutLet\s*:\s*([\w\s]+)", full_text, re.I)
-        metadata["Service Outlet"] = svc_match.group(1).strip() if svc_match else ""
+    return metadata
 
-        # --- Statement Period ---
-        stmt_period = re.search(
-            r"Report\s*for\s*the\s*Period\s*:\s*(\d{2}-\d{2}-\d{4})\s*TO\s*(\d{2}-\d{2}-\d{4})",
-            full_text,
-            re.I
-        )
-        metadata["Statement Period"] = (
-            f"{stmt_period.group(1)} to {stmt_period.group(2)}" if stmt_period else ""
-        )
 
-       
+def split_date_tran(s):
+    """
+    Split combined Post Date + Tran like '16-04-2019S42347939'
+    Returns: date_str, tran_str
+    """
+    match = IOB_DATE_TRAN.match(s)
+    if match:
+        return match.group(1), match.group(2) if match.group(2) else None
+    return None, s
 
-        return metadata
 
+IOB_COLUMNS = ["Post Date", "Tran", "Ref Num", "Particulars", "Debit", "Credit", "Balance"]
+# Header labels of the transaction table, left to right, one per IOB_COLUMNS entry
+IOB_HEADER_LABELS = ["Post Date", "Tran Id", "Ref Num", "Particulars", "Debit", "Credit", "Balance Amt"]
 
-     
- 
 
+def parse_transaction_line(parts):
+    """
+    Parse a transaction line into structured fields (a tuple in IOB_COLUMNS order)
+    """
 
-    def parse_amount(value):
-        if value is None:
-            return None
-        s = str(value).strip()
-        if s == "" or s == "-" or s.upper() in ["NA", "N/A", "—", "–"]:
-            return None
-        s_up = s.upper().replace("CR", "").replace("DR", "")
-        if "(" in s_up and ")" in s_up:
-            s_up = s_up.replace("(", "-").replace(")", "")
-        s_clean = re.sub(r"[^\d\.-]", "", s_up)
-        if s_clean in ["", "-", "."]:
-            return None
-        try:
-            return float(s_clean)
-        except Exception:
-            return None
+    # 1. Post date + Tran
+    post_date, tran = split_date_tran(parts[0])
 
+    # 2. Ref number (next token if available)
+    ref_num = parts[1] if len(parts) > 1 else None
 
-    def split_date_tran(s):
-        """
-        Split combined Post Date + Tran like '16-04-2019S42347939'
-        Returns: date_str, tran_str
-        """
-        match = re.match(r"(\d{2}-\d{2}-\d{4})(.*)", s)
-        if match:
-            return match.group(1), match.group(2) if match.group(2) else None
-        return None, s
-
+    # 3. Last = Balance (with CR/DR)
+    balance = parts[-1]
+    balance_type = "CR" if "CR" in balance.upper() else "DR"
 
-    def parse_transaction_line(parts):
-        """
-        Parse a transaction line into structured fields
-        """
+    # 4. Second last = Transaction amount (raw; _clean_iob_frame parses the columns)
+    amount = parts[-2]
+    debit, credit = (None, amount) if balance_type == "CR" else (amount, None)
 
-        # 1. Post date + Tran
-        post_date, tran = split_date_tran(parts[0])
+    # 5. Particulars = everything between ref_num and amount
+    particulars = " ".join(parts[2:-2]).strip() if len(parts) > 4 else None
 
-        # 2. Ref number (next token if available)
-        ref_num = parts[1] if len(parts) > 1 else None
+    return post_date, tran, ref_num, particulars, debit, credit, balance
 
-        # 3. Last = Balance (with CR/DR)
-        balance_raw = parts[-1]
-        balance = parse_amount(balance_raw)
-        balance_type = "CR" if "CR" in balance_raw.upper() else "DR"
 
-        # 4. Second last = Transaction amount
-        amount_raw = parts[-2]
-        amount = parse_amount(amount_raw)
+def _scan_iob_lines(text, state, rows):
+    """Parse one page's text into the `rows` ColumnBuilder; `state` remembers whether the opening balance was seen."""
+    lines = [l.strip() for l in text.split("\n") if l.strip()]
 
-        debit, credit = None, None
-        if amount is not None:
-            if balance_type == "CR":
-                credit = amount
+    for ln in lines:
+        # Don't parse anything until we see Account Opening Balance
+        if not state["started"]:
+            if "ACCOUNT OPENING BALANCE" in ln.upper():
+                state["started"] = True
             else:
-                debit = amount
-
-        # 5. Particulars = everything between ref_num and amount
-        particulars = " ".join(parts[2:-2]).strip() if len(parts) > 4 else None
-
-        return {
-            "Post Date": post_date,
-            "Tran": tran,
-            "Ref Num": ref_num,
-            "Particulars": particulars,
-            "Debit": debit,
-            "Credit": credit,
-            "Balance": balance
-        }
-
-
-    def parse_iob_pdf(file_path):
-        rows = []
-        start_parsing = False  # <-- flag to start only after Account Opening Balance
-
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if not text:
-                    continue
-                lines = [l.strip() for l in text.split("\n") if l.strip()]
-
-                for ln in lines:
-                    # Don't parse anything until we see Account Opening Balance
-                    if not start_parsing:
-                        if "ACCOUNT OPENING BALANCE" in ln.upper():
-                            start_parsing = True
-                        else:
-                            continue   # skip all lines before opening balance
-
-                    # Skip headers/separators
-                    if re.match(r"^-{5,}", ln):
-                        continue
-                    if any(h in ln for h in ["Date", "Particulars", "Balance Amt", "Contra Id"]):
-                        continue
+                continue   # skip all lines before opening balance
 
-                    # Handle Account Opening Balance
-                    if "ACCOUNT OPENING BALANCE" in ln.upper():
-                        amt_raw = ln.split(":")[-1].strip()
-                        amt = parse_amount(amt_raw)
-                        rows.append({
-                            "Post Date": None,
-                            "Tran": None,
-                            "Ref Num": None,
-                            "Particulars": "ACCOUNT OPENING BALANCE",
-                            "Debit": None,
-                            "Credit": amt,
-                            "Balance": amt
-                        })
-                        continue
+        # Skip headers/separators
+        if IOB_SEPARATOR.match(ln):
+            continue
+        if any(h in ln for h in ["Date", "Particulars", "Balance Amt", "Contra Id"]):
+            continue
 
-                    # Handle Brought Forward
-                    if "BROUGHT FORWARD" in ln.upper():
-                        parts_bf = ln.split()
-                        amt_raw = parts_bf[-1]   # last token has CR/DR
-                        amt = parse_amount(amt_raw)
-                        rows.append({
-                            "Post Date": None,
-                            "Tran": None,
-                            "Ref Num": None,
-                            "Particulars": "BROUGHT FORWARD",
-                            "Debit": None,
-                            "Credit": None,
-                            "Balance": amt
-                        })
-                        continue
+        # Handle Account Opening Balance
+        if "ACCOUNT OPENING BALANCE" in ln.upper():
+            amt = ln.split(":")[-1].strip()
+            rows.append(None, None, None, "ACCOUNT OPENING BALANCE", None, amt, amt)
+            continue
 
-                    # Transaction rows
-                    parts = ln.split()
-                    if len(parts) < 4:
-                        continue
+        # Handle Brought Forward
+        if "BROUGHT FORWARD" in ln.upper():
+            parts_bf = ln.split()
+            amt = parts_bf[-1]   # last token has CR/DR
+            rows.append(None, None, None, "BROUGHT FORWARD", None, None, amt)
+            continue
+
+        # Transaction rows
+        parts = ln.split()
+        if len(parts) < 4:
+            continue
+
+        rows.append(*parse_transaction_line(parts))
+
+
+def _clean_iob_frame(df):
+    # Normalize string columns only
+    str_cols = df.select_dtypes(include=["object"]).columns
+    for c in str_cols:
+        df[c] = df[c].astype(str).str.strip()
+        df[c] = df[c].replace({"": None, "None": None})
+
+    # Raw amount cells -> floats, one pass per column
+    for col in ["Debit", "Credit", "Balance"]:
+        if col in df.columns:
+            df[col] = parse_amounts(df[col])
+    return df
+
+
+def parse_iob_pdf(file_path):
+    rows = ColumnBuilder(IOB_COLUMNS)
+    state = {"started": False}  # <-- flag to start only after Account Opening Balance
 
-                    row = parse_transaction_line(parts)
-                    rows.append(row)
+    with open_session(file_path) as session, stage("scan"):
+        session.prefetch("text")
+        for text in session.page_texts():
+            if text:
+                _scan_iob_lines(text, state, rows)
 
-        df = pd.DataFrame(rows)
+    return _finish_iob_frame(rows)
 
-        # Normalize string columns only
-        str_cols = df.select_dtypes(include=["object"]).columns
-        for c in str_cols:
-            df[c] = df[c].astype(str).str.strip()
-            df[c] = df[c].replace({"": None, "None": None})
 
-        # Ensure numeric columns are float
-        for col in ["Debit", "Credit", "Balance"]:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
+def _finish_iob_frame(rows):
+    """(DataFrame, keyword Counter) of the scanned rows."""
+    with stage("frame"):
+        df = _clean_iob_frame(rows.to_frame())
 
-        # --- Keywords ---
+    # --- Keywords ---
+    with stage("keywords"):
         keywords = []
         for d in df["Particulars"].fillna(""):
-            for w in re.split(r"\W+", str(d)):
+            for w in WORD_SPLIT.split(str(d)):
                 if len(w) > 3:
                     keywords.append(w.upper())
         direction_counts = Counter(keywords)
 
-        return df, direction_counts
+    return df, direction_counts
+
+
+def parse_iob_by_columns(file_path):
+    """
+    parse_iob_pdf() read from the page chars under the statement's header row
+    (char_columns.py): Debit and Credit come from their own columns and wrapped
+    Particulars lines are joined onto their transaction. None when no header row
+    is found.
+    """
+    rows = ColumnBuilder(IOB_COLUMNS)
+    started = False  # nothing counts before the Account Opening Balance line
+
+    with open_session(file_path) as session, stage("scan"):
+        layout = ColumnLayout.find(session, IOB_HEADER_LABELS)
+        if layout is None:
+            return None
+
+        pending = None  # the open transaction, as a list in IOB_COLUMNS order
+        for i in range(len(session.pages)):
+            previous = None
+            for row in layout.rows(session.page_chars(i)):
+                cells = row[2]
+                line = " ".join(c for c in cells if c)
+                upper = line.upper()
+
+                if "ACCOUNT OPENING BALANCE" in upper:
+                    started = True
+                    amt = line.split(":")[-1].strip()
+                    record = [None, None, None, "ACCOUNT OPENING BALANCE", None, amt, amt]
+                elif not started:
+                    continue
+                elif "BROUGHT FORWARD" in upper:
+                    record = [None, None, None, "BROUGHT FORWARD", None, None, cells[6] or line.split()[-1]]
+                else:
+                    # Post Date and Tran may be printed close enough to read as one word
+                    post_date, tran = split_date_tran(cells[0] + cells[1])
+                    if post_date is not None:
+                        record = [post_date, tran] + [c or None for c in cells[2:]]
+                    elif (pending and not (cells[0] or cells[1]) and cells[3] and not any(cells[4:])
+                          and continues(previous, row)):
+                        pending[3] = f"{pending[3] or ''} {cells[3]}".strip()
+                        previous = row
+                        continue
+                    else:
+                        continue
+
+                if pending:
+                    rows.append(*pending)
+                pending, previous = record, row
+
+        if pending:
+            rows.append(*pending)
+
+    return _finish_iob_frame(rows)
+
+
+def iter_iob_pdf(file_path):
+    """
+    Streaming variant of parse_iob_pdf: yields one DataFrame chunk per page as soon
+    as it is parsed and releases the page afterwards.
+    """
+    state = {"started": False}
+
+    with open_session(file_path) as session:
+        for i in range(len(session.pages)):
+            rows = ColumnBuilder(IOB_COLUMNS)
+            text = session.page_text(i)
+            session.release(i)
+            if text:
+                _scan_iob_lines(text, state, rows)
+            if rows:
+                yield _clean_iob_frame(rows.to_frame())
+
+
+# === Metadata + Transactions from one open document ===
+def parse_iob_statement(source, workers=None, text_backend=None, mode=None):
+    with open_session(source, workers=workers, text_backend=text_backend) as session:
+        session.prefetch("text")
+        with stage("metadata"):
+            metadata = extract_metadata_from_pdf(session)
+        transactions = parse_iob_by_columns(session) if use_chars(mode) else None
+        if transactions is None:  # text mode, or no header row to take columns from
+            transactions = parse_iob_pdf(session)
+        return metadata, transactions
+
+
+def run_pdf_parser_iob():
+    import streamlit as st
+
+    # === CONFIG ===
+    DEFAULT_FILE = "iob stmt.pdf"
 
     # === Streamlit UI ===
     def main():
@@ -251,15 +303,13 @@ def run_pdf_parser_iob():
             st.error("❌ No file uploaded and default file not found.")
             st.stop()
 
-        # Metadata
-        metadata = extract_metadata_from_pdf(source)
+        # Metadata + transactions (reused across reruns for the same upload)
+        metadata, (df, direction_counts) = cached_parse("IOB", PARSER_VERSION, source, parse_iob_statement)
+
         if metadata:
             with st.expander("📌 Extracted Metadata", expanded=True):
                 st.dataframe(pd.DataFrame(metadata.items(), columns=["Field", "Value"]))
 
-        # Transactions
-        df, direction_counts = parse_iob_pdf(source)
-
         if df.empty:
             st.warning("⚠ No transactions found.")
         else:
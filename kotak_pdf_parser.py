@@ -1,265 +1,309 @@
-import streamlit as st
-import pdfplumber
 import pandas as pd
-import re
 import os
 from io import BytesIO
 from collections import Counter
+from pdf_session import open_session
+from parse_cache import cached_parse
+from amounts import parse_amounts
+from records import ColumnBuilder
+from char_columns import ColumnLayout, continues, use_chars
+from timings import stage
+from patterns import KOTAK_BRANCH_ADDRESS_END, KOTAK_DATE, KOTAK_DECIMAL, KOTAK_STATE_COUNTRY, WORD_SPLIT
+
+# Bump when the parsed output changes; cached parses of older versions are then ignored
+PARSER_VERSION = "3"
+
+def extract_metadata_from_pdf(file):
+    metadata = {}
+    try:
+        with open_session(file) as session:
+            lines = []
+            for text in session.page_texts():
+                if text:
+                    lines.extend(text.split("\n"))
+
+        # Clean lines
+        lines = [l.strip() for l in lines if l and l.strip()]
+
+        metadata["Bank"] = "Kotak Mahindra Bank"
+
+                    # --- Account Holder Name ---
+        def _state_country_prefix(s: str) -> str:
+            # Grab a leading token like "KARNATAKA,INDIA" (or "TAMIL NADU, INDIA", etc.)
+            m = KOTAK_STATE_COUNTRY.match(s)
+            return m.group(1).strip() if m else ""
+
+        # --- Account Holder Name + Address ---
+        holder_name = None
+        addr_lines = []
+        started = False
+        address_mode = False
+
+        for i, raw in enumerate(lines):
+            line = raw.strip()
+            if not line:
+                continue
+
+            # Name can be on the same line as "Period :"
+            if not started and not line.lower().startswith("kotak"):
+                holder_name = line.split("Period :", 1)[0].strip() if "Period :" in line else line
+                started = True
+                continue
+
+            # Start capturing address after "Currency" (helps skip top-right block)
+            if "Currency" in line and started:
+                address_mode = True
+                continue
+
+            if not address_mode:
+                continue
+
+            # If "Branch :" appears inline, keep only the left part and continue
+            if "Branch :" in line:
+                left = line.split("Branch :", 1)[0].strip()
+                if left:
+                    addr_lines.append(left)
+                continue
+
+            # If "Nominee Registered" appears inline, keep only the left part and continue
+            if "Nominee Registered" in line:
+                left = line.split("Nominee Registered", 1)[0].strip()
+                if left:
+                    addr_lines.append(left)
+                continue
+
+            # "Branch Address :" ends the holder address, but recover any state/country line that
+            # got pushed to the next physical line by the two-column merge.
+            if "Branch Address" in line:
+                before, _, after = line.partition("Branch Address")
+                if before.strip():
+                    addr_lines.append(before.strip())
+
+                # peek NEXT line; if it starts with a state/country token, append just that token
+                if i + 1 < len(lines):
+                    nxt = lines[i + 1].strip()
+                    token = _state_country_prefix(nxt)
+                    if token:
+                        addr_lines.append(token)
+                break
+
+            if "Bracnch Address" in line:
+                before, _, after = line.partition("Bracnch Address")
+                if before.strip():
+                    addr_lines.append(before.strip())
+
+                # peek NEXT line; if it starts with a state/country token, append just that token
+                if i + 1 < len(lines):
+                    nxt = lines[i + 1].strip()
+                    token = _state_country_prefix(nxt)
+                    if token:
+                        addr_lines.append(token)
+                break
+
+            # Normal address line
+            addr_lines.append(line)
+
+        metadata["Account Holder Name"] = holder_name or ""
+        # Use newline join to keep lines distinct (you can switch to ", " if you prefer one line)
+        metadata["Account Holder Address"] = "\n".join([l for l in addr_lines if l]).strip()
+
+
+        # --- Right Side Details ---
+        branch_addr_collect = False
+        branch_addr_lines = []
+        for i, line in enumerate(lines):
+            clean_line = line.strip()
+
+            if "Period" in clean_line:
+                metadata["Period"] = clean_line.split(":", 1)[-1].strip()
+            if "Cust.Reln.No" in clean_line:
+                metadata["Cust.Reln.No"] = clean_line.split(":", 1)[-1].strip()
+            if "Account No" in clean_line:
+                metadata["Account Number"] = clean_line.split(":", 1)[-1].strip()
+            if "Currency" in clean_line:
+                metadata["Currency"] = clean_line.split(":", 1)[-1].strip()
+            if "Branch :" in clean_line:
+                metadata["Branch"] = clean_line.split(":", 1)[-1].strip()
+            if "Nominee Registered" in clean_line:
+                metadata["Nominee Registered"] = clean_line.split(":", 1)[-1].strip()
+
+            # Collect multi-line branch address
+            if "Branch Address" in clean_line or "Bracnch Address" in clean_line:
+                branch_addr_collect = True
+                branch_addr_lines.append(clean_line.split(":", 1)[-1].strip())
+                continue
+            if branch_addr_collect:
+                if KOTAK_BRANCH_ADDRESS_END.search(clean_line):
+                    branch_addr_collect = False
+                else:
+                    branch_addr_lines.append(clean_line)
+
+            if "Branch Phone No." in clean_line:
+                metadata["Branch Phone"] = clean_line.split(":", 1)[-1].strip()
+            if "MICR Code" in clean_line:
+                metadata["MICR Code"] = clean_line.split(":", 1)[-1].strip()
+            if "IFSC Code" in clean_line:
+                metadata["IFSC Code"] = clean_line.split(":", 1)[-1].strip()
+
+        metadata["Branch Address"] = " ".join(branch_addr_lines).strip()
+
+    except Exception as e:
+        print("Error extracting Kotak metadata:", e)
+
+    return metadata
+
+
+# ------------------ Helpers ------------------ #
+def is_amount_token(tok: str) -> bool:
+    """Return True if token is likely an amount (e.g. 3.00, 397.73, 0, 1,234.56, 45.00(Cr))."""
+    if not isinstance(tok, str) or not tok.strip():
+        return False
+    s = tok.strip().replace(",", "")
+    # remove Cr/Dr suffixes and parentheses for testing
+    s = s.replace("(Cr)", "").replace("(Dr)", "").replace("Cr", "").replace("Dr", "")
+    s = s.strip()
+    # Must be numeric (with optional decimal), or a short integer (to exclude account numbers)
+    if KOTAK_DECIMAL.match(s):  # decimal with 1-2 decimals
+        return True
+    if s.isdigit() and len(s) <= 6:  # small integers (0, 3, 1000) - account numbers are longer
+        return True
+    return False
+
+def is_date(text):
+    return KOTAK_DATE.match(text.strip()) is not None
+
+# ------------------ Transaction Parser (fixed merging + narration) ------------------ #
+KOTAK_COLUMNS = ["Date", "Narration", "Chq/Ref No", "Withdrawal (Dr)", "Deposit (Cr)", "Balance"]
+
+
+def parse_transactions(file, debug=False):
+    transactions = ColumnBuilder(KOTAK_COLUMNS)
+    buffer = None  # the open transaction, as a list in KOTAK_COLUMNS order
+
+    with open_session(file) as session, stage("scan"):
+        session.prefetch("text")
+        for page_text in session.page_texts():
+            lines = [l.strip() for l in page_text.split("\n") if l.strip()]
+
+            for ln in lines:
+                parts = ln.split()
+
+                # --- Case 1: B/F or C/F ---
+                if ln.startswith("B/F") or ln.startswith("C/F"):
+                    narration = "BROUGHT FORWARD" if ln.startswith("B/F") else "CARRIED FORWARD"
+                    transactions.append(None, narration, None, None, None, parts[-1])
+                    continue
 
-def kotak_pdf_parser():
-    DEFAULT_FILE = "kotak_stmt2.pdf"
+                # --- Case 2: New transaction row ---
+                if is_date(parts[0]):
+                    if buffer:  # save the previous transaction
+                        transactions.append(*buffer)
 
-    def extract_metadata_from_pdf(file):
-        metadata = {}
-        try:
-            with pdfplumber.open(file) as pdf:
-                lines = []
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        lines.extend(text.split("\n"))
-
-            # Clean lines
-            lines = [l.strip() for l in lines if l and l.strip()]
-
-            metadata["Bank"] = "Kotak Mahindra Bank"
-
-                        # --- Account Holder Name ---
-            def _state_country_prefix(s: str) -> str:
-                # Grab a leading token like "KARNATAKA,INDIA" (or "TAMIL NADU, INDIA", etc.)
-                m = re.match(r'^\s*([A-Z][A-Z\s\-]+,?\s*INDIA)\b', s)
-                return m.group(1).strip() if m else ""
-
-            # --- Account Holder Name + Address ---
-            holder_name = None
-            addr_lines = []
-            started = False
-            address_mode = False
-
-            for i, raw in enumerate(lines):
-                line = raw.strip()
-                if not line:
-                    continue
+                    # Raw tokens; the amount columns are parsed once after the scan
+                    date = parts[0]
+                    balance = parts[-1] if len(parts) >= 2 else None
+                    deposit = parts[-2] if len(parts) >= 3 else None
+                    withdrawal = parts[-3] if len(parts) >= 4 else None
 
-                # Name can be on the same line as "Period :"
-                if not started and not line.lower().startswith("kotak"):
-                    holder_name = line.split("Period :", 1)[0].strip() if "Period :" in line else line
-                    started = True
-                    continue
+                    # Narration = everything between Date and the last 3 tokens
+                    narration = " ".join(parts[1:-2]) if len(parts) > 3 else ""
 
-                # Start capturing address after "Currency" (helps skip top-right block)
-                if "Currency" in line and started:
-                    address_mode = True
-                    continue
+                    buffer = [date, narration, None, withdrawal, deposit, balance]
 
-                if not address_mode:
-                    continue
+                else:
+                    # --- Case 3: Continuation of narration ---
+                    if buffer:
+                        buffer[1] += " " + ln.strip()
 
-                # If "Branch :" appears inline, keep only the left part and continue
-                if "Branch :" in line:
-                    left = line.split("Branch :", 1)[0].strip()
-                    if left:
-                        addr_lines.append(left)
-                    continue
+            # flush last buffer of this page
+            if buffer:
+                transactions.append(*buffer)
+                buffer = None
 
-                # If "Nominee Registered" appears inline, keep only the left part and continue
-                if "Nominee Registered" in line:
-                    left = line.split("Nominee Registered", 1)[0].strip()
-                    if left:
-                        addr_lines.append(left)
-                    continue
+    return _finish_kotak_frame(transactions)
 
-                # "Branch Address :" ends the holder address, but recover any state/country line that
-                # got pushed to the next physical line by the two-column merge.
-                if "Branch Address" in line:
-                    before, _, after = line.partition("Branch Address")
-                    if before.strip():
-                        addr_lines.append(before.strip())
-
-                    # peek NEXT line; if it starts with a state/country token, append just that token
-                    if i + 1 < len(lines):
-                        nxt = lines[i + 1].strip()
-                        token = _state_country_prefix(nxt)
-                        if token:
-                            addr_lines.append(token)
-                    break
-                
-                if "Bracnch Address" in line:
-                    before, _, after = line.partition("Bracnch Address")
-                    if before.strip():
-                        addr_lines.append(before.strip())
-
-                    # peek NEXT line; if it starts with a state/country token, append just that token
-                    if i + 1 < len(lines):
-                        nxt = lines[i + 1].strip()
-                        token = _state_country_prefix(nxt)
-                        if token:
-                            addr_lines.append(token)
-                    break
-
-                # Normal address line
-                addr_lines.append(line)
-
-            metadata["Account Holder Name"] = holder_name or ""
-            # Use newline join to keep lines distinct (you can switch to ", " if you prefer one line)
-            metadata["Account Holder Address"] = "\n".join([l for l in addr_lines if l]).strip()
-
-
-            # --- Right Side Details ---
-            branch_addr_collect = False
-            branch_addr_lines = []
-            for i, line in enumerate(lines):
-                clean_line = line.strip()
-
-                if "Period" in clean_line:
-                    metadata["Period"] = clean_line.split(":", 1)[-1].strip()
-                if "Cust.Reln.No" in clean_line:
-                    metadata["Cust.Reln.No"] = clean_line.split(":", 1)[-1].strip()
-                if "Account No" in clean_line:
-                    metadata["Account Number"] = clean_line.split(":", 1)[-1].strip()
-                if "Currency" in clean_line:
-                    metadata["Currency"] = clean_line.split(":", 1)[-1].strip()
-                if "Branch :" in clean_line:
-                    metadata["Branch"] = clean_line.split(":", 1)[-1].strip()
-                if "Nominee Registered" in clean_line:
-                    metadata["Nominee Registered"] = clean_line.split(":", 1)[-1].strip()
-
-                # Collect multi-line branch address
-                if "Branch Address" in clean_line or "Bracnch Address" in clean_line:
-                    branch_addr_collect = True
-                    branch_addr_lines.append(clean_line.split(":", 1)[-1].strip())
-                    continue
-                if branch_addr_collect:
-                    if re.search(r"(Phone|MICR|IFSC|Email)", clean_line, re.I):
-                        branch_addr_collect = False
-                    else:
-                        branch_addr_lines.append(clean_line)
-
-                if "Branch Phone No." in clean_line:
-                    metadata["Branch Phone"] = clean_line.split(":", 1)[-1].strip()
-                if "MICR Code" in clean_line:
-                    metadata["MICR Code"] = clean_line.split(":", 1)[-1].strip()
-                if "IFSC Code" in clean_line:
-                    metadata["IFSC Code"] = clean_line.split(":", 1)[-1].strip()
-
-            metadata["Branch Address"] = " ".join(branch_addr_lines).strip()
-
-        except Exception as e:
-            print("Error extracting Kotak metadata:", e)
-
-        return metadata
-
-
-
-      # ------------------ Helpers ------------------ #
-    def is_amount_token(tok: str) -> bool:
-        """Return True if token is likely an amount (e.g. 3.00, 397.73, 0, 1,234.56, 45.00(Cr))."""
-        if not isinstance(tok, str) or not tok.strip():
-            return False
-        s = tok.strip().replace(",", "")
-        # remove Cr/Dr suffixes and parentheses for testing
-        s = s.replace("(Cr)", "").replace("(Dr)", "").replace("Cr", "").replace("Dr", "")
-        s = s.strip()
-        # Must be numeric (with optional decimal), or a short integer (to exclude account numbers)
-        if re.match(r"^-?\d+\.\d{1,2}$", s):  # decimal with 1-2 decimals
-            return True
-        if s.isdigit() and len(s) <= 6:  # small integers (0, 3, 1000) - account numbers are longer
-            return True
-        return False
 
-    def parse_amount(val: str) -> float:
-        """Safely parse withdrawal/deposit token to float; returns 0.0 on failure."""
-        try:
-            if not isinstance(val, str):
-                val = str(val)
-            s = val.replace(",", "").replace("(Cr)", "").replace("(Dr)", "").replace("Cr", "").replace("Dr", "").strip()
-            if s == "" or s == "-" or s.upper() in ["NA", "N/A"]:
-                return 0.0
-            return float(s)
-        except Exception:
-            return 0.0
-
-    def parse_balance(val: str) -> float:
-        """Safely parse balance token to float; returns 0.0 on failure."""
-        return parse_amount(val)
-
-    def is_date(text):
-        return re.match(r"^\d{2}-\d{2}-\d{4}$", text.strip()) is not None
-
-    def parse_balance(val):
-        return float(val.replace("(Cr)", "").replace("(Dr)", "").replace(",", "").strip())
-
-    def parse_amount(val):
-        try:
-            return float(val.replace(",", "").strip())
-        except:
-            return 0.0
-
-    # ------------------ Transaction Parser (fixed merging + narration) ------------------ #
-    def parse_transactions(file, debug=False):
-        transactions = []
-        buffer = None
-        keywords = []
+def _finish_kotak_frame(transactions):
+    """(DataFrame, keyword Counter) of the scanned rows."""
+    with stage("frame"):
+        df = transactions.to_frame()
+        for col in ["Withdrawal (Dr)", "Deposit (Cr)", "Balance"]:
+            # Tokens that are not amounts (narration words) count as 0, as before
+            df[col] = parse_amounts(df[col], strict=True).fillna(0.0)
 
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                lines = [l.strip() for l in page.extract_text().split("\n") if l.strip()]
-
-                for ln in lines:
-                    parts = ln.split()
-
-                    # --- Case 1: B/F or C/F ---
-                    if ln.startswith("B/F") or ln.startswith("C/F"):
-                        balance = parse_balance(parts[-1])
-                        transactions.append({
-                            "Date": None,
-                            "Narration": "BROUGHT FORWARD" if ln.startswith("B/F") else "CARRIED FORWARD",
-                            "Chq/Ref No": None,
-                            "Withdrawal (Dr)": 0.0,
-                            "Deposit (Cr)": 0.0,
-                            "Balance": balance
-                        })
-                        continue
-
-                    # --- Case 2: New transaction row ---
-                    if is_date(parts[0]):
-                        if buffer:  # save the previous transaction
-                            transactions.append(buffer)
-
-                        date = parts[0]
-                        balance = parse_balance(parts[-1]) if len(parts) >= 2 else 0.0
-                        deposit = parse_amount(parts[-2]) if len(parts) >= 3 else 0.0
-                        withdrawal = parse_amount(parts[-3]) if len(parts) >= 4 else 0.0
-
-                        # Narration = everything between Date and the last 3 tokens
-                        narration = " ".join(parts[1:-2]) if len(parts) > 3 else ""
-
-                        buffer = {
-                            "Date": date,
-                            "Narration": narration,
-                            "Chq/Ref No": None,
-                            "Withdrawal (Dr)": withdrawal,
-                            "Deposit (Cr)": deposit,
-                            "Balance": balance
-                        }
-
-                    else:
-                        # --- Case 3: Continuation of narration ---
-                        if buffer:
-                            buffer["Narration"] += " " + ln.strip()
-
-                # flush last buffer of this page
-                if buffer:
-                    transactions.append(buffer)
-                    buffer = None
-
-        # collect keyword counts
-        for t in transactions:
-            for w in re.split(r"\W+", t["Narration"] or ""):
+    # collect keyword counts
+    with stage("keywords"):
+        keywords = []
+        for narration in df["Narration"]:
+            for w in WORD_SPLIT.split(narration or ""):
                 if len(w) > 3:
                     keywords.append(w.upper())
 
-        return pd.DataFrame(transactions), Counter(keywords)
+        return df, Counter(keywords)
+
+
+# ------------------ Transaction Parser (character columns) ------------------ #
+def parse_transactions_by_columns(file):
+    """
+    parse_transactions() read from the page chars under the statement's header row
+    (char_columns.py): amounts come from their own columns and wrapped narration
+    lines are joined onto their transaction. None when no header row is found.
+    """
+    transactions = ColumnBuilder(KOTAK_COLUMNS)
+
+    with open_session(file) as session, stage("scan"):
+        layout = ColumnLayout.find(session, KOTAK_COLUMNS)
+        if layout is None:
+            return None
+
+        for i in range(len(session.pages)):
+            buffer, previous = None, None
+            for row in layout.rows(session.page_chars(i)):
+                date, narration, ref, withdrawal, deposit, balance = row[2]
+
+                first = next((c for c in row[2] if c), "")
+                if first.startswith("B/F") or first.startswith("C/F"):
+                    if buffer:
+                        transactions.append(*buffer)
+                        buffer = None
+                    label = "BROUGHT FORWARD" if first.startswith("B/F") else "CARRIED FORWARD"
+                    transactions.append(None, label, None, None, None, balance or first.split()[-1])
+                elif is_date(date):
+                    if buffer:
+                        transactions.append(*buffer)
+                    buffer = [date, narration, ref or None, withdrawal or None, deposit or None, balance or None]
+                elif (buffer and not date and not (withdrawal or deposit or balance)
+                      and continues(previous, row)):
+                    buffer[1] = f"{buffer[1]} {narration}".strip()
+                    if ref:
+                        buffer[2] = f"{buffer[2] or ''}{ref}"
+                else:
+                    continue
+                previous = row
+
+            if buffer:
+                transactions.append(*buffer)
+
+    return _finish_kotak_frame(transactions)
+
+
+# ------------------ Metadata + Transactions from one open document ------------------ #
+def parse_kotak_statement(source, workers=None, text_backend=None, mode=None):
+    with open_session(source, workers=workers, text_backend=text_backend) as session:
+        session.prefetch("text")
+        with stage("metadata"):
+            metadata = extract_metadata_from_pdf(session)
+        transactions = parse_transactions_by_columns(session) if use_chars(mode) else None
+        if transactions is None:  # text mode, or no header row to take columns from
+            transactions = parse_transactions(session)
+        return metadata, transactions
+
+
+def kotak_pdf_parser():
+    import streamlit as st
+
+    DEFAULT_FILE = "kotak_stmt2.pdf"
+
     # ------------------ Streamlit UI ------------------ #
     def main():
         st.set_page_config(page_title="Kotak Bank Statement Parser", page_icon="🏦", layout="wide")
@@ -276,13 +320,13 @@ def kotak_pdf_parser():
 
         st.success("✅ Using uploaded file." if uploaded_file else "📄 Using default test file.")
 
-        metadata = extract_metadata_from_pdf(source)
+        # Metadata + transactions (reused across reruns for the same upload)
+        metadata, (df, direction_counts) = cached_parse("Kotak", PARSER_VERSION, source, parse_kotak_statement)
+
         if metadata:
             with st.expander("📌 Extracted Metadata", expanded=True):
                 st.dataframe(pd.DataFrame(metadata.items(), columns=["Field", "Value"]).fillna(""))
 
-        df, direction_counts = parse_transactions(source)
-
         if df.empty:
             st.warning("⚠ No transactions found.")
             return
@@ -1,10 +1,18 @@
+import importlib
+import time
 import streamlit as st
-from sbi_pdf_parser import run_pdf_parser_sbi
-from pdf_parser import run_pdf_parser
-from kotak_pdf_parser import kotak_pdf_parser
-from axis_bank_parser import axis_parser
-from rbl_bank_parser import rbl_parser
-from iob_bank_parser import run_pdf_parser_iob
+from timings import last_parse
+
+# Sidebar choice -> (module, page function). A bank's parser module, and with it
+# pdfplumber/pdfminer and pandas, is imported only once that bank is chosen.
+BANK_PAGES = {
+    "Kotak Bank Statement": ("kotak_pdf_parser", "kotak_pdf_parser"),
+    "SBI Bank Statement": ("sbi_pdf_parser", "run_pdf_parser_sbi"),
+    "CBI Bank Statement": ("pdf_parser", "run_pdf_parser"),
+    "Axis Bank Statement": ("axis_bank_parser", "axis_parser"),
+    "RBL Bank Statement": ("rbl_bank_parser", "rbl_parser"),
+    "IOB Bank Statement": ("iob_bank_parser", "run_pdf_parser_iob"),
+}
 
 # === FIRST: set page config ===
 st.set_page_config(page_title="Bank Statement Toolkit", layout="wide")
@@ -27,23 +35,42 @@ def authenticate():
     return st.session_state.authenticated
 
 
+def show_parse_timings(record, ui_seconds):
+    """Sidebar breakdown of the parse behind this run, plus the Streamlit rendering around it."""
+    import pandas as pd
+
+    st.sidebar.subheader("⏱ Parse Timings")
+    if record is None:
+        st.sidebar.caption("No statement parsed in this run.")
+        return
+
+    st.sidebar.caption(
+        f"{record.label} · {record.fields.get('source', '')} · {record.seconds:.3f}s parse, "
+        f"{ui_seconds:.3f}s total"
+    )
+    stages = dict(record.stages)
+    stages["render"] = max(ui_seconds - record.seconds, 0.0)
+    breakdown = pd.DataFrame(sorted(stages.items(), key=lambda kv: -kv[1]), columns=["Stage", "Seconds"])
+    breakdown["Share"] = (breakdown["Seconds"] / breakdown["Seconds"].sum()).map("{:.0%}".format)
+    st.sidebar.dataframe(breakdown.style.format({"Seconds": "{:.3f}"}), hide_index=True, use_container_width=True)
+    if record.counters:
+        st.sidebar.dataframe(
+            pd.DataFrame(record.counters.items(), columns=["Counter", "Value"]), hide_index=True, use_container_width=True
+        )
+
+
 if authenticate():
     st.sidebar.title("🔍 Select Bank")
 
-    mode = st.sidebar.selectbox(
-        "Choose a Bank:",
-        ["Kotak Bank Statement", "SBI Bank Statement", "CBI Bank Statement", "Axis Bank Statement", "RBL Bank Statement", "IOB Bank Statement"]
-    )
+    mode = st.sidebar.selectbox("Choose a Bank:", list(BANK_PAGES))
+
+    timings_panel = st.sidebar.checkbox("⏱ Show parse timings", value=False)
+    previous_parse = last_parse()
+    started = time.perf_counter()
+
+    module_name, page_name = BANK_PAGES[mode]
+    getattr(importlib.import_module(module_name), page_name)()
 
-    if mode == "SBI Bank Statement":
-        run_pdf_parser_sbi()
-    elif mode == "CBI Bank Statement":
-        run_pdf_parser()
-    elif mode == "Kotak Bank Statement":
-        kotak_pdf_parser()
-    elif mode == "Axis Bank Statement":
-        axis_parser()
-    elif mode == "RBL Bank Statement":
-        rbl_parser()
-    elif mode == "IOB Bank Statement":
-        run_pdf_parser_iob()
+    if timings_panel:
+        record = last_parse()
+        show_parse_timings(record if record is not previous_parse else None, time.perf_counter() - started)
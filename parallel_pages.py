@@ -0,0 +1,66 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import pdfplumber
+
+from table_geometry import TableReader
+
+# === CONFIG ===
+# Worker processes used for page layout; 1 keeps everything in-process
+DEFAULT_WORKERS = int(os.environ.get("PDF_PAGE_WORKERS", 1))
+# Below this many pages the pool start-up costs more than it saves
+MIN_PAGES_FOR_POOL = 8
+
+
+def _extract_page(page, kinds, tables):
+    out = {}
+    if "text" in kinds:
+        out["text"] = page.extract_text() or ""
+    if "table" in kinds:
+        out["table"] = tables.extract(page)
+    return out
+
+
+def _extract_range(pdf_ref, indices, kinds):
+    """Worker: open the PDF itself and lay out only its own pages."""
+    src = BytesIO(pdf_ref) if isinstance(pdf_ref, bytes) else pdf_ref
+    results = []
+    tables = TableReader()  # each worker learns the table grid from its own first page
+    with pdfplumber.open(src) as pdf:
+        for i in indices:
+            page = pdf.pages[i]
+            results.append(_extract_page(page, kinds, tables))
+            page.close()  # drop the cached layout before the next page
+    return results
+
+
+def _split(indices, parts):
+    """Split indices into `parts` contiguous, near-equal chunks (order preserved)."""
+    size, extra = divmod(len(indices), parts)
+    chunks, start = [], 0
+    for p in range(parts):
+        stop = start + size + (1 if p < extra else 0)
+        if stop > start:
+            chunks.append(indices[start:stop])
+        start = stop
+    return chunks
+
+
+def extract_pages(pdf_ref, indices, kinds, workers):
+    """
+    Run extract_text()/extract_table() for `indices` across a process pool.
+    `pdf_ref` is a path or the raw PDF bytes. Returns one dict per index, in the
+    order given, so callers can feed the pages to their (stateful) line parsers
+    exactly as the serial loop would.
+    """
+    indices = list(indices)
+    workers = max(1, min(workers, len(indices)))
+    chunks = _split(indices, workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_extract_range, pdf_ref, chunk, tuple(kinds)) for chunk in chunks]
+        results = []
+        for future in futures:  # submission order == page order
+            results.extend(future.result())
+    return results
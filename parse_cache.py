@@ -0,0 +1,166 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from statement_store import default_store
+from timings import record_parse, stage
+
+# === CONFIG ===
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # in-process budget for cached frames
+
+
+def read_source_bytes(source):
+    """Raw bytes of a path, Streamlit UploadedFile or any binary file object."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            return fh.read()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    source.seek(0)
+    data = source.read()
+    source.seek(0)
+    return data
+
+
+def content_hash(source):
+    return hashlib.sha256(read_source_bytes(source)).hexdigest()
+
+
+def _result_nbytes(value):
+    """Rough in-memory size of a cached parse result (DataFrames dominate)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (tuple, list)):
+        return sum(_result_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_result_nbytes(v) for v in value.values()) + 64 * len(value)
+    return 64
+
+
+def _result_rows(value):
+    """Rows of the first DataFrame in a parse result (0 if it has none)."""
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return next((n for n in map(_result_rows, value) if n), 0)
+    return 0
+
+
+def _copy_result(value):
+    # Callers add/overwrite columns on the frames they get back, so never hand out the cached objects
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy_result(v) for v in value)
+    if isinstance(value, list):
+        return [_copy_result(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    return value
+
+
+class ParseCache:
+    """
+    Size-bounded LRU of parse results keyed on (sha256 of the upload, bank, parser version).
+    Lives at module level, so it survives Streamlit reruns of the same session.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return _copy_result(entry[0])
+
+    def put(self, key, value):
+        size = _result_nbytes(value)
+        if size > self.max_bytes:
+            return  # would evict everything else and still not fit
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (_copy_result(value), size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self.current_bytes -= old_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_default_cache = ParseCache()
+
+
+def cached_parse(bank, parser_version, source, parse_fn, cache=None, store=None):
+    """
+    Return parse_fn(source), reusing the previous result for identical bytes.
+    Looks in the in-process LRU first, then in the on-disk statement store, and only
+    then parses. parse_fn must return (metadata, parse_result); bump the parser
+    version when its output changes.
+
+    `cache` and `store` default to the process-wide ones; False turns that layer
+    off, and with both off the source is parsed without being hashed (one-shot
+    batch runs, which would only fill caches they never read).
+
+    Every call is recorded with timings.record_parse: where the result came from
+    ("memory", "store" or "parse") plus the stages and counters of the parse.
+    """
+    cache = _default_cache if cache is None else cache
+    store = default_store() if store is None else store
+
+    with record_parse(bank, version=parser_version) as timings:
+        if cache is False and not store:
+            timings.fields["source"] = "parse"
+            result = parse_fn(source)
+            timings.count("rows", _result_rows(result))
+            return result
+
+        with stage("hash"):
+            data = read_source_bytes(source)
+            digest = hashlib.sha256(data).hexdigest()
+        timings.count("bytes", len(data))
+        key = (digest, bank, parser_version)
+
+        with stage("cache"):
+            hit = cache.get(key) if cache is not False else None
+        if hit is not None:
+            timings.fields["source"] = "memory"
+            timings.count("rows", _result_rows(hit))
+            return hit
+
+        with stage("store"):
+            result = store.load(digest, bank, parser_version) if store else None
+        timings.fields["source"] = "store"
+        if result is None:
+            timings.fields["source"] = "parse"
+            result = parse_fn(source)
+            if store:
+                with stage("store"):
+                    try:
+                        store.save(digest, bank, parser_version, result)
+                    except Exception as e:
+                        print("Error saving parsed statement to store:", e)
+        timings.count("rows", _result_rows(result))
+
+        if cache is not False:
+            with stage("cache"):
+                cache.put(key, result)
+        return result
@@ -0,0 +1,120 @@
+"""
+Precompiled regular expressions shared by the statement parsers.
+
+`re.search(pattern, text)` goes through re's pattern cache on every call; the
+per-line loops below run thousands of times per statement, so they use these
+compiled objects directly instead.
+"""
+import re
+
+# === Common ===
+WORD_SPLIT = re.compile(r"\W+")                       # keyword counting
+AMOUNT_2DP = re.compile(r"[\d,]+\.\d{2}")              # 1,234.56
+NON_NUMERIC = re.compile(r"[^\d\.-]")                  # everything but digits, '.' and '-'
+
+# === SBI ===
+SBI_METADATA = {
+    "Branch Code": re.compile(r"Branch Code\s*:\s*(\d+)"),
+    "Branch Email": re.compile(r"Branch Email\s*:\s*([\w\.-]+@[\w\.-]+)"),
+    "Branch Phone": re.compile(r"Branch Phone\s*:\s*(\d+)"),
+    "CIF": re.compile(r"CIF\s*No\s*:\s*(\d+)"),
+    "Account Number": re.compile(r"Account\s*No\s*:\s*(\d+)"),
+    "Product": re.compile(r"Product\s*:\s*(.*)"),
+    "IFSC": re.compile(r"IFSC\s*Code\s*:\s*([A-Z0-9]+)"),
+    "MICR": re.compile(r"MICR\s*Code\s*:\s*(\d+)"),
+    "Currency": re.compile(r"Currency\s*:\s*([A-Z]+)"),
+    "Account Status": re.compile(r"Account\s*Status\s*:\s*(\w+)"),
+    "Nominee": re.compile(r"Nominee\s*Name\s*:\s*(.*)"),
+    "CKYC": re.compile(r"CKYC\s*No\s*:\s*(.*)"),
+    "Email": re.compile(r"Email\s*:\s*(.*)"),
+}
+SBI_PERIOD = re.compile(r"Statement\s*From\s*:\s*(\d{2}-\d{2}-\d{4})\s*To\s*(\d{2}-\d{2}-\d{4})")
+
+# === Central Bank of India ===
+CBI_METADATA = {
+    "Branch Email": re.compile(r"Branch E-mail\s*:\s*(\S+)"),
+    "Branch Code": re.compile(r"Branch Code\s*:\s*(\d+)"),
+    "Account Number": re.compile(r"Account No.\s*:\s*(\d+)"),
+    "Currency": re.compile(r"Currency\s*:\s*(\w+)"),
+    "Product": re.compile(r"Product\s*:\s*(.*)"),
+    "Nomination": re.compile(r"Nomination\s*:\s*(\w+)"),
+    "Statement Date": re.compile(r"Date\s*:\s*(\d{2}/\d{2}/\d{4})"),
+    "Statement Time": re.compile(r"Time\s*:\s*(\d{2}:\d{2}:\d{2})"),
+    "Email": re.compile(r"E-mail\s*:\s*(\S+)"),
+}
+CBI_PERIOD = re.compile(r"Statement From\s+(\d{2}/\d{2}/\d{4})\s+to\s+(\d{2}/\d{2}/\d{4})")
+CBI_TXN_START = re.compile(r"^\d{2}/\d{2}/\d{2}\s+\d{2}/\d{2}/\d{2}")
+CBI_TXN = re.compile(
+    r"^(\d{2}/\d{2}/\d{2})\s+(\d{2}/\d{2}/\d{2})\s+(.*?)\s+\.\s+(.*?)\s+([\d,]+\.\d{2}|-)\s+([\d,]+\.\d{2}Cr)$"
+)
+CBI_BROUGHT_FORWARD = re.compile(r"([\d,]+\.\d{2})\s*(Cr|Dr)", re.IGNORECASE)
+CBI_SHORT_KEY = re.compile(r"^([A-Z.\s]+)")
+
+# === Kotak ===
+KOTAK_STATE_COUNTRY = re.compile(r"^\s*([A-Z][A-Z\s\-]+,?\s*INDIA)\b")
+KOTAK_BRANCH_ADDRESS_END = re.compile(r"(Phone|MICR|IFSC|Email)", re.I)
+KOTAK_DECIMAL = re.compile(r"^-?\d+\.\d{1,2}$")
+KOTAK_DATE = re.compile(r"^\d{2}-\d{2}-\d{4}$")
+
+# === Indian Overseas Bank ===
+IOB_PAGE_SUFFIX = re.compile(r"\s*Page\s*\d+\s*$", re.I)
+IOB_ACCOUNT = re.compile(r"Account Number\s*:\s*([\d]+)/(INR)\s+(.*)", re.I)
+IOB_REPORT_TO = re.compile(r"Report\s*To\s*:\s*(\w+)", re.I)
+IOB_SERVICE_OUTLET = re.compile(r"Service\s*OutLet\s*:\s*([\w\s]+)", re.I)
+IOB_PERIOD = re.compile(
+    r"Report\s*for\s*the\s*Period\s*:\s*(\d{2}-\d{2}-\d{4})\s*TO\s*(\d{2}-\d{2}-\d{4})", re.I
+)
+IOB_DATE_TRAN = re.compile(r"(\d{2}-\d{2}-\d{4})(.*)")
+IOB_SEPARATOR = re.compile(r"^-{5,}")
+
+# === Axis ===
+AXIS_METADATA = {
+    "Customer No": re.compile(r"Customer\s*No\s*:\s*(\d+)"),
+    "Scheme": re.compile(r"Scheme\s*:\s*([\w\-]+)"),
+    "Currency": re.compile(r"Currency\s*:\s*([A-Z]+)"),
+    "Account No": re.compile(r"Statement of Account No\s*:\s*(\d+)"),
+}
+AXIS_HOLDER = re.compile(r"^([A-Z\s]+)\n", re.MULTILINE)
+AXIS_ADDRESS = re.compile(r"(?i)([0-9]+.*BANGALORE|BENGALURU|KARNATAKA|560\d+)")
+
+# === RBL ===
+RBL_DATE_RE = r"\d{2}-[A-Za-z]{3}-\d{4}"              # 01-Apr-2024
+RBL_DATE = re.compile(RBL_DATE_RE)
+RBL_TXN_LINE = re.compile(rf"^({RBL_DATE_RE})\s+(.*)$")
+RBL_METADATA = {
+    field: re.compile(pattern, re.IGNORECASE)
+    for field, pattern in {
+        "Accountholder Name": r"Accountholder Name\s*:\s*(.+)",
+        "Customer Address": r"Customer Address\s*:\s*(.+)",
+        "Phone": r"Phone\s*:\s*([+\d\(\)\s-]+)",
+        "Email Id": r"Email Id\s*:\s*([\w\.-]+@[\w\.-]+)",
+        "CIF ID": r"CIF ID\s*:\s*(\d+)",
+        "A/c Currency": r"A/c Currency\s*:\s*([A-Z]+)",
+        "A/c Open Date": r"A/c Open Date\s*:\s*(.+)",
+        "A/c Type": r"A/c Type\s*:\s*(.+)",
+        "A/c Status": r"A/c Status\s*:\s*(.+)",
+        "Home Branch": r"Home Branch\s*:\s*(.+)",
+        "Home Branch Address": r"Home Branch Address\s*:\s*(.+)",
+        "IFSC/RTGS/NEFT": r"IFSC/RTGS/NEFT\s*:\s*([A-Z0-9]+)",
+        "MICR Code": r"MICR Code\s*:\s*(\d+)",
+        "ECS A/c No": r"ECS A/c No\s*:\s*(\d+)",
+        "Statement Period": r"Period\s*:\s*(.+)",
+    }.items()
+}
+
+
+def search_fields(fields, text, default=""):
+    """
+    {field: first capture group, stripped} for a {field: compiled pattern} table,
+    `default` where a pattern does not match.
+
+    Each field keeps its own search rather than one alternation with named groups:
+    several labels overlap ("Email" inside "Branch Email", "Date" inside
+    "Statement Date") and only separate searches return the same first match, and
+    on statement headers they also beat a combined scan (see benchmarks/bench_regex.py).
+    """
+    out = {}
+    for field, pattern in fields.items():
+        m = pattern.search(text)
+        out[field] = m.group(1).strip() if m else default
+    return out
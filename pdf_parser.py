@@ -1,177 +1,261 @@
-import streamlit as st
-import pdfplumber
 import pandas as pd
-import re
 import os
 from io import BytesIO
 from collections import Counter
-
-def run_pdf_parser():
-    # === CONFIG ===
-    DEFAULT_FILE = "Statement (2).pdf"
-
-    # === Extract Metadata ===
-    def extract_metadata_from_pdf(file):
-        metadata = {}
-        lines = []
-
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    lines = text.split('\n')
-                    for line in lines:
-                        line = line.strip()
-                        if re.match(r"^\d{2}/\d{2}/\d{2}\s+\d{2}/\d{2}/\d{2}", line):
-                            break
-                        lines.append(line)
-                    break  # only the first page has metadata
-
-        full_text = "\n".join(lines)
-
-        metadata["Bank"] = "CENTRAL BANK OF INDIA"
-        metadata["Branch"] = next((l for l in lines if "ROAD" in l and "EXTN" in l), "") or ""
-
-        metadata["Branch Email"] = re.search(r"Branch E-mail\s*:\s*(\S+)", full_text)
-        metadata["Branch Email"] = metadata["Branch Email"].group(1) if metadata["Branch Email"] else ""
-
-        metadata["Branch Code"] = re.search(r"Branch Code\s*:\s*(\d+)", full_text)
-        metadata["Branch Code"] = metadata["Branch Code"].group(1) if metadata["Branch Code"] else ""
-
-        metadata["Account Number"] = re.search(r"Account No.\s*:\s*(\d+)", full_text)
-        metadata["Account Number"] = metadata["Account Number"].group(1) if metadata["Account Number"] else ""
-
-        metadata["Currency"] = re.search(r"Currency\s*:\s*(\w+)", full_text)
-        metadata["Currency"] = metadata["Currency"].group(1) if metadata["Currency"] else ""
-
-        metadata["Product"] = re.search(r"Product\s*:\s*(.*)", full_text)
-        metadata["Product"] = metadata["Product"].group(1).strip() if metadata["Product"] else ""
-
-        metadata["Nomination"] = re.search(r"Nomination\s*:\s*(\w+)", full_text)
-        metadata["Nomination"] = metadata["Nomination"].group(1) if metadata["Nomination"] else ""
-
-        metadata["Statement Date"] = re.search(r"Date\s*:\s*(\d{2}/\d{2}/\d{4})", full_text)
-        metadata["Statement Date"] = metadata["Statement Date"].group(1) if metadata["Statement Date"] else ""
-
-        metadata["Statement Time"] = re.search(r"Time\s*:\s*(\d{2}:\d{2}:\d{2})", full_text)
-        metadata["Statement Time"] = metadata["Statement Time"].group(1) if metadata["Statement Time"] else ""
-
-        metadata["Email"] = re.search(r"E-mail\s*:\s*(\S+)", full_text)
-        metadata["Email"] = metadata["Email"].group(1) if metadata["Email"] else ""
-
-        match = re.search(r"Statement From\s+(\d{2}/\d{2}/\d{4})\s+to\s+(\d{2}/\d{2}/\d{4})", full_text)
-        metadata["Statement Period"] = f"{match.group(1)} to {match.group(2)}" if match else ""
-
-        metadata["Customer Name"] = next(
-            (l for l in lines if l.isupper() and ":" not in l and "CENTRAL BANK" not in l), ""
-        ) or ""
-
-        address_lines = []
-        for line in lines:
-            if "Account No." in line:
-                break
-            if any(char.isdigit() for char in line) or "ROAD" in line or "BANGALORE" in line:
-                address_lines.append(line)
-        metadata["Address"] = ", ".join(address_lines) if address_lines else ""
-
-        # Ensure no None values
-        for k, v in metadata.items():
-            if v is None:
-                metadata[k] = ""
-
-        return metadata
-
-    # === Helper ===
-    def parse_amount(value):
-        if not value or value == '-':
-            return 0.00
-        return float(value.replace(',', ''))
-
-    def parse_balance(value):
-        if not value:
-            return 0.00
-        value = value.replace(',', '')
-        return float(value.replace("Cr", "").replace("Dr", "").strip())
-
-    # === Parser ===
-    def parse_central_bank_pdf(file):
-        transactions = []
-        opening_balance = None
-        last_txn = None
-        last_balance = None
-        all_keys = []
-
-        txn_pattern = re.compile(
-            r"^(\d{2}/\d{2}/\d{2})\s+(\d{2}/\d{2}/\d{2})\s+(.*?)\s+\.\s+(.*?)\s+([\d,]+\.\d{2}|-)\s+([\d,]+\.\d{2}Cr)$"
-        )
-
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                lines = page.extract_text().split('\n')
-
+from pdf_session import open_session
+from parse_cache import cached_parse
+from amounts import parse_amounts
+from char_columns import ColumnLayout, continues, use_chars
+from timings import stage
+from patterns import (
+    CBI_BROUGHT_FORWARD, CBI_METADATA, CBI_PERIOD, CBI_SHORT_KEY, CBI_TXN, CBI_TXN_START, search_fields,
+)
+
+# Bump when the parsed output changes; cached parses of older versions are then ignored
+PARSER_VERSION = "3"
+
+# === Extract Metadata ===
+def extract_metadata_from_pdf(file):
+    metadata = {}
+    lines = []
+
+    with open_session(file) as session:
+        for text in session.page_texts():
+            if text:
+                lines = text.split('\n')
                 for line in lines:
                     line = line.strip()
+                    if CBI_TXN_START.match(line):
+                        break
+                    lines.append(line)
+                break  # only the first page has metadata
+
+    full_text = "\n".join(lines)
+
+    metadata["Bank"] = "CENTRAL BANK OF INDIA"
+    metadata["Branch"] = next((l for l in lines if "ROAD" in l and "EXTN" in l), "") or ""
+
+    metadata.update(search_fields(CBI_METADATA, full_text))
+
+    match = CBI_PERIOD.search(full_text)
+    metadata["Statement Period"] = f"{match.group(1)} to {match.group(2)}" if match else ""
+
+    metadata["Customer Name"] = next(
+        (l for l in lines if l.isupper() and ":" not in l and "CENTRAL BANK" not in l), ""
+    ) or ""
+
+    address_lines = []
+    for line in lines:
+        if "Account No." in line:
+            break
+        if any(char.isdigit() for char in line) or "ROAD" in line or "BANGALORE" in line:
+            address_lines.append(line)
+    metadata["Address"] = ", ".join(address_lines) if address_lines else ""
+
+    # Ensure no None values
+    for k, v in metadata.items():
+        if v is None:
+            metadata[k] = ""
+
+    return metadata
+
+# === Helper ===
+def parse_balance(value):
+    if not value:
+        return 0.00
+    value = value.replace(',', '')
+    return float(value.replace("Cr", "").replace("Dr", "").strip())
+
+# === Parser ===
+def _new_scan_state():
+    # Carried across pages: a ". ." line can continue the previous page's last transaction
+    return {"opening_balance": None, "last_txn": None, "all_keys": []}
+
+
+def _scan_cbi_lines(lines, state, transactions):
+    """Parse one page's lines, appending transaction dicts to `transactions`."""
+    for line in lines:
+        line = line.strip()
+
+        if "BROUGHT FORWARD" in line.upper() and state["opening_balance"] is None:
+            match = CBI_BROUGHT_FORWARD.search(line)
+            if match:
+                amount = match.group(1)
+                crdr = match.group(2)
+                state["opening_balance"] = parse_balance(f"{amount}{crdr}")
+
+        txn_match = CBI_TXN.match(line)
+        if txn_match:
+            description, chq_no = txn_match.group(3).strip(), txn_match.group(4).strip()
+
+            short_key_match = CBI_SHORT_KEY.match(description)
+            short_key = short_key_match.group(1).strip().upper() if short_key_match else ""
+            state["all_keys"].append(short_key)
+
+            # Raw strings only; _finish_cbi_frame converts and classifies whole columns
+            state["last_txn"] = {
+                "Value Date": txn_match.group(1),
+                "Post Date": txn_match.group(2),
+                "Details": description,
+                "Chq.No.": "" if chq_no == '-' else chq_no,
+                "Amount": txn_match.group(5),
+                "Balance": txn_match.group(6),
+                "More Info": ""
+            }
+            transactions.append(state["last_txn"])
+
+        elif line.startswith(". .") and state["last_txn"]:
+            extra = line.replace(". .", "").strip().strip('.')
+            state["last_txn"]["More Info"] += " " + extra
+
+
+RAW_COLUMNS = ["Value Date", "Post Date", "Details", "Chq.No.", "Amount", "Balance", "More Info"]
+COLUMNS = ["Value Date", "Post Date", "Details", "Chq.No.", "Debit", "Credit", "Balance", "More Info"]
+_DEBIT_SUFFIX = r"(?i)dr\)?\s*$"
+
+
+def _signed_balance(raw):
+    """
+    '1,234.56Cr' -> 1234.56, '1,234.56Dr' -> -1234.56 for a whole column; the
+    suffix is optional (either case), so a bare '1,234.56' stays 1234.56.
+    """
+    value = parse_amounts(raw)
+    debit = raw.astype("string").str.contains(_DEBIT_SUFFIX, na=False)
+    return value.where(~debit, -value)
+
+
+def _finish_cbi_frame(transactions, prev_balance=None):
+    """
+    Frame of scanned rows with numeric Debit/Credit/Balance. A row is a credit when
+    the balance went up and a debit when it went down; the first row is compared
+    with `prev_balance` (the previous chunk's last balance) and left unclassified
+    without one.
+    """
+    raw = pd.DataFrame(transactions, columns=RAW_COLUMNS)
+
+    amount = pd.to_numeric(raw["Amount"].str.replace(",", "", regex=False), errors="coerce").fillna(0.0)
+    balance = _signed_balance(raw["Balance"])
+    change = (balance - balance.shift(1, fill_value=prev_balance)).to_numpy()
+
+    raw["Debit"] = amount.where(change < 0, 0.0)
+    raw["Credit"] = amount.where(change > 0, 0.0)
+    raw["Balance"] = balance
+    return raw[COLUMNS]
+
+
+def parse_central_bank_pdf(file):
+    transactions = []
+    state = _new_scan_state()
+
+    with open_session(file) as session, stage("scan"):
+        session.prefetch("text")
+        for page_text in session.page_texts():
+            _scan_cbi_lines(page_text.split('\n'), state, transactions)
+
+    with stage("frame"):
+        df = _finish_cbi_frame(transactions)
+    all_keys = state["all_keys"]
+    direction_counts = Counter(all_keys)
+
+    return df, Counter(all_keys), state["opening_balance"], direction_counts
+
+
+# Header labels of the transaction table, left to right, one per COLUMNS entry up to Balance
+HEADER_LABELS = ["Value Date", "Post Date", "Details", "Chq.No.", "Debit", "Credit", "Balance"]
+
+
+def parse_central_bank_by_columns(file):
+    """
+    parse_central_bank_pdf() read from the page chars under the statement's header
+    row (char_columns.py). Debit and Credit come from their own columns instead of
+    the balance movement; lines wrapped under a transaction go to its More Info as
+    ". ." lines do. None when no header row is found.
+    """
+    transactions = []
+    state = _new_scan_state()
+
+    with open_session(file) as session, stage("scan"):
+        layout = ColumnLayout.find(session, HEADER_LABELS)
+        if layout is None:
+            return None
+
+        for i in range(len(session.pages)):
+            previous = None
+            for row in layout.rows(session.page_chars(i)):
+                # "." and "-" stand for empty cells
+                value_date, post_date, details, chq_no, debit, credit, balance = (
+                    "" if c in (".", "-") else c for c in row[2]
+                )
+                line = " ".join(c for c in row[2] if c)
+
+                if "BROUGHT FORWARD" in line.upper() and state["opening_balance"] is None:
+                    match = CBI_BROUGHT_FORWARD.search(line)
+                    if match:
+                        state["opening_balance"] = parse_balance(f"{match.group(1)}{match.group(2)}")
+
+                if CBI_TXN_START.match(f"{value_date} {post_date}"):
+                    short_key_match = CBI_SHORT_KEY.match(details)
+                    state["all_keys"].append(short_key_match.group(1).strip().upper() if short_key_match else "")
+                    state["last_txn"] = [value_date, post_date, details, chq_no, debit, credit, balance, ""]
+                    transactions.append(state["last_txn"])
+                elif (state["last_txn"] and not (value_date or post_date) and details
+                      and not (debit or credit or balance) and continues(previous, row)):
+                    state["last_txn"][7] += " " + details
+                else:
+                    continue
+                previous = row
+
+    with stage("frame"):
+        df = pd.DataFrame(transactions, columns=COLUMNS)
+        for col in ["Debit", "Credit"]:
+            df[col] = parse_amounts(df[col]).fillna(0.0)
+        df["Balance"] = _signed_balance(df["Balance"])
+    all_keys = state["all_keys"]
+    return df, Counter(all_keys), state["opening_balance"], Counter(all_keys)
+
+
+def iter_central_bank_pdf(file):
+    """
+    Streaming variant of parse_central_bank_pdf: yields one DataFrame chunk per page
+    and releases the page afterwards. The last transaction of each page is held back
+    until the next page is scanned, because ". ." continuation lines may still add to
+    its More Info; concatenating the chunks gives the same rows as the full parse.
+    """
+    state = _new_scan_state()
+    pending = []
+    prev_balance = None
+
+    with open_session(file) as session:
+        for i in range(len(session.pages)):
+            _scan_cbi_lines(session.page_text(i).split('\n'), state, pending)
+            session.release(i)
+            if len(pending) > 1:
+                chunk = _finish_cbi_frame(pending[:-1], prev_balance)
+                prev_balance = chunk["Balance"].iloc[-1]
+                yield chunk
+                pending = pending[-1:]
+
+    if pending:
+        yield _finish_cbi_frame(pending, prev_balance)
+
+
+# === Metadata + Transactions from one open document ===
+def parse_central_bank_statement(source, workers=None, text_backend=None, mode=None):
+    with open_session(source, workers=workers, text_backend=text_backend) as session:
+        session.prefetch("text")
+        with stage("metadata"):
+            metadata = extract_metadata_from_pdf(session)
+        transactions = parse_central_bank_by_columns(session) if use_chars(mode) else None
+        if transactions is None:  # text mode, or no header row to take columns from
+            transactions = parse_central_bank_pdf(session)
+        return metadata, transactions
 
-                    if "BROUGHT FORWARD" in line.upper() and opening_balance is None:
-                        match = re.search(r"([\d,]+\.\d{2})\s*(Cr|Dr)", line, re.IGNORECASE)
-                        if match:
-                            amount = match.group(1)
-                            crdr = match.group(2)
-                            opening_balance = parse_balance(f"{amount}{crdr}")
-
-                    txn_match = txn_pattern.match(line)
-                    if txn_match:
-                        val_date, post_date = txn_match.group(1), txn_match.group(2)
-                        description, chq_no = txn_match.group(3).strip(), txn_match.group(4).strip()
-                        amount = parse_amount(txn_match.group(5))
-                        balance = parse_balance(txn_match.group(6))
-
-                        short_key_match = re.match(r'^([A-Z.\s]+)', description)
-                        short_key = short_key_match.group(1).strip().upper() if short_key_match else ""
-                        all_keys.append(short_key)
-
-                        credit = debit = ""
-                        if last_balance is not None:
-                            if balance > last_balance:
-                                credit = f"{amount:.2f}"
-                            elif balance < last_balance:
-                                debit = f"{amount:.2f}"
-                        last_balance = balance
-
-                        last_txn = {
-                            "Value Date": val_date or "",
-                            "Post Date": post_date or "",
-                            "Details": description or "",
-                            "Chq.No.": "" if chq_no == '-' else chq_no or "",
-                            "Debit": debit or "",
-                            "Credit": credit or "",
-                            "Balance": f"{balance:.2f}" if balance is not None else "",
-                            "More Info": ""
-                        }
-                        transactions.append(last_txn)
-
-                    elif line.startswith(". .") and last_txn:
-                        extra = line.replace(". .", "").strip().strip('.')
-                        last_txn["More Info"] += " " + extra
-
-            df = pd.DataFrame(transactions)
-
-        # Replace None/NaN with empty string for display
-        df = df.fillna("")
-
-        # ✅ Convert Balance column to float
-        df["Balance"] = pd.to_numeric(df["Balance"], errors="coerce")
-
-
-        # Replace None/NaN with empty string for display
-        df = df.fillna("")
-        direction_counts = Counter(all_keys)
-
-        return df, Counter(all_keys), opening_balance, direction_counts
-
-    
 
+def run_pdf_parser():
+    import streamlit as st
 
+    # === CONFIG ===
+    DEFAULT_FILE = "Statement (2).pdf"
 
     def main():
         st.set_page_config(page_title="CBI Bank Statement Parser", page_icon="🏦", layout="wide")
@@ -188,21 +272,19 @@ def run_pdf_parser():
             st.error("❌ No file uploaded and default file not found.")
             st.stop()
 
-        # Metadata
-        metadata = extract_metadata_from_pdf(source)
+        # Metadata + transactions (reused across reruns for the same upload)
+        # ✅ Unpack all 4 values properly
+        metadata, (df, all_keys_count, opening_balance, direction_counts) = cached_parse(
+            "CBI", PARSER_VERSION, source, parse_central_bank_statement
+        )
+
         if metadata:
             with st.expander("📌 Extracted Metadata", expanded=True):
                 st.dataframe(pd.DataFrame(metadata.items(), columns=["Field", "Value"]))
 
-        # ✅ Unpack all 4 values properly
-        df, all_keys_count, opening_balance, direction_counts = parse_central_bank_pdf(source)
-
         if df.empty:
             st.warning("⚠ No transactions found.")
         else:
-            # Convert Debit & Credit safely
-            df["Debit"] = pd.to_numeric(df["Debit"], errors="coerce").fillna(0.0)
-            df["Credit"] = pd.to_numeric(df["Credit"], errors="coerce").fillna(0.0)
             df["Value Date"] = pd.to_datetime(df["Value Date"], errors="coerce")
 
             # --- 📊 Filters Section ---
@@ -0,0 +1,149 @@
+import os
+import pdfplumber
+from contextlib import contextmanager
+from io import BytesIO
+
+from parallel_pages import DEFAULT_WORKERS, MIN_PAGES_FOR_POOL, extract_pages
+from table_geometry import TableReader
+from text_backends import DEFAULT_TEXT_BACKEND, TEXT_BACKENDS
+from timings import count, stage
+
+
+class PdfSession:
+    """
+    One open PDF shared by the metadata extractor and the transaction parser.
+
+    pdfplumber caches the pdfminer layout on each Page object, so as long as
+    both steps walk the same `pages` list every page is laid out only once.
+    Text and table extraction are memoized per page on top of that, and tables
+    are read through a TableReader so later pages reuse the first page's grid.
+
+    With workers > 1, prefetch() lays out the pages in a process pool instead;
+    the parsers still consume the results page by page, in order.
+
+    Page text and chars come from `text_backend` (see text_backends.py); "pdfium"
+    skips the layout entirely for parsers that only read text lines or chars.
+    """
+
+    def __init__(self, source, workers=None, text_backend=None):
+        self.workers = DEFAULT_WORKERS if workers is None else workers
+        self.text_backend = DEFAULT_TEXT_BACKEND if text_backend is None else text_backend
+        if self.text_backend not in TEXT_BACKENDS:
+            raise ValueError(f"unknown text backend {self.text_backend!r}")
+
+        self._pdf_ref = None
+        keep_ref = self.workers > 1 or self.text_backend != DEFAULT_TEXT_BACKEND
+        with stage("open"):
+            if hasattr(source, "seek"):
+                source.seek(0)
+                if keep_ref:
+                    # Workers and other text backends re-open the document themselves, so keep the raw bytes around
+                    self._pdf_ref = source.read()
+                    source = BytesIO(self._pdf_ref)
+            elif keep_ref:
+                self._pdf_ref = os.fspath(source)
+            self.pdf = pdfplumber.open(source)
+            self._text_source = TEXT_BACKENDS[self.text_backend](self.pdf, self._pdf_ref)
+        count("pages", len(self.pdf.pages))
+        self._text = {}
+        self._chars = {}
+        self._table = {}
+        self._tables = TableReader()
+
+    @property
+    def pages(self):
+        return self.pdf.pages
+
+    def prefetch(self, *kinds):
+        """
+        Extract `kinds` ("text", "table") for every page not done yet, in parallel
+        when the session has workers. A no-op in serial mode.
+        """
+        if self.text_backend != DEFAULT_TEXT_BACKEND:
+            kinds = tuple(k for k in kinds if k != "text")  # cheap enough page by page
+        if not kinds or self.workers <= 1 or len(self.pdf.pages) < MIN_PAGES_FOR_POOL:
+            return
+        caches = {"text": self._text, "table": self._table}
+        missing = [i for i in range(len(self.pdf.pages)) if any(i not in caches[k] for k in kinds)]
+        if len(missing) < MIN_PAGES_FOR_POOL:
+            return
+        with stage("prefetch"):
+            for i, extracted in zip(missing, extract_pages(self._pdf_ref, missing, kinds, self.workers)):
+                for kind, value in extracted.items():
+                    caches[kind][i] = value
+        count("prefetched_pages", len(missing))
+
+    def page_text(self, index):
+        """Text of page `index` from the session's text backend, computed once per session."""
+        if index not in self._text:
+            with stage("text"):
+                self._text[index] = self._text_source.page_text(index)
+        return self._text[index]
+
+    def page_texts(self):
+        for i in range(len(self.pdf.pages)):
+            yield self.page_text(i)
+
+    def page_chars(self, index):
+        """Positioned chars of page `index` from the session's text backend, read once per session."""
+        if index not in self._chars:
+            with stage("chars"):
+                self._chars[index] = self._text_source.page_chars(index)
+        return self._chars[index]
+
+    def page_table(self, index):
+        """extract_table() of page `index`, computed once per session."""
+        if index not in self._table:
+            page = self.pdf.pages[index]
+            with stage("layout"):
+                page.chars  # pdfminer layout, cached on the page
+            with stage("tables"):
+                self._table[index] = self._tables.extract(page)
+        return self._table[index]
+
+    def page_tables(self):
+        for i in range(len(self.pdf.pages)):
+            yield self.page_table(i)
+
+    def release(self, index):
+        """Forget everything cached for page `index` (streaming parsers call this once done)."""
+        self._text.pop(index, None)
+        self._chars.pop(index, None)
+        self._table.pop(index, None)
+        self.pdf.pages[index].close()
+
+    def first_page_text(self):
+        return self.page_text(0) if self.pdf.pages else ""
+
+    def full_text(self):
+        return "\n".join(self.page_texts())
+
+    def close(self):
+        self._text.clear()
+        self._chars.clear()
+        self._table.clear()
+        self._text_source.close()
+        self.pdf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def open_session(source, workers=None, text_backend=None):
+    """
+    Yield a PdfSession for `source`.
+    An existing session is passed through untouched (the caller owns it);
+    a path or file object gets a fresh session that is closed on exit.
+    """
+    if isinstance(source, PdfSession):
+        yield source
+        return
+    session = PdfSession(source, workers=workers, text_backend=text_backend)
+    try:
+        yield session
+    finally:
+        session.close()
@@ -1,49 +1,24 @@
-import streamlit as st
-import pdfplumber
 import pandas as pd
-import re
+import numpy as np
 from collections import Counter
+from patterns import AMOUNT_2DP, RBL_DATE, RBL_METADATA, RBL_TXN_LINE, search_fields
 
 
 def rbi_bank(text: str) -> dict:
-    details = {}
-    patterns = {
-        "Accountholder Name": r"Accountholder Name\s*:\s*(.+)",
-        "Customer Address": r"Customer Address\s*:\s*(.+)",
-        "Phone": r"Phone\s*:\s*([+\d\(\)\s-]+)",
-        "Email Id": r"Email Id\s*:\s*([\w\.-]+@[\w\.-]+)",
-        "CIF ID": r"CIF ID\s*:\s*(\d+)",
-        "A/c Currency": r"A/c Currency\s*:\s*([A-Z]+)",
-        "A/c Open Date": r"A/c Open Date\s*:\s*(.+)",
-        "A/c Type": r"A/c Type\s*:\s*(.+)",
-        "A/c Status": r"A/c Status\s*:\s*(.+)",
-        "Home Branch": r"Home Branch\s*:\s*(.+)",
-        "Home Branch Address": r"Home Branch Address\s*:\s*(.+)",
-        "IFSC/RTGS/NEFT": r"IFSC/RTGS/NEFT\s*:\s*([A-Z0-9]+)",
-        "MICR Code": r"MICR Code\s*:\s*(\d+)",
-        "ECS A/c No": r"ECS A/c No\s*:\s*(\d+)",
-        "Statement Period": r"Period\s*:\s*(.+)"
-    }
-    for field, pattern in patterns.items():
-        m = re.search(pattern, text, re.IGNORECASE)
-        details[field] = m.group(1).strip() if m else "N/A"
-    return details
+    return search_fields(RBL_METADATA, text, default="N/A")
 
 
 # ---------------------------
 # Transactions Extractor
 # ---------------------------
-DATE_RE = r"\d{2}-[A-Za-z]{3}-\d{4}"
-
-
-def extract_rbi_transactions(text: str) -> pd.DataFrame:
+def extract_rbi_transactions(text: str, opening_balance=None) -> pd.DataFrame:
     rows = []
     for line in text.splitlines():
         line = line.strip()
         if not line:
             continue
 
-        m = re.match(rf"^({DATE_RE})\s+(.*)$", line)
+        m = RBL_TXN_LINE.match(line)
         if not m:
             continue
 
@@ -51,7 +26,7 @@ def extract_rbi_transactions(text: str) -> pd.DataFrame:
         rest = m.group(2)
 
         # find Value Date
-        val_date_match = re.search(DATE_RE, rest)
+        val_date_match = RBL_DATE.search(rest)
         if val_date_match:
             value_date = val_date_match.group(0)
             desc = rest[:val_date_match.start()].strip()
@@ -60,7 +35,7 @@ def extract_rbi_transactions(text: str) -> pd.DataFrame:
             value_date, desc, tail = "", rest, ""
 
         # capture last number as Balance
-        nums = re.findall(r"[\d,]+\.\d{2}", tail)
+        nums = AMOUNT_2DP.findall(tail)
         balance = float(nums[-1].replace(",", "")) if nums else 0.0
 
         rows.append({
@@ -75,19 +50,12 @@ def extract_rbi_transactions(text: str) -> pd.DataFrame:
     if df.empty:
         return df
 
-    # infer withdrawals/deposits from balance differences
-    df["Withdrawal Amt"] = 0.0
-    df["Deposit Amt"] = 0.0
-
-    prev_balance = None
-    for i in range(len(df)):
-        bal = df.loc[i, "Balance Amt"]
-        if prev_balance is not None:
-            if bal > prev_balance:
-                df.loc[i, "Deposit Amt"] = bal - prev_balance
-            elif bal < prev_balance:
-                df.loc[i, "Withdrawal Amt"] = prev_balance - bal
-        prev_balance = bal
+    # infer withdrawals/deposits from balance differences; without an opening
+    # balance the first row has nothing to compare against and stays at 0
+    balance = df["Balance Amt"]
+    change = (balance - balance.shift(1, fill_value=opening_balance)).to_numpy()
+    df["Withdrawal Amt"] = np.where(change < 0, -change, 0.0)
+    df["Deposit Amt"] = np.where(change > 0, change, 0.0)
 
     # convert dates and drop time part
     try:
@@ -116,6 +84,9 @@ def get_frequent_transactions(df: pd.DataFrame, top_n=10):
 # Main Streamlit UI
 # ---------------------------
 def main():
+    import pdfplumber
+    import streamlit as st
+
     st.set_page_config(page_title="RBI Bank Statement Parser", layout="wide")
     st.title("🏦 RBI Bank Statement Parser")
 
@@ -1,50 +1,34 @@
-import streamlit as st
-import pdfplumber
 import pandas as pd
-import re
+import numpy as np
 from collections import Counter
+from pdf_session import open_session
+from parse_cache import cached_parse
+from records import ColumnBuilder
+from timings import stage
+from patterns import AMOUNT_2DP, RBL_DATE, RBL_METADATA, RBL_TXN_LINE, search_fields
 
-def rbl_parser():
+# Bump when the parsed output changes; cached parses of older versions are then ignored
+PARSER_VERSION = "1"
 
-    def extract_rbl_account_details(text: str) -> dict:
-        details = {}
-        patterns = {
-            "Accountholder Name": r"Accountholder Name\s*:\s*(.+)",
-            "Customer Address": r"Customer Address\s*:\s*(.+)",
-            "Phone": r"Phone\s*:\s*([+\d\(\)\s-]+)",
-            "Email Id": r"Email Id\s*:\s*([\w\.-]+@[\w\.-]+)",
-            "CIF ID": r"CIF ID\s*:\s*(\d+)",
-            "A/c Currency": r"A/c Currency\s*:\s*([A-Z]+)",
-            "A/c Open Date": r"A/c Open Date\s*:\s*(.+)",
-            "A/c Type": r"A/c Type\s*:\s*(.+)",
-            "A/c Status": r"A/c Status\s*:\s*(.+)",
-            "Home Branch": r"Home Branch\s*:\s*(.+)",
-            "Home Branch Address": r"Home Branch Address\s*:\s*(.+)",
-            "IFSC/RTGS/NEFT": r"IFSC/RTGS/NEFT\s*:\s*([A-Z0-9]+)",
-            "MICR Code": r"MICR Code\s*:\s*(\d+)",
-            "ECS A/c No": r"ECS A/c No\s*:\s*(\d+)",
-            "Statement Period": r"Period\s*:\s*(.+)"
-        }
-        for field, pattern in patterns.items():
-            m = re.search(pattern, text, re.IGNORECASE)
-            details[field] = m.group(1).strip() if m else "N/A"
-        return details
+def extract_rbl_account_details(text: str) -> dict:
+    return search_fields(RBL_METADATA, text, default="N/A")
 
 
-    # ---------------------------
-    # Transactions Extractor
-    # ---------------------------
-    DATE_RE = r"\d{2}-[A-Za-z]{3}-\d{4}"
+# ---------------------------
+# Transactions Extractor
+# ---------------------------
+RBL_COLUMNS = ["Date", "Transaction Details", "Value Date", "Balance Amt"]
 
 
-    def extract_rbl_transactions(text: str) -> pd.DataFrame:
-        rows = []
+def extract_rbl_transactions(text: str, opening_balance=None) -> pd.DataFrame:
+    rows = ColumnBuilder(RBL_COLUMNS)
+    with stage("scan"):
         for line in text.splitlines():
             line = line.strip()
             if not line:
                 continue
 
-            m = re.match(rf"^({DATE_RE})\s+(.*)$", line)
+            m = RBL_TXN_LINE.match(line)
             if not m:
                 continue
 
@@ -52,7 +36,7 @@ def rbl_parser():
             rest = m.group(2)
 
             # find Value Date
-            val_date_match = re.search(DATE_RE, rest)
+            val_date_match = RBL_DATE.search(rest)
             if val_date_match:
                 value_date = val_date_match.group(0)
                 desc = rest[:val_date_match.start()].strip()
@@ -61,34 +45,22 @@ def rbl_parser():
                 value_date, desc, tail = "", rest, ""
 
             # capture last number as Balance
-            nums = re.findall(r"[\d,]+\.\d{2}", tail)
+            nums = AMOUNT_2DP.findall(tail)
             balance = float(nums[-1].replace(",", "")) if nums else 0.0
 
-            rows.append({
-                "Date": tran_date,
-                "Transaction Details": desc,
-                "Value Date": value_date,
-                "Balance Amt": balance
-            })
-
-        df = pd.DataFrame(rows)
+            rows.append(tran_date, desc, value_date, balance)
 
-        if df.empty:
-            return df
+    if not rows:
+        return pd.DataFrame()
+    with stage("frame"):
+        df = rows.to_frame()
 
-        # infer withdrawals/deposits from balance differences
-        df["Withdrawal Amt"] = 0.0
-        df["Deposit Amt"] = 0.0
-
-        prev_balance = None
-        for i in range(len(df)):
-            bal = df.loc[i, "Balance Amt"]
-            if prev_balance is not None:
-                if bal > prev_balance:
-                    df.loc[i, "Deposit Amt"] = bal - prev_balance
-                elif bal < prev_balance:
-                    df.loc[i, "Withdrawal Amt"] = prev_balance - bal
-            prev_balance = bal
+        # infer withdrawals/deposits from balance differences; without an opening
+        # balance the first row has nothing to compare against and stays at 0
+        balance = df["Balance Amt"]
+        change = (balance - balance.shift(1, fill_value=opening_balance)).to_numpy()
+        df["Withdrawal Amt"] = np.where(change < 0, -change, 0.0)
+        df["Deposit Amt"] = np.where(change > 0, change, 0.0)
 
         # convert dates and drop time part
         try:
@@ -103,14 +75,30 @@ def rbl_parser():
         return df
 
 
-    # ---------------------------
-    # Frequency
-    # ---------------------------
-    def get_frequent_transactions(df: pd.DataFrame, top_n=10):
-        if df.empty:
-            return pd.DataFrame()
-        freq = Counter(df["Transaction Details"].astype(str))
-        return pd.DataFrame(freq.most_common(top_n), columns=["Transaction Details", "Count"])
+# ---------------------------
+# Frequency
+# ---------------------------
+def get_frequent_transactions(df: pd.DataFrame, top_n=10):
+    if df.empty:
+        return pd.DataFrame()
+    freq = Counter(df["Transaction Details"].astype(str))
+    return pd.DataFrame(freq.most_common(top_n), columns=["Transaction Details", "Count"])
+
+
+# ---------------------------
+# Account Details + Transactions from one open document
+# ---------------------------
+def parse_rbl_statement(source, workers=None, text_backend=None):
+    with open_session(source, workers=workers, text_backend=text_backend) as session:
+        session.prefetch("text")
+        all_text = session.full_text()
+    with stage("metadata"):
+        details = extract_rbl_account_details(all_text)
+    return details, extract_rbl_transactions(all_text)
+
+
+def rbl_parser():
+    import streamlit as st
 
 
     # ---------------------------
@@ -123,18 +111,14 @@ def rbl_parser():
         uploaded_file = st.file_uploader("Upload RBL Bank Statement PDF (text-based)", type=["pdf"])
 
         if uploaded_file:
-            with pdfplumber.open(uploaded_file) as pdf:
-                all_text = "\n".join(page.extract_text() or "" for page in pdf.pages)
+            acct, txns = cached_parse("RBL", PARSER_VERSION, uploaded_file, parse_rbl_statement)
 
             # Account details
             st.subheader("📋 Account Details")
-            acct = extract_rbl_account_details(all_text)
             st.table(pd.DataFrame(acct.items(), columns=["Field", "Value"]))
 
             # Transactions
             st.subheader("💰 Transactions")
-            txns = extract_rbl_transactions(all_text)
-
             if not txns.empty:
                 st.dataframe(txns, use_container_width=True)
 
@@ -0,0 +1,32 @@
+import pandas as pd
+
+
+class ColumnBuilder:
+    """
+    Accumulates parsed transactions column by column.
+
+    A list of row dicts costs a dict (plus its key table) per transaction and
+    pandas then has to re-read every row to find the columns; here a row is one
+    pointer in each column list and to_frame() hands the lists over as they are.
+    """
+
+    __slots__ = ("columns", "_data")
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._data = [[] for _ in self.columns]
+
+    def append(self, *values):
+        """Add one row; `values` are given in `columns` order."""
+        for column, value in zip(self._data, values):
+            column.append(value)
+
+    def extend(self, other):
+        for column, values in zip(self._data, other._data):
+            column.extend(values)
+
+    def __len__(self):
+        return len(self._data[0]) if self._data else 0
+
+    def to_frame(self):
+        return pd.DataFrame(dict(zip(self.columns, self._data)), columns=self.columns)
@@ -1,237 +1,186 @@
-import streamlit as st
-import pdfplumber
 import pandas as pd
-import re
 import os
 from io import BytesIO
 from collections import Counter
+from pdf_session import open_session
+from parse_cache import cached_parse
+from amounts import parse_amounts
+from records import ColumnBuilder
+from timings import stage
+from patterns import SBI_METADATA, SBI_PERIOD, WORD_SPLIT, search_fields
+
+# Bump when the parsed output changes; cached parses of older versions are then ignored
+PARSER_VERSION = "2"
+
+# === Extract Metadata (SBI Format) ===
+def extract_metadata_from_pdf(file):
+    metadata = {}
+    lines = []
+
+    with open_session(file) as session:
+        for text in session.page_texts():
+            if text:
+                lines = text.split("\n")
+                break  # only first page needed
+
+    full_text = "\n".join(lines)
+    metadata["Bank"] = "STATE BANK OF INDIA"
+
+    try:
+        idx = lines.index("STATEMENT OF ACCOUNT")
+
+        # Account holder name
+        metadata["Account Holder Name"] = lines[idx + 3].strip()
+
+        # Address block
+        addr_lines = []
+        stop_words = ["BRANCH CODE", "CIF", "ACCOUNT NO", "IFSC", "DATE OF STATEMENT",
+                    "TIME OF STATEMENT", "MICR CODE", "BALANCE", "STATEMENT FROM"]
+
+        for i in range(idx + 5, len(lines)):
+            text = lines[i].strip()
+
+            # If line contains unwanted inline fields, cut them out
+            if "BRANCH EMAIL" in text.upper():
+                text = text[:text.upper().find("BRANCH EMAIL")].strip()
+            if "BRANCH PHONE" in text.upper():
+                text = text[:text.upper().find("BRANCH PHONE")].strip()
+
+            # Stop collecting if we hit a real metadata keyword line
+            if any(text.upper().startswith(word) for word in stop_words):
+                break
 
-def run_pdf_parser_sbi():
-    # === CONFIG ===
-    DEFAULT_FILE = "Statement1.pdf"
+            if text:  # avoid blanks
+                addr_lines.append(text)
 
-    # === Extract Metadata (SBI Format) ===
-    def extract_metadata_from_pdf(file):
-        metadata = {}
-        lines = []
-
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    lines = text.split("\n")
-                    break  # only first page needed
-
-        full_text = "\n".join(lines)
-        metadata["Bank"] = "STATE BANK OF INDIA"
-
-        try:
-            idx = lines.index("STATEMENT OF ACCOUNT")
-
-            # Account holder name
-            metadata["Account Holder Name"] = lines[idx + 3].strip()
-
-            # Address block
-            addr_lines = []
-            stop_words = ["BRANCH CODE", "CIF", "ACCOUNT NO", "IFSC", "DATE OF STATEMENT",
-                        "TIME OF STATEMENT", "MICR CODE", "BALANCE", "STATEMENT FROM"]
-
-            for i in range(idx + 5, len(lines)):
-                text = lines[i].strip()
-
-                # If line contains unwanted inline fields, cut them out
-                if "BRANCH EMAIL" in text.upper():
-                    text = text[:text.upper().find("BRANCH EMAIL")].strip()
-                if "BRANCH PHONE" in text.upper():
-                    text = text[:text.upper().find("BRANCH PHONE")].strip()
-
-                # Stop collecting if we hit a real metadata keyword line
-                if any(text.upper().startswith(word) for word in stop_words):
-                    break
-
-                if text:  # avoid blanks
-                    addr_lines.append(text)
-
-            metadata["Account Holder Address"] = " ".join(addr_lines).strip()
-
-        except ValueError:
-            metadata["Account Holder Name"] = ""
-            metadata["Account Holder Address"] = ""
-
-        # --- Branch & Address ---
-        branch_name = ""
-        branch_address = ""
-        for i, line in enumerate(lines):
-            if "STATE BANK OF INDIA" in line.upper():
-                if i + 1 < len(lines):
-                    branch_name = lines[i + 1].strip()
-                if i + 2 < len(lines) and not lines[i + 2].startswith("Branch Code"):
-                    branch_address = lines[i + 2].strip()
-                break
-        metadata["Branch"] = branch_name
-        metadata["Branch Address"] = branch_address
-
-        # --- Regex fields ---
-        metadata["Branch Code"] = re.search(r"Branch Code\s*:\s*(\d+)", full_text)
-        metadata["Branch Code"] = metadata["Branch Code"].group(1) if metadata["Branch Code"] else ""
-
-        metadata["Branch Email"] = re.search(r"Branch Email\s*:\s*([\w\.-]+@[\w\.-]+)", full_text)
-        metadata["Branch Email"] = metadata["Branch Email"].group(1) if metadata["Branch Email"] else ""
-
-        metadata["Branch Phone"] = re.search(r"Branch Phone\s*:\s*(\d+)", full_text)
-        metadata["Branch Phone"] = metadata["Branch Phone"].group(1) if metadata["Branch Phone"] else ""
-
-        metadata["CIF"] = re.search(r"CIF\s*No\s*:\s*(\d+)", full_text)
-        metadata["CIF"] = metadata["CIF"].group(1) if metadata["CIF"] else ""
-
-        metadata["Account Number"] = re.search(r"Account\s*No\s*:\s*(\d+)", full_text)
-        metadata["Account Number"] = metadata["Account Number"].group(1) if metadata["Account Number"] else ""
-
-        metadata["Product"] = re.search(r"Product\s*:\s*(.*)", full_text)
-        metadata["Product"] = metadata["Product"].group(1).strip() if metadata["Product"] else ""
-
-        metadata["IFSC"] = re.search(r"IFSC\s*Code\s*:\s*([A-Z0-9]+)", full_text)
-        metadata["IFSC"] = metadata["IFSC"].group(1) if metadata["IFSC"] else ""
-
-        metadata["MICR"] = re.search(r"MICR\s*Code\s*:\s*(\d+)", full_text)
-        metadata["MICR"] = metadata["MICR"].group(1) if metadata["MICR"] else ""
-
-        metadata["Currency"] = re.search(r"Currency\s*:\s*([A-Z]+)", full_text)
-        metadata["Currency"] = metadata["Currency"].group(1) if metadata["Currency"] else ""
-
-        metadata["Account Status"] = re.search(r"Account\s*Status\s*:\s*(\w+)", full_text)
-        metadata["Account Status"] = metadata["Account Status"].group(1) if metadata["Account Status"] else ""
-
-        metadata["Nominee"] = re.search(r"Nominee\s*Name\s*:\s*(.*)", full_text)
-        metadata["Nominee"] = metadata["Nominee"].group(1).strip() if metadata["Nominee"] else ""
-
-        metadata["CKYC"] = re.search(r"CKYC\s*No\s*:\s*(.*)", full_text)
-        metadata["CKYC"] = metadata["CKYC"].group(1).strip() if metadata["CKYC"] else ""
-
-        metadata["Email"] = re.search(r"Email\s*:\s*(.*)", full_text)
-        metadata["Email"] = metadata["Email"].group(1).strip() if metadata["Email"] else ""
-
-        metadata["Statement Period"] = re.search(
-            r"Statement\s*From\s*:\s*(\d{2}-\d{2}-\d{4})\s*To\s*(\d{2}-\d{2}-\d{4})", full_text
-        )
-        metadata["Statement Period"] = (
-            f"{metadata['Statement Period'].group(1)} to {metadata['Statement Period'].group(2)}"
-            if metadata["Statement Period"]
-            else ""
-        )
-
-        return metadata
-
-    def parse_amount(value):
-        """
-        Robust amount parser:
-        - returns None for empty / '-' / missing values
-        - strips CR/DR, commas, parentheses and other non-numeric chars
-        - returns float or None
-        """
-        if value is None:
-            return None
-        s = str(value).strip()
-        if s == "" or s == "-" or s.upper() in ["NA", "N/A", "—", "–"]:
-            return None
-
-        # Remove CR/DR markers and convert parentheses to negative sign if present
-        s_up = s.upper()
-        s_up = s_up.replace("CR", "").replace("DR", "")
-        # Convert (1,000) => -1000
-        if "(" in s_up and ")" in s_up:
-            s_up = s_up.replace("(", "-").replace(")", "")
-
-        # Remove anything that's not digit, dot or minus
-        s_clean = re.sub(r"[^\d\.-]", "", s_up)
-
-        if s_clean == "" or s_clean == "-" or s_clean == ".": 
-            return None
-
-        try:
-            return float(s_clean)
-        except Exception:
-            return None
-
-    # === Transaction Parser ===
-    def parse_sbi_pdf(file_path, debug: bool = False):
-        rows = []
-
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                table = page.extract_table()
-                if not table:
-                    continue
-
-                for row in table:
-                    if not row or all(cell is None for cell in row):
-                        continue
-
-                    # Detect and skip headers on every page
-                    if any("Post Date" in str(cell) for cell in row) or \
-                       any("Debit" in str(cell) for cell in row) or \
-                       any("Credit" in str(cell) for cell in row):
-                        continue
-
-                    # unpack with safe defaults (7 columns expected)
-                    post_date, value_date, description, cheque, debit, credit, balance = (row + [None]*7)[:7]
-
-                    # Handle BROUGHT FORWARD
-                    if description and "BROUGHT FORWARD" in str(description).upper():
-                        rows.append({
-                            "Post Date": None,
-                            "Value Date": None,
-                            "Description": "BROUGHT FORWARD",
-                            "Cheque No/Reference": None,
-                            "Debit": None,
-                            "Credit": None,
-                            "Balance": parse_amount(balance)
-                        })
-                        continue
-
-                    rows.append({
-                        "Post Date": post_date,
-                        "Value Date": value_date,
-                        "Description": description,
-                        "Cheque No/Reference": cheque,
-                        "Debit": parse_amount(debit),
-                        "Credit": parse_amount(credit),
-                        "Balance": parse_amount(balance)
-                    })
-
-        df = pd.DataFrame(rows)
-
-        # Normalize strings: strip whitespace from string columns and replace empty strings with NaN
-        str_cols = df.select_dtypes(include=["object"]).columns.tolist()
-        for c in str_cols:
-            df[c] = df[c].astype(object).where(df[c].notna(), None)  # keep None
-            df[c] = df[c].apply(lambda x: x.strip() if isinstance(x, str) else x)
-        # Replace empty strings with pd.NA so dropna will work
-        df = df.replace(r'^\s*$', pd.NA, regex=True)
-
-        # Ensure numeric columns are numeric (coerce invalid -> NaN)
-        if "Debit" in df:
-            df["Debit"] = pd.to_numeric(df["Debit"], errors="coerce")
-        if "Credit" in df:
-            df["Credit"] = pd.to_numeric(df["Credit"], errors="coerce")
-        if "Balance" in df:
-            df["Balance"] = pd.to_numeric(df["Balance"], errors="coerce")
-
-        # 🧹 Remove rows where all important fields are empty/NaN
-        df = df.dropna(how="all", subset=["Post Date", "Value Date", "Description", "Cheque No/Reference", "Debit", "Credit", "Balance"])
-
-        # Optional: reset index
-        df = df.reset_index(drop=True)
-
-        # Build keyword frequency (after dropping empty rows)
+        metadata["Account Holder Address"] = " ".join(addr_lines).strip()
+
+    except ValueError:
+        metadata["Account Holder Name"] = ""
+        metadata["Account Holder Address"] = ""
+
+    # --- Branch & Address ---
+    branch_name = ""
+    branch_address = ""
+    for i, line in enumerate(lines):
+        if "STATE BANK OF INDIA" in line.upper():
+            if i + 1 < len(lines):
+                branch_name = lines[i + 1].strip()
+            if i + 2 < len(lines) and not lines[i + 2].startswith("Branch Code"):
+                branch_address = lines[i + 2].strip()
+            break
+    metadata["Branch"] = branch_name
+    metadata["Branch Address"] = branch_address
+
+    # --- Regex fields ---
+    metadata.update(search_fields(SBI_METADATA, full_text))
+
+    period = SBI_PERIOD.search(full_text)
+    metadata["Statement Period"] = f"{period.group(1)} to {period.group(2)}" if period else ""
+
+    return metadata
+
+# === Transaction Parser ===
+SBI_COLUMNS = ["Post Date", "Value Date", "Description", "Cheque No/Reference", "Debit", "Credit", "Balance"]
+
+
+def _sbi_table_rows(table, rows):
+    """Append one page's extracted table to the `rows` ColumnBuilder (headers and blank rows skipped)."""
+    for row in table or []:
+        if not row or all(cell is None for cell in row):
+            continue
+
+        # Detect and skip headers on every page
+        if any("Post Date" in str(cell) for cell in row) or \
+           any("Debit" in str(cell) for cell in row) or \
+           any("Credit" in str(cell) for cell in row):
+            continue
+
+        # unpack with safe defaults (7 columns expected)
+        post_date, value_date, description, cheque, debit, credit, balance = (row + [None]*7)[:7]
+
+        # Handle BROUGHT FORWARD
+        if description and "BROUGHT FORWARD" in str(description).upper():
+            rows.append(None, None, "BROUGHT FORWARD", None, None, None, balance)
+            continue
+
+        rows.append(post_date, value_date, description, cheque, debit, credit, balance)
+
+
+def _clean_sbi_frame(df):
+    # Normalize strings: strip whitespace from string columns and replace empty strings with NaN
+    str_cols = df.select_dtypes(include=["object"]).columns.tolist()
+    for c in str_cols:
+        df[c] = df[c].astype(object).where(df[c].notna(), None)  # keep None
+        df[c] = df[c].apply(lambda x: x.strip() if isinstance(x, str) else x)
+    # Replace empty strings with pd.NA so dropna will work
+    df = df.replace(r'^\s*$', pd.NA, regex=True)
+
+    # Raw amount cells -> floats, one pass per column (invalid -> NaN)
+    for col in ["Debit", "Credit", "Balance"]:
+        if col in df:
+            df[col] = parse_amounts(df[col])
+
+    # 🧹 Remove rows where all important fields are empty/NaN
+    df = df.dropna(how="all", subset=["Post Date", "Value Date", "Description", "Cheque No/Reference", "Debit", "Credit", "Balance"])
+
+    # Optional: reset index
+    return df.reset_index(drop=True)
+
+
+def parse_sbi_pdf(file_path, debug: bool = False):
+    rows = ColumnBuilder(SBI_COLUMNS)
+
+    with open_session(file_path) as session:
+        session.prefetch("table")
+        with stage("scan"):
+            for table in session.page_tables():
+                _sbi_table_rows(table, rows)
+
+    with stage("frame"):
+        df = _clean_sbi_frame(rows.to_frame())
+
+    # Build keyword frequency (after dropping empty rows)
+    with stage("keywords"):
         keywords = []
         for d in df["Description"].fillna(""):
-            for w in re.split(r"\W+", str(d)):
+            for w in WORD_SPLIT.split(str(d)):
                 if len(w) > 3:
                     keywords.append(w.upper())
         direction_counts = Counter(keywords)
 
-        return df, direction_counts
+    return df, direction_counts
+
+
+def iter_sbi_pdf(file_path):
+    """
+    Streaming variant of parse_sbi_pdf: yields one cleaned DataFrame per page as soon
+    as that page is parsed and releases the page afterwards, so memory stays flat
+    however long the statement is. Keyword counting is left to the consumer.
+    """
+    with open_session(file_path) as session:
+        for i in range(len(session.pages)):
+            rows = ColumnBuilder(SBI_COLUMNS)
+            _sbi_table_rows(session.page_table(i), rows)
+            session.release(i)
+            if rows:
+                yield _clean_sbi_frame(rows.to_frame())
+
+
+# === Metadata + Transactions from one open document ===
+def parse_sbi_statement(source, workers=None):
+    with open_session(source, workers=workers) as session:
+        session.prefetch("table")
+        with stage("metadata"):
+            metadata = extract_metadata_from_pdf(session)
+        return metadata, parse_sbi_pdf(session)
+
+
+def run_pdf_parser_sbi():
+    import streamlit as st
+
+    # === CONFIG ===
+    DEFAULT_FILE = "Statement1.pdf"
 
     # === Streamlit UI ===
     def main():
@@ -249,15 +198,13 @@ def run_pdf_parser_sbi():
             st.error("❌ No file uploaded and default file not found.")
             st.stop()
 
-        # Metadata
-        metadata = extract_metadata_from_pdf(source)
+        # Metadata + transactions (reused across reruns for the same upload)
+        metadata, (df, direction_counts) = cached_parse("SBI", PARSER_VERSION, source, parse_sbi_statement)
+
         if metadata:
             with st.expander("📌 Extracted Metadata", expanded=True):
                 st.dataframe(pd.DataFrame(metadata.items(), columns=["Field", "Value"]))
 
-        # Transactions
-        df, direction_counts = parse_sbi_pdf(source)
-
         if df.empty:
             st.warning("⚠ No transactions found.")
         else:
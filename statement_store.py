@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+
+import pandas as pd
+
+# === CONFIG ===
+# Set STATEMENT_STORE_DIR to an empty string to turn the on-disk store off
+DEFAULT_STORE_DIR = os.environ.get("STATEMENT_STORE_DIR", ".statement_cache")
+DEFAULT_MAX_BYTES = int(os.environ.get("STATEMENT_STORE_MAX_BYTES", 1024 * 1024 * 1024))
+PARQUET_COMPRESSION = "zstd"
+# Temp files older than this are left over from a crashed write and removed on eviction
+STALE_TMP_SECONDS = 3600
+
+
+# === (de)serialising parse results ===
+# A parse result is (metadata dict, X) where X is either a DataFrame or a tuple holding one
+# DataFrame plus small extras (keyword Counters, an opening balance, ...). The frame goes to
+# Parquet, everything else to the JSON sidecar.
+def _encode_result(parse_result):
+    items = parse_result if isinstance(parse_result, tuple) else (parse_result,)
+    frames = [v for v in items if isinstance(v, pd.DataFrame)]
+    if len(frames) != 1:
+        raise ValueError("expected exactly one DataFrame in the parse result")
+
+    parts = []
+    for v in items:
+        if isinstance(v, pd.DataFrame):
+            parts.append({"kind": "frame"})
+        elif isinstance(v, Counter):
+            parts.append({"kind": "counter", "value": dict(v)})
+        else:
+            parts.append({"kind": "value", "value": v})
+    return frames[0], {"tuple": isinstance(parse_result, tuple), "parts": parts}
+
+
+def _decode_result(frame, layout):
+    items = []
+    for part in layout["parts"]:
+        if part["kind"] == "frame":
+            items.append(frame)
+        elif part["kind"] == "counter":
+            items.append(Counter(part["value"]))
+        else:
+            items.append(part["value"])
+    return tuple(items) if layout["tuple"] else items[0]
+
+
+def temp_name(path, suffix=""):
+    """
+    A name next to `path` that no other thread or process writes to, for writing it
+    atomically; `suffix` for writers that pick the format from the extension.
+    """
+    return f"{path}.{os.getpid()}-{uuid.uuid4().hex}.tmp{suffix}"
+
+
+def publish(tmp, path):
+    """Move a finished temp file into place; False when it is gone (cleaned up as stale meanwhile)."""
+    try:
+        os.replace(tmp, path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+class StatementStore:
+    """
+    Parsed statements on local disk: <root>/<bank>-<sha256>-v<version>.parquet + .json sidecar.
+    The sidecar mtime doubles as the last-access time, so eviction is least-recently-used.
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _base(self, digest, bank, parser_version):
+        # Labels like "Kotak/pdfium" name a parser variant, not a subdirectory
+        return os.path.join(self.root, f"{bank.replace('/', '+')}-{digest}-v{parser_version}")
+
+    def load(self, digest, bank, parser_version):
+        """(metadata, parse_result) for a stored statement, or None."""
+        base = self._base(digest, bank, parser_version)
+        try:
+            with open(base + ".json", encoding="utf-8") as fh:
+                sidecar = json.load(fh)
+            frame = pd.read_parquet(base + ".parquet")
+        except (OSError, ValueError):
+            return None
+
+        try:
+            os.utime(base + ".json")  # mark as recently used
+        except FileNotFoundError:
+            pass  # evicted by another process since it was read
+        return sidecar["metadata"], _decode_result(frame, sidecar["result"])
+
+    def save(self, digest, bank, parser_version, result):
+        metadata, parse_result = result
+        frame, layout = _encode_result(parse_result)
+        base = self._base(digest, bank, parser_version)
+        sidecar = {
+            "bank": bank,
+            "sha256": digest,
+            "parser_version": parser_version,
+            "metadata": metadata,
+            "result": layout,
+        }
+
+        # Write to temp names of our own first so a crash never leaves a half-written entry
+        # behind, and batch workers saving the same statement at once do not share a file
+        parquet_tmp, json_tmp = temp_name(base + ".parquet"), temp_name(base + ".json")
+        frame.to_parquet(parquet_tmp, compression=PARQUET_COMPRESSION, index=False)
+        with open(json_tmp, "w", encoding="utf-8") as fh:
+            json.dump(sidecar, fh, default=str)
+        if publish(parquet_tmp, base + ".parquet"):
+            publish(json_tmp, base + ".json")
+
+        self.evict()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            base = os.path.join(self.root, name[:-len(".json")])
+            try:
+                last_used = os.path.getmtime(base + ".json")
+                size = os.path.getsize(base + ".json") + os.path.getsize(base + ".parquet")
+            except OSError:
+                continue
+            entries.append((last_used, size, base))
+        return entries
+
+    def total_bytes(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _remove_stale_temps(self):
+        cutoff = time.time() - STALE_TMP_SECONDS
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                if ".tmp" in name and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass  # finished or removed by another process meanwhile
+
+    def evict(self, keep=None):
+        """Drop least-recently-used entries, other than the one at base path `keep`, until the store fits in max_bytes."""
+        with self._lock:
+            self._remove_stale_temps()
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, base in entries:
+                if total <= self.max_bytes:
+                    break
+                if base == keep:
+                    continue
+                for ext in (".json", ".parquet"):
+                    try:
+                        os.remove(base + ext)
+                    except OSError:
+                        pass
+                total -= size
+
+
+_default_store = None
+
+
+def default_store():
+    """Process-wide store, or None when STATEMENT_STORE_DIR is set to ''."""
+    global _default_store
+    if _default_store is None and DEFAULT_STORE_DIR:
+        _default_store = StatementStore()
+    return _default_store
@@ -0,0 +1,54 @@
+import pandas as pd
+
+
+def _arrow_schema(chunk):
+    """Fixed schema for every chunk: numeric columns as float64, datetimes as timestamps, everything else as string."""
+    import pyarrow as pa
+
+    def arrow_type(col):
+        if pd.api.types.is_datetime64_any_dtype(col):
+            return pa.timestamp("us")
+        return pa.float64() if pd.api.types.is_numeric_dtype(col) else pa.string()
+
+    return pa.schema([(str(col), arrow_type(chunk[col])) for col in chunk.columns])
+
+
+def write_chunks(chunks, path):
+    """
+    Write the DataFrame chunks from an iter_*_pdf generator straight to `path`
+    (.csv or .parquet) without holding more than one chunk in memory.
+    Returns the number of rows written.
+    """
+    total = 0
+
+    if path.lower().endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                if writer is None:
+                    schema = _arrow_schema(chunk)
+                    writer = pq.ParquetWriter(path, schema, compression="zstd")
+                # A page whose Debit column is all blank still has to match the first page's schema
+                chunk = chunk.astype({
+                    f.name: "float64" if pa.types.is_floating(f.type)
+                    else "datetime64[us]" if pa.types.is_timestamp(f.type) else object
+                    for f in schema
+                })
+                chunk = chunk.where(chunk.notna(), None)
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                total += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return total
+
+    header = True
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        for chunk in chunks:
+            chunk.to_csv(fh, index=False, header=header)
+            header = False
+            total += len(chunk)
+    return total
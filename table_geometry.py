@@ -0,0 +1,127 @@
+import os
+from bisect import bisect_right
+
+from pdfplumber import utils
+from pdfplumber.table import TableSettings, merge_edges
+
+# === CONFIG ===
+# Reuse the ruled-table layout learned on one page for the following pages; 0 turns
+# it off and every page goes through pdfplumber's full table detection
+LEARN_TABLE_GEOMETRY = os.environ.get("PDF_TABLE_GEOMETRY", "1") != "0"
+# How far (pt) a page's ruling may sit from the learned column edges
+EDGE_TOLERANCE = 3
+
+_SETTINGS = TableSettings.resolve(None)
+
+
+def _ruling(page):
+    """The page's ruling lines, snapped and joined exactly as find_tables() does."""
+    s = _SETTINGS
+    edges = merge_edges(
+        utils.filter_edges(page.edges, min_length=s.edge_min_length_prefilter),
+        snap_x_tolerance=s.snap_x_tolerance,
+        snap_y_tolerance=s.snap_y_tolerance,
+        join_x_tolerance=s.join_x_tolerance,
+        join_y_tolerance=s.join_y_tolerance,
+    )
+    edges = utils.filter_edges(edges, min_length=s.edge_min_length)
+    return [e for e in edges if e["orientation"] == "v"], [e for e in edges if e["orientation"] == "h"]
+
+
+class TableGeometry:
+    """
+    Column edges of a fully ruled statement table (every row crossed by every
+    column line), learned from the Table pdfplumber found on one page.
+
+    extract() then reads the same table off another page without pdfplumber's
+    intersection/cell search and without its per-row scan of every character on
+    the page: it checks that the page is ruled the same way and drops each char
+    into its cell by bisecting the row and column lines.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    @classmethod
+    def learn(cls, table):
+        """Geometry of a pdfplumber Table, or None if it is not a plain grid."""
+        xs = sorted({c[0] for c in table.cells} | {c[2] for c in table.cells})
+        ys = sorted({c[1] for c in table.cells} | {c[3] for c in table.cells})
+        if len(xs) < 2 or len(table.cells) != (len(xs) - 1) * (len(ys) - 1):
+            return None
+        return cls(xs)
+
+    def _fit(self, page):
+        """(column xs, row ys) of this page's grid, or None if it is ruled differently."""
+        tol = EDGE_TOLERANCE
+        left, right = self.columns[0] - tol, self.columns[-1] + tol
+        verticals, horizontals = _ruling(page)
+
+        rows = [e for e in horizontals if e["x1"] > left and e["x0"] < right]
+        if len(rows) < 2 or any(e["x0"] > left + 2 * tol or e["x1"] < right - 2 * tol for e in rows):
+            return None
+        ys = sorted({e["top"] for e in rows})
+        top, bottom = ys[0], ys[-1]
+
+        cols = [e for e in verticals if left <= e["x0"] <= right and e["bottom"] > top and e["top"] < bottom]
+        xs = sorted({e["x0"] for e in cols})
+        if len(xs) != len(self.columns) or any(abs(a - b) > tol for a, b in zip(xs, self.columns)):
+            return None
+        if any(e["top"] > top + tol or e["bottom"] < bottom - tol for e in cols):
+            return None
+        return xs, ys
+
+    def extract(self, page):
+        """
+        The table as page.extract_table() would return it, or None when the page
+        does not carry a grid with the learned columns.
+        """
+        fit = self._fit(page)
+        if fit is None:
+            return None
+        xs, ys = fit
+        ncols, nrows = len(xs) - 1, len(ys) - 1
+
+        cells = [[[] for _ in range(ncols)] for _ in range(nrows)]
+        for char in page.chars:
+            v_mid = (char["top"] + char["bottom"]) / 2
+            h_mid = (char["x0"] + char["x1"]) / 2
+            r = bisect_right(ys, v_mid) - 1
+            c = bisect_right(xs, h_mid) - 1
+            if 0 <= r < nrows and 0 <= c < ncols:
+                cells[r][c].append(char)
+
+        text_settings = _SETTINGS.text_settings or {}
+        return [
+            [utils.extract_text(chars, **text_settings) if chars else "" for chars in row]
+            for row in cells
+        ]
+
+
+class TableReader:
+    """
+    extract_table() for the pages of one statement, in order. Once a page's table
+    has been detected the normal way its geometry is reused for the next pages;
+    a page that does not fit falls back to full detection and is learned from.
+    """
+
+    __slots__ = ("learn", "geometry")
+
+    def __init__(self, learn=None):
+        self.learn = LEARN_TABLE_GEOMETRY if learn is None else learn
+        self.geometry = None
+
+    def extract(self, page):
+        if self.geometry is not None:
+            table = self.geometry.extract(page)
+            if table is not None:
+                return table
+
+        found = page.find_table()
+        if found is None:
+            return None
+        if self.learn:
+            self.geometry = TableGeometry.learn(found)
+        return found.extract(**(_SETTINGS.text_settings or {}))
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+import parse_cache
+import statement_store
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+# Pages per generated statement: enough for page breaks inside the transaction table
+PAGES = 3
+
+
+@pytest.fixture(scope="session")
+def statements(tmp_path_factory):
+    """{layout: path} of a synthetic statement PDF per synthetic_statements.LAYOUTS entry."""
+    pytest.importorskip("reportlab")
+    from synthetic_statements import generate
+
+    return generate(str(tmp_path_factory.mktemp("statements")), PAGES)
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """A fresh in-process parse cache and an on-disk store under tmp_path for every test."""
+    store = statement_store.StatementStore(str(tmp_path / "statement_cache"))
+    monkeypatch.setattr(parse_cache, "_default_cache", parse_cache.ParseCache())
+    monkeypatch.setattr(statement_store, "_default_store", store)
+    monkeypatch.setattr(parse_cache, "default_store", lambda: store)
+    return store
@@ -0,0 +1,57 @@
+import math
+
+import pandas as pd
+import pytest
+
+from amounts import parse_amounts
+
+NAN = float("nan")
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ("1,234.56", 1234.56),
+    ("12,34,567.00", 1234567.0),  # lakh grouping
+    ("45.00Cr", 45.0),
+    ("45.00 CR", 45.0),
+    ("45.00(Cr)", 45.0),  # a bracketed marker is not a negative
+    ("12.50 DR", 12.5),
+    ("12.50(Dr)", 12.5),
+    ("(1,000)", -1000.0),
+    ("-250.75", -250.75),
+    (".5", 0.5),
+    ("INR 1,000.00", 1000.0),
+    ("", NAN),
+    ("   ", NAN),
+    ("-", NAN),
+    ("NA", NAN),
+    ("N/A", NAN),
+    ("—", NAN),
+    (None, NAN),
+    ("1.2.3", NAN),
+    ("1-2", NAN),
+])
+def test_parse_amounts(cell, expected):
+    value = parse_amounts([cell])[0]
+    assert math.isnan(value) if math.isnan(expected) else value == expected
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ("1,234.56", 1234.56),
+    ("45.00 Cr", 45.0),
+    ("(1,000)", -1000.0),
+    ("INR 1,000.00", NAN),  # only markers, separators and spaces may go
+    ("SALARY", NAN),
+    ("REF1234", NAN),
+])
+def test_parse_amounts_strict(cell, expected):
+    value = parse_amounts([cell], strict=True)[0]
+    assert math.isnan(value) if math.isnan(expected) else value == expected
+
+
+def test_parse_amounts_keeps_the_series_index_and_mixed_types():
+    values = pd.Series(["1,000.00", 250.5, None, 7], index=[10, 11, 12, 13], dtype="object")
+    result = parse_amounts(values)
+
+    assert result.index.tolist() == [10, 11, 12, 13]
+    assert result.dtype == "float64"
+    assert result.fillna(-1).tolist() == [1000.0, 250.5, -1.0, 7.0]
@@ -0,0 +1,37 @@
+import pytest
+
+import bank_detect
+from bank_detect import detect_bank
+
+KOTAK_PAGE = """Kotak Mahindra Bank
+Account Statement
+Account No. 1234567890    Period 01/04/2024 - 30/04/2024
+Date        Narration                                   Withdrawal (Dr)   Deposit (Cr)   Balance
+02/04/2024  NEFT-SBIN0001234-STATE BANK OF INDIA-RENT   15,000.00                        85,000.00
+05/04/2024  IMPS-CENTRAL BANK OF INDIA-REFUND                             2,000.00       87,000.00
+"""
+
+SBI_PAGE = """STATE BANK OF INDIA
+Account Name : JOHN DOE
+Txn Date  Value Date  Description                 Debit   Credit   Balance
+1 Apr 2024  1 Apr 2024  NEFT-INDIAN OVERSEAS BANK           500.00   10,500.00
+"""
+
+
+@pytest.mark.parametrize("page, bank", [(KOTAK_PAGE, "kotak"), (SBI_PAGE, "sbi")])
+def test_narration_naming_another_bank_does_not_decide(monkeypatch, page, bank):
+    monkeypatch.setattr(bank_detect, "first_page_text", lambda source: page)
+    assert detect_bank("statement.pdf") == bank
+
+
+def test_earliest_bank_name_wins_without_line_breaks(monkeypatch):
+    # PdfSession pages give their characters without line breaks, so there is no header cut
+    page = "CENTRAL BANK OF INDIA Statement 02/04/2024 NEFT STATE BANK OF INDIA 500.00"
+    monkeypatch.setattr(bank_detect, "first_page_text", lambda source: page)
+    assert detect_bank("statement.pdf") == "cbi"
+
+
+def test_whole_page_searched_when_header_has_no_signature(monkeypatch):
+    page = "01/05/2024 10:32 printed\nINDIAN OVERSEAS BANK\nStatement of account\n"
+    monkeypatch.setattr(bank_detect, "first_page_text", lambda source: page)
+    assert detect_bank("statement.pdf") == "iob"
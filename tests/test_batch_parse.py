@@ -0,0 +1,25 @@
+import os
+
+import pandas as pd
+
+import parse_cache
+from batch_parse import _output_names, parse_one
+
+
+def test_batch_parses_bypass_the_parse_caches(statements, tmp_path, isolated_caches):
+    out_base = str(tmp_path / "out" / "cbi")
+    os.makedirs(os.path.dirname(out_base))
+
+    report = parse_one(statements["cbi"], "auto", out_base, "parquet")
+
+    assert report["status"] == "ok" and report["bank"] == "cbi"
+    assert len(pd.read_parquet(out_base + ".parquet")) == report["rows"] > 0
+    assert len(parse_cache._default_cache) == 0
+    assert isolated_caches.total_bytes() == 0
+
+
+def test_output_names_never_collide():
+    files = ["a/x.pdf", "b/x.pdf", "c/x-2.pdf", "d/X.pdf", "e/y.xlsx"]
+    names = _output_names(files)
+    assert names == ["x", "x-2", "x-2-2", "X-3", "y"]
+    assert len({n.lower() for n in names}) == len(files)
@@ -0,0 +1,61 @@
+import csv
+
+import pandas as pd
+from openpyxl import Workbook
+
+from csv_parser import parse_csv_statement
+from excel_parser import SHEET_COLUMN, parse_excel_statement
+
+ROWS = [["Account Statement"], ["Account Name", "JOHN DOE"],
+        ["Tran Date", "Particulars", "Debit", "Credit", "Balance"]]
+ROWS += [[f"{day:02d}/04/2024", "UPI POS", None, 1000.0, 1000.0 * day] for day in range(1, 31)]
+
+
+def test_csv_and_excel_statements_give_the_same_columns(tmp_path):
+    wb = Workbook()
+    for row in ROWS:
+        wb.active.append(row)
+    xlsx = tmp_path / "statement.xlsx"
+    wb.save(xlsx)
+    with open(tmp_path / "statement.csv", "w", newline="") as fh:
+        csv.writer(fh).writerows([[f"{v:,.2f}" if isinstance(v, float) else v for v in row] for row in ROWS])
+
+    excel_metadata, excel_df = parse_excel_statement(str(xlsx))
+    csv_metadata, csv_df = parse_csv_statement(str(tmp_path / "statement.csv"))
+
+    assert list(csv_df.columns) == list(excel_df.columns)
+    assert list(csv_metadata.columns) == list(excel_metadata.columns)
+    assert (csv_df[SHEET_COLUMN] == "statement").all()
+    pd.testing.assert_frame_equal(csv_df.drop(columns=SHEET_COLUMN), excel_df.drop(columns=SHEET_COLUMN),
+                                  check_dtype=False)
+
+
+def test_header_without_rows_gives_an_empty_frame_with_its_columns(tmp_path):
+    path = tmp_path / "statement.csv"
+    path.write_text("Account Statement\nTran Date,Particulars,Debit,Credit,Balance\n")
+    wb = Workbook()
+    wb.active.append(["Account Statement"])
+    wb.active.append(["Tran Date", "Particulars", "Debit", "Credit", "Balance"])
+    wb.save(tmp_path / "statement.xlsx")
+
+    _, csv_df = parse_csv_statement(str(path))
+    _, excel_df = parse_excel_statement(str(tmp_path / "statement.xlsx"))
+    assert csv_df.empty
+    assert list(csv_df.columns) == list(excel_df.columns) == [
+        SHEET_COLUMN, "Tran Date", "Particulars", "Debit", "Credit", "Balance"]
+
+
+def test_quoted_line_breaks_above_the_table_keep_rows_aligned(tmp_path):
+    path = tmp_path / "statement.csv"
+    path.write_bytes(
+        '\ufeffAccount Name,"JOHN DOE\n12 MG ROAD\nBANGALORE"\n'
+        '"Tran\nDate",Particulars,Debit,Credit,Balance\n'
+        '01/04/2024,UPI POS,,"1,000.00","1,000.00"\n'
+        '02/04/2024,ATM,500.00,,500.00\n'.encode("utf-8")
+    )
+    metadata, df = parse_csv_statement(str(path))
+
+    assert metadata.iloc[0].tolist() == ["statement", "Account Name", "JOHN DOE\n12 MG ROAD\nBANGALORE"]
+    assert list(df.columns) == [SHEET_COLUMN, "Tran\nDate", "Particulars", "Debit", "Credit", "Balance"]
+    assert df["Tran\nDate"].dt.day.tolist() == [1, 2]
+    assert df["Balance"].tolist() == [1000.0, 500.0]
@@ -0,0 +1,86 @@
+import os
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+import excel_parser
+from excel_parser import cached_excel_parquet, normalize_datetime_columns, parse_excel_statement
+
+HEADER = ["Tran Date", "Particulars", "Debit", "Credit", "Balance"]
+
+
+@pytest.fixture
+def footer_workbook(tmp_path):
+    """An export with text dates and a "Total" footer in the date column."""
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Account Statement"])
+    ws.append(HEADER)
+    for day in range(1, 31):
+        ws.append([f"{day:02d}/04/2024", "UPI POS", None, 100.0, 100.0 * day])
+    ws.append(["Total", None, 0.0, 3000.0, None])
+    path = tmp_path / "statement.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("engine", ["calamine", "openpyxl"])
+def test_footer_row_keeps_date_column_a_date_on_both_paths(footer_workbook, tmp_path, engine):
+    _, parsed = parse_excel_statement(footer_workbook, engine=engine)
+    _, parquet_path = cached_excel_parquet(footer_workbook, out_dir=str(tmp_path / "cache"), engine=engine)
+    converted = pd.read_parquet(parquet_path)
+
+    assert pd.api.types.is_datetime64_any_dtype(parsed["Tran Date"])
+    assert pd.api.types.is_datetime64_any_dtype(converted["Tran Date"])
+    assert parsed["Tran Date"].isna().sum() == converted["Tran Date"].isna().sum() == 1
+
+
+def test_pandas_without_calamine_engine_falls_back_to_openpyxl(footer_workbook, monkeypatch):
+    real_excel_file = pd.ExcelFile
+
+    def excel_file_before_2_2(source, engine=None, **kwargs):
+        if engine == "calamine":
+            raise ValueError(f"Unknown engine: {engine}")
+        return real_excel_file(source, engine=engine, **kwargs)
+
+    monkeypatch.setattr(pd, "ExcelFile", excel_file_before_2_2)
+    _, parsed = parse_excel_statement(footer_workbook, mode="pandas", engine="calamine")
+    assert len(parsed) == 31
+
+
+def test_converted_workbooks_are_kept_under_the_byte_budget(footer_workbook, tmp_path, monkeypatch):
+    out_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(excel_parser, "EXCEL_PARQUET_MAX_BYTES", 0)
+    first_metadata, first = cached_excel_parquet(footer_workbook, out_dir=out_dir)
+
+    other = tmp_path / "other.xlsx"
+    other.write_bytes(open(footer_workbook, "rb").read() + b"\0")  # different content, same sheet
+    _, second = cached_excel_parquet(str(other), out_dir=out_dir)
+
+    assert not os.path.exists(first) and os.path.exists(second)  # the newest conversion is kept
+    assert sorted(os.listdir(out_dir)) == sorted([os.path.basename(second), os.path.basename(second)[:-8] + ".json"])
+    assert cached_excel_parquet(footer_workbook, out_dir=out_dir)[0].equals(first_metadata)
+
+
+def test_date_order_is_not_carried_over_to_the_next_workbook():
+    month_first = pd.DataFrame({"Date": ["04/25/2024", "04/26/2024", "04/27/2024"]})
+    ambiguous = pd.DataFrame({"Date": ["01/02/2024", "03/04/2024", "05/06/2024"]})
+
+    assert normalize_datetime_columns(month_first)["Date"].dt.month.tolist() == [4, 4, 4]
+    # A fresh upload with dates that read either way is day-first, as DATE_FORMATS prefers
+    assert normalize_datetime_columns(ambiguous)["Date"].dt.month.tolist() == [2, 4, 6]
+
+
+def test_sheets_of_one_workbook_share_the_date_order(tmp_path):
+    wb = Workbook()
+    wb.active.title = "2023"
+    for ws, dates in [(wb.active, ["04/25/2023", "04/26/2023"]), (wb.create_sheet("2024"), ["01/02/2024", "03/04/2024"])]:
+        ws.append(HEADER)
+        for d in dates:
+            ws.append([d, "UPI POS", None, 100.0, 100.0])
+    path = tmp_path / "years.xlsx"
+    wb.save(path)
+
+    _, parsed = parse_excel_statement(str(path))
+    assert parsed["Tran Date"].dt.month.tolist() == [4, 4, 1, 3]
@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+HEADLESS_MODULES = ["rbi", "excel_parser", "csv_parser", "bank_detect", "batch_parse", "sbi_pdf_parser",
+                    "pdf_parser", "kotak_pdf_parser", "axis_bank_parser", "rbl_bank_parser", "iob_bank_parser"]
+
+
+@pytest.mark.parametrize("module", HEADLESS_MODULES)
+def test_parser_modules_import_without_streamlit(module):
+    code = f"import sys, {module}; print('streamlit' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "False"
@@ -0,0 +1,9 @@
+import pandas as pd
+
+from pdf_parser import _signed_balance
+
+
+def test_signed_balance_reads_suffix_only_when_present():
+    raw = pd.Series(["1,234.56Cr", "1,234.56Dr", "1,234.56", "99.00 cr", "99.00 DR", "", None])
+    expected = [1234.56, -1234.56, 1234.56, 99.0, -99.0, None, None]
+    pd.testing.assert_series_equal(_signed_balance(raw), pd.Series(expected, dtype="float64"))
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from rbi import extract_rbi_transactions
+from rbl_bank_parser import extract_rbl_transactions, parse_rbl_statement
+
+# Opening balance 10,000.00, then a debit, a credit and a row that leaves the balance unchanged
+STATEMENT = """Accountholder Name : JOHN DOE
+Period : 01-Apr-2024 to 30-Apr-2024
+01-Apr-2024 ATM WITHDRAWAL 01-Apr-2024 2,500.00 7,500.00
+02-Apr-2024 NEFT SALARY 02-Apr-2024 12,000.50 19,500.50
+03-Apr-2024 CHARGES REVERSED 03-Apr-2024 0.00 19,500.50
+"""
+
+
+@pytest.mark.parametrize("extract", [extract_rbl_transactions, extract_rbi_transactions])
+def test_balance_changes_classify_debits_and_credits(extract):
+    df = extract(STATEMENT, opening_balance=10000.0)
+
+    assert df["Withdrawal Amt"].tolist() == [2500.0, 0.0, 0.0]
+    assert df["Deposit Amt"].tolist() == [0.0, 12000.5, 0.0]
+    assert df["Balance Amt"].tolist() == [7500.0, 19500.5, 19500.5]
+
+
+@pytest.mark.parametrize("extract", [extract_rbl_transactions, extract_rbi_transactions])
+def test_first_row_stays_unclassified_without_an_opening_balance(extract):
+    df = extract(STATEMENT)
+
+    assert df["Withdrawal Amt"].tolist() == [0.0, 0.0, 0.0]
+    assert df["Deposit Amt"].tolist() == [0.0, 12000.5, 0.0]
+
+
+def test_generated_statement_balances_add_up(statements):
+    _, df = parse_rbl_statement(statements["rbl"])
+
+    net = (df["Deposit Amt"] - df["Withdrawal Amt"]).iloc[1:]
+    pd.testing.assert_series_equal(net, df["Balance Amt"].diff().iloc[1:], check_names=False, atol=0.005)
+    assert ((df["Withdrawal Amt"] == 0) | (df["Deposit Amt"] == 0)).all()
@@ -0,0 +1,37 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from statement_store import StatementStore
+
+FRAME = pd.DataFrame({"Date": ["01/04/2024"] * 500, "Amount": [1.5] * 500})
+
+
+def _save_many(root):
+    store = StatementStore(root)
+    for _ in range(20):
+        store.save("abc123", "SBI", 1, ({"name": "JOHN DOE"}, FRAME))
+
+
+def test_processes_saving_the_same_statement_do_not_collide(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        for future in [pool.submit(_save_many, str(tmp_path)) for _ in range(4)]:
+            future.result()
+
+    metadata, frame = StatementStore(str(tmp_path)).load("abc123", "SBI", 1)
+    assert metadata == {"name": "JOHN DOE"}
+    pd.testing.assert_frame_equal(frame, FRAME)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_evict_tolerates_entries_removed_by_another_process(tmp_path):
+    store = StatementStore(str(tmp_path))
+    store.save("abc123", "SBI", 1, ({}, FRAME))
+    store.save("def456", "SBI", 1, ({}, FRAME))
+    os.remove(tmp_path / "SBI-abc123-v1.parquet")
+
+    store.max_bytes = 0
+    store.evict()
+    assert store.load("abc123", "SBI", 1) is None
+    assert store.load("def456", "SBI", 1) is None
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from iob_bank_parser import iter_iob_pdf, parse_iob_pdf
+from pdf_parser import iter_central_bank_pdf, parse_central_bank_pdf
+from sbi_pdf_parser import iter_sbi_pdf, parse_sbi_pdf
+from statement_stream import write_chunks
+
+# layout -> (streaming parser, full parser whose result starts with the same frame)
+STREAMING = {
+    "sbi": (iter_sbi_pdf, parse_sbi_pdf),
+    "cbi": (iter_central_bank_pdf, parse_central_bank_pdf),
+    "iob": (iter_iob_pdf, parse_iob_pdf),
+}
+
+
+@pytest.mark.parametrize("layout", sorted(STREAMING))
+def test_chunks_concatenate_to_the_full_parse(statements, layout):
+    iter_fn, parse_fn = STREAMING[layout]
+    chunks = list(iter_fn(statements[layout]))
+
+    assert len(chunks) > 1  # one per page
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True),
+                                  parse_fn(statements[layout])[0].reset_index(drop=True))
+
+
+@pytest.mark.parametrize("layout", sorted(STREAMING))
+@pytest.mark.parametrize("fmt", ["parquet", "csv"])
+def test_written_chunks_read_back_as_the_full_parse(statements, tmp_path, layout, fmt):
+    iter_fn, parse_fn = STREAMING[layout]
+    path = str(tmp_path / f"statement.{fmt}")
+
+    rows = write_chunks(iter_fn(statements[layout]), path)
+
+    expected = parse_fn(statements[layout])[0].reset_index(drop=True)
+    text = {str(c): str for c in expected.columns if not pd.api.types.is_numeric_dtype(expected[c])}
+    written = pd.read_parquet(path) if fmt == "parquet" else pd.read_csv(path, dtype=text)
+    assert rows == len(written) == len(expected)
+    assert list(written.columns) == [str(c) for c in expected.columns]
+    for col in expected.columns:
+        if pd.api.types.is_numeric_dtype(expected[col]):
+            pd.testing.assert_series_equal(written[col].astype("float64"), expected[col].astype("float64"),
+                                           check_names=False)
+        else:
+            assert written[col].fillna("").astype(str).tolist() == expected[col].fillna("").astype(str).tolist()
@@ -0,0 +1,29 @@
+import importlib
+
+import pandas as pd
+import pytest
+
+from bank_detect import PDF_PARSERS, TEXT_LINE_BANKS
+from text_backends import DEFAULT_TEXT_BACKEND, TEXT_BACKENDS
+
+
+def assert_same_result(a, b):
+    if isinstance(a, pd.DataFrame):
+        pd.testing.assert_frame_equal(a, b)
+    elif isinstance(a, (tuple, list)):
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            assert_same_result(x, y)
+    else:
+        assert a == b
+
+
+@pytest.mark.parametrize("bank", sorted(TEXT_LINE_BANKS))
+@pytest.mark.parametrize("backend", sorted(set(TEXT_BACKENDS) - {DEFAULT_TEXT_BACKEND}))
+def test_text_backends_parse_the_same_statement_alike(statements, bank, backend):
+    module_name, func_name, _ = PDF_PARSERS[bank]
+    parse_fn = getattr(importlib.import_module(module_name), func_name)
+
+    expected = parse_fn(statements[bank], text_backend=DEFAULT_TEXT_BACKEND)
+    assert len(expected[1][0] if isinstance(expected[1], tuple) else expected[1]) > 0
+    assert_same_result(expected, parse_fn(statements[bank], text_backend=backend))
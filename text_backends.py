@@ -0,0 +1,98 @@
+import os
+
+from timings import stage
+
+# Page-text extractors PdfSession can read through. Text, and the positioned chars
+# the char-column parsers read (char_columns.py), come from here; tables and
+# everything else geometric always come from pdfplumber.
+DEFAULT_TEXT_BACKEND = "pdfplumber"
+
+
+def pdfium_document(source):
+    """pypdfium2 document for a path, raw bytes, Streamlit UploadedFile or binary file object."""
+    import pypdfium2 as pdfium
+
+    if isinstance(source, (bytes, bytearray)):
+        data = bytes(source)
+    elif hasattr(source, "getvalue"):
+        data = source.getvalue()
+    elif hasattr(source, "read"):
+        source.seek(0)
+        data = source.read()
+        source.seek(0)
+    else:
+        data = os.fspath(source)
+    return pdfium.PdfDocument(data)
+
+
+class PdfplumberText:
+    """extract_text() of the session's own pdfplumber pages (lays each page out)."""
+
+    def __init__(self, pdf, source):
+        self.pdf = pdf
+
+    def page_text(self, index):
+        page = self.pdf.pages[index]
+        with stage("layout"):
+            page.chars  # pdfminer layout, cached on the page
+        return page.extract_text() or ""
+
+    def page_chars(self, index):
+        with stage("layout"):
+            return self.pdf.pages[index].chars
+
+    def close(self):
+        pass
+
+
+class PdfiumText:
+    """
+    pdfium's text layer: the same ordered lines for the line-oriented parsers in a
+    few milliseconds per page, because no pdfminer layout is built.
+    """
+
+    def __init__(self, pdf, source):
+        self.doc = pdfium_document(source)
+
+    def page_text(self, index):
+        page = self.doc[index]
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def page_chars(self, index):
+        """
+        Chars with pdfplumber's text/x0/x1/top/bottom keys. Loose (font) boxes, so
+        spaces and letters of one line share a top as they do in pdfplumber; the
+        line breaks and spaces pdfium generates itself are left out.
+        """
+        import pypdfium2.raw as pdfium_c
+
+        page = self.doc[index]
+        textpage = page.get_textpage()
+        try:
+            height = page.get_height()
+            text = textpage.get_text_range()
+            chars = []
+            for i in range(min(len(text), textpage.count_chars())):
+                if pdfium_c.FPDFText_IsGenerated(textpage, i):
+                    continue
+                left, bottom, right, top = textpage.get_charbox(i, loose=True)
+                chars.append({"text": text[i], "x0": left, "x1": right, "top": height - top, "bottom": height - bottom})
+        finally:
+            textpage.close()
+            page.close()
+        return chars
+
+    def close(self):
+        self.doc.close()
+
+
+TEXT_BACKENDS = {
+    "pdfplumber": PdfplumberText,
+    "pdfium": PdfiumText,
+}
@@ -0,0 +1,124 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# === CONFIG ===
+# Where the one-line JSON record of each parse goes: "-" for stderr (default), a
+# file path to append to, or "0" / "" to turn the log off
+TIMINGS_LOG = os.environ.get("PARSE_TIMINGS_LOG", "-")
+
+_local = threading.local()  # Streamlit runs each session's script in its own thread
+_log_lock = threading.Lock()
+
+
+class ParseTimings:
+    """
+    Seconds per stage and event counters of one parse. Stage times are exclusive:
+    time spent in a stage opened inside another one is booked to the inner stage
+    only, so the stages add up to the time the parse was recorded for.
+    """
+
+    __slots__ = ("label", "fields", "stages", "counters", "at", "started", "seconds", "_open")
+
+    def __init__(self, label, **fields):
+        self.label = label
+        self.fields = fields
+        self.at = time.time()
+        self.stages = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+        self.seconds = None
+        self._open = []  # [stage name, started, seconds spent in nested stages]
+
+    def enter(self, name):
+        self._open.append([name, time.perf_counter(), 0.0])
+
+    def exit(self):
+        name, started, nested = self._open.pop()
+        elapsed = time.perf_counter() - started
+        self.stages[name] = self.stages.get(name, 0.0) + elapsed - nested
+        if self._open:
+            self._open[-1][2] += elapsed
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+        other = self.seconds - sum(self.stages.values())
+        if other > 0:
+            self.stages["other"] = other
+
+    def as_record(self):
+        return {
+            "event": "parse",
+            "at": round(self.at, 3),
+            "label": self.label,
+            **self.fields,
+            "seconds": round(self.seconds or 0.0, 6),
+            "stages": {k: round(v, 6) for k, v in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+
+@contextmanager
+def stage(name):
+    """Book the enclosed time to `name` on the parse being recorded in this thread (if any)."""
+    timings = getattr(_local, "current", None)
+    if timings is None:
+        yield
+        return
+    timings.enter(name)
+    try:
+        yield
+    finally:
+        timings.exit()
+
+
+def count(name, n=1):
+    """Add `n` to counter `name` of the parse being recorded in this thread (if any)."""
+    timings = getattr(_local, "current", None)
+    if timings is not None:
+        timings.count(name, n)
+
+
+@contextmanager
+def record_parse(label, **fields):
+    """
+    Record the stages and counters of one parse: yields the ParseTimings, then
+    writes its JSON line to the timings log and keeps it as last_parse().
+    Recordings do not nest; an inner record_parse just joins the outer one.
+    """
+    outer = getattr(_local, "current", None)
+    if outer is not None:
+        yield outer
+        return
+    timings = ParseTimings(label, **fields)
+    _local.current = timings
+    try:
+        yield timings
+    finally:
+        _local.current = None
+        timings.finish()
+        _local.last = timings
+        log_record(timings.as_record())
+
+
+def last_parse():
+    """ParseTimings of the most recent parse recorded in this thread, or None."""
+    return getattr(_local, "last", None)
+
+
+def log_record(record):
+    if TIMINGS_LOG in ("", "0"):
+        return
+    line = json.dumps(record, default=str)
+    with _log_lock:
+        if TIMINGS_LOG == "-":
+            print(line, file=sys.stderr, flush=True)
+        else:
+            with open(TIMINGS_LOG, "a", encoding="utf-8") as fh:
+                fh.write(line + "\n")